@@ -1,13 +1,22 @@
+import sys
+import os
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.popup import Popup
 from kivy.uix.textinput import TextInput
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.gridlayout import GridLayout
 from sync.sync_client import SyncClient
-import random
+from storage.local_store import LocalWordStore
+from word_list import WordListPopup
+from shared.srs import GRADES, RELEARN_DELAY, schedule
+
+SYNC_PORT = 8888
 
 class WordCard(BoxLayout):
     def __init__(self, word=None, **kwargs):
@@ -34,8 +43,19 @@ class WordCard(BoxLayout):
         self.next_btn.bind(on_press=self.next_word)
         button_layout.add_widget(self.next_btn)
         
+        self.note_btn = Button(text='笔记', size_hint_x=0.5)
+        self.note_btn.bind(on_press=self.edit_note)
+        button_layout.add_widget(self.note_btn)
+        
         self.add_widget(button_layout)
         
+        grade_layout = BoxLayout(orientation='horizontal', size_hint_y=0.3)
+        for text, grade in GRADES:
+            grade_btn = Button(text=text)
+            grade_btn.bind(on_press=lambda x, g=grade: self.grade_word(g))
+            grade_layout.add_widget(grade_btn)
+        self.add_widget(grade_layout)
+        
     def flip_card(self, instance):
         if not self.word:
             return
@@ -51,9 +71,52 @@ class WordCard(BoxLayout):
             self.word_label.text = self.word.word
             self.is_flipped = False
             
+    def edit_note(self, instance):
+        if not self.word:
+            return
+        NoteDialog(self.word).open()
+        
     def next_word(self, instance):
         app = App.get_running_app()
-        app.next_random_word()
+        app.next_due_word()
+        
+    def grade_word(self, grade):
+        if not self.word:
+            return
+            
+        app = App.get_running_app()
+        app.grade_word(self.word.id, grade)
+        app.next_due_word()
+
+class NoteDialog(Popup):
+    def __init__(self, word, **kwargs):
+        super().__init__(**kwargs)
+        self.title = f'笔记: {word.word}'
+        self.size_hint = (0.9, 0.6)
+        self.word = word
+        
+        content = BoxLayout(orientation='vertical')
+        
+        self.note_input = TextInput(text=word.user_note or '')
+        content.add_widget(self.note_input)
+        
+        button_layout = BoxLayout(orientation='horizontal', size_hint_y=0.25)
+        
+        save_btn = Button(text='保存')
+        save_btn.bind(on_press=self.save)
+        button_layout.add_widget(save_btn)
+        
+        cancel_btn = Button(text='取消')
+        cancel_btn.bind(on_press=self.dismiss)
+        button_layout.add_widget(cancel_btn)
+        
+        content.add_widget(button_layout)
+        self.content = content
+        
+    def save(self, instance):
+        app = App.get_running_app()
+        app.save_note(self.word.id, self.note_input.text)
+        self.dismiss()
 
 class SyncDialog(Popup):
     def __init__(self, **kwargs):
@@ -63,10 +126,12 @@ class SyncDialog(Popup):
         
         content = BoxLayout(orientation='vertical')
         
-        content.add_widget(Label(text='输入PC端IP地址:', size_hint_y=0.3))
+        content.add_widget(Label(text='PC端IP地址(留空自动查找):', size_hint_y=0.3))
         
+        known = App.get_running_app().store.known_servers(1)
         self.ip_input = TextInput(
-            text='192.168.1.100',
+            text='',
+            hint_text=f'上次: {known[0][0]}' if known else '自动查找局域网内的PC端',
             multiline=False,
             size_hint_y=0.3
         )
@@ -86,20 +151,47 @@ class SyncDialog(Popup):
         self.content = content
         
     def start_sync(self, instance):
-        ip = self.ip_input.text.strip()
-        if ip:
-            app = App.get_running_app()
-            app.sync_words(ip)
+        app = App.get_running_app()
+        app.sync_words(self.ip_input.text.strip())
         self.dismiss()
 
+class SyncProgress(Popup):
+    def __init__(self, on_cancel, **kwargs):
+        super().__init__(**kwargs)
+        self.title = '正在同步'
+        self.size_hint = (0.8, 0.4)
+        self.auto_dismiss = False
+        
+        content = BoxLayout(orientation='vertical')
+        
+        self.status_label = Label(text='正在连接...')
+        content.add_widget(self.status_label)
+        
+        self.cancel_btn = Button(text='取消', size_hint_y=0.3)
+        self.cancel_btn.bind(on_press=lambda x: self.cancel(on_cancel))
+        content.add_widget(self.cancel_btn)
+        
+        self.content = content
+        
+    def update(self, words, received):
+        self.status_label.text = f"已接收 {words} 个单词，{received / 1024:.0f} KB"
+        
+    def cancel(self, on_cancel):
+        self.cancel_btn.disabled = True
+        self.status_label.text = '正在取消...'
+        on_cancel()
+
 class WordBookApp(App):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.words = []
-        self.current_word_index = 0
-        self.sync_client = SyncClient()
+        self.store = None
+        self.sync_client = None
+        self.sync_thread = None
         
     def build(self):
+        # 单词和复习进度都存在本地，冷启动只打开数据库，卡片用到哪个单词再读取
+        self.store = LocalWordStore(os.path.join(self.user_data_dir, 'word_book.db'))
+        
         main_layout = BoxLayout(orientation='vertical')
         
         title = Label(
@@ -125,6 +217,7 @@ class WordBookApp(App):
         
         main_layout.add_widget(button_layout)
         
+        self.next_due_word()
         return main_layout
         
     def show_sync_dialog(self, instance):
@@ -132,65 +225,128 @@ class WordBookApp(App):
         sync_dialog.open()
         
     def sync_words(self, ip):
+        if self.sync_thread is not None:
+            return
+            
+        # 网络收发和写库都在后台线程，界面线程只通过 Clock 接收进度
+        self.sync_client = SyncClient()
+        progress = SyncProgress(on_cancel=self.sync_client.cancel)
+        progress.open()
+        self.sync_thread = threading.Thread(
+            target=self._sync_worker, args=(self.sync_client, ip, self.store.revision, progress), daemon=True
+        )
+        self.sync_thread.start()
+        
+    def _sync_worker(self, client, ip, since, progress):
+        counts = {'changed': 0, 'deleted': 0}
+        # 后台线程用自己的连接写入，WAL模式下界面线程读卡片不必等它
+        store = LocalWordStore(self.store.db_path)
+        
+        def on_page(changes):
+            # 每页与版本号一起提交，连接中断或取消时下次从这里续传
+            store.apply_changes(changes)
+            counts['changed'] += len(changes.words)
+            counts['deleted'] += len(changes.deleted)
+            words, received = counts['changed'], client.bytes_received
+            Clock.schedule_once(lambda dt: self._sync_progress(progress, words, received))
+            
+        # 手动输入的地址优先，其次是上次同步过的服务器，一起并行连接；都连不上时广播查找
+        servers = ([(ip, SYNC_PORT)] if ip else []) + store.known_servers()
+        error = None
         try:
-            self.words = self.sync_client.sync_from_server(ip)
-            if self.words:
-                self.show_popup("同步成功", f"同步了 {len(self.words)} 个单词")
-                self.next_random_word()
+            revision = client.sync_changes_from_server(servers, since, on_page, outbox=store)
+            if client.server is not None:
+                store.remember_server(*client.server)
+        except Exception as e:
+            revision, error = None, str(e)
+        finally:
+            store.close()
+        Clock.schedule_once(lambda dt: self._sync_finished(progress, client, revision, counts, error))
+        
+    def _sync_progress(self, progress, words, received):
+        progress.update(words, received)
+        # 已写入的页面立即可用，第一页到达后就显示卡片
+        if self.word_card.word is None:
+            self.next_due_word()
+            
+    def _sync_finished(self, progress, client, revision, counts, error):
+        progress.dismiss()
+        self.sync_thread = None
+        
+        if error is not None:
+            self.show_popup("同步失败", error)
+            return
+            
+        total = self.store.count_words()
+        if revision is None:
+            if client.cancelled:
+                self.show_popup("同步已取消", f"已同步 {counts['changed']} 个单词，下次同步将继续")
+            elif counts['changed'] or counts['deleted']:
+                self.show_popup("同步中断", f"已同步 {counts['changed']} 个单词，下次同步将继续")
             else:
                 self.show_popup("同步失败", "无法连接到服务器或没有数据")
-        except Exception as e:
-            self.show_popup("同步失败", str(e))
+            return
+            
+        if total:
+            self.show_popup("同步成功", f"上传 {client.pushed} 条修改，更新 {counts['changed']} 个，"
+                                        f"删除 {counts['deleted']} 个，共 {total} 个单词")
+            self.next_due_word()
+        else:
+            self.show_popup("同步失败", "服务器上没有单词")
+            
+    def save_note(self, word_id, note):
+        # 本地保存并记入待推送，下次同步时上传到PC端
+        if self.store.update_note(word_id, note) and self.word_card.word and self.word_card.word.id == word_id:
+            self.word_card.word = self.store.get_word(word_id)
+            self.word_card.is_flipped = False
+            self.word_card.word_label.text = self.word_card.word.word
             
-    def next_random_word(self):
-        if not self.words:
+    def grade_word(self, word_id, grade):
+        state = self.store.review_state(word_id)
+        if state is not None:
+            self.store.save_review(schedule(state, grade))
+            
+    def next_due_word(self):
+        word_id = self.store.next_due_id()
+        if word_id is None:
+            return
+            
+        # 跳过当前卡片时把它往后放一点，避免“下一个”一直停在同一张上
+        current = self.word_card.word
+        if current is not None and word_id == current.id:
+            self.store.postpone(word_id, RELEARN_DELAY)
+            word_id = self.store.next_due_id()
+            
+        word = self.store.get_word(word_id)
+        if word is None:
             return
             
-        word = random.choice(self.words)
         self.word_card.word = word
         self.word_card.is_flipped = False
         self.word_card.word_label.text = word.word
         
     def show_word_list(self, instance):
-        if not self.words:
+        if not self.store.page_words(limit=1):
             self.show_popup("提示", "请先同步数据")
             return
             
-        content = BoxLayout(orientation='vertical')
-        
-        scroll = ScrollView()
-        word_layout = GridLayout(cols=1, size_hint_y=None)
-        word_layout.bind(minimum_height=word_layout.setter('height'))
-        
-        for word in self.words:
-            word_btn = Button(
-                text=f"{word.word} - {word.translation}",
-                size_hint_y=None,
-                height='48dp'
-            )
-            word_btn.bind(on_press=lambda x, w=word: self.select_word(w))
-            word_layout.add_widget(word_btn)
-            
-        scroll.add_widget(word_layout)
-        content.add_widget(scroll)
-        
-        close_btn = Button(text='关闭', size_hint_y=0.2)
-        content.add_widget(close_btn)
+        WordListPopup(self.store, on_select=self.select_word).open()
         
-        popup = Popup(
-            title='单词列表',
-            content=content,
-            size_hint=(0.9, 0.8)
-        )
-        
-        close_btn.bind(on_press=popup.dismiss)
-        popup.open()
-        
-    def select_word(self, word):
+    def select_word(self, word_id):
+        # 列表里只有单词和中文，翻面需要的其他字段按id读取
+        word = self.store.get_word(word_id)
+        if word is None:
+            return
         self.word_card.word = word
         self.word_card.is_flipped = False
         self.word_card.word_label.text = word.word
         
+    def on_stop(self):
+        if self.sync_client is not None:
+            self.sync_client.cancel()
+        if self.store:
+            self.store.close()
+            
     def show_popup(self, title, message):
         content = BoxLayout(orientation='vertical')
         content.add_widget(Label(text=message))
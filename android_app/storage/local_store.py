@@ -0,0 +1,291 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from shared.models import Word, WordRow
+from shared.protocols import ChangeSet, UpdateResult, WordUpdate
+from shared.schema import REVIEWS_SCHEMA, apply_migrations
+from shared.srs import ReviewState
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+
+WORD_COLUMNS = 'id, word, translation, english_translation, memory_tip, user_note, created_at, updated_at'
+
+# 按id合并服务器发来的单词，本地那份更新过(updated_at 更晚)时保留本地
+MERGE_SQL = '''
+    INSERT INTO words(id, word, translation, english_translation, memory_tip, user_note, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        word=excluded.word,
+        translation=excluded.translation,
+        english_translation=excluded.english_translation,
+        memory_tip=excluded.memory_tip,
+        user_note=excluded.user_note,
+        created_at=excluded.created_at,
+        updated_at=excluded.updated_at
+    WHERE words.updated_at IS NULL OR excluded.updated_at IS NULL OR excluded.updated_at >= words.updated_at
+'''
+
+SAVE_REVIEW_SQL = '''
+    INSERT OR REPLACE INTO reviews(word_id, ease, interval, repetitions, lapses, due_at, reviewed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# 服务器发来的复习记录比本地新(或相同)时才覆盖，与服务器端的规则对称；
+# 分页拉取时复习记录可能先于它的单词到达，先插入，单词随后插入时 reviews_ai 不会覆盖它
+MERGE_REVIEW_SQL = '''
+    INSERT INTO reviews(word_id, ease, interval, repetitions, lapses, due_at, reviewed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(word_id) DO UPDATE SET
+        ease=excluded.ease,
+        interval=excluded.interval,
+        repetitions=excluded.repetitions,
+        lapses=excluded.lapses,
+        due_at=excluded.due_at,
+        reviewed_at=excluded.reviewed_at
+    WHERE reviews.reviewed_at IS NULL OR reviews.reviewed_at <= excluded.reviewed_at
+'''
+
+REVIEW_COLUMNS = 'word_id, ease, interval, repetitions, lapses, due_at, reviewed_at'
+
+# 待推送的本地修改，kind 为 'word' 或 'review'；同一条记录再次修改时 seq 变大，
+# 推送确认时只删除 seq 没变的，推送期间又改过的留到下次
+OUTBOX_TABLE = '''
+    CREATE TABLE IF NOT EXISTS outbox (
+        kind TEXT NOT NULL,
+        word_id INTEGER NOT NULL,
+        seq INTEGER NOT NULL,
+        PRIMARY KEY (kind, word_id)
+    )
+'''
+
+# 成功同步过的服务器地址，下次先直接连接这些地址，连不上再广播查找
+KNOWN_SERVERS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS known_servers (
+        host TEXT NOT NULL,
+        port INTEGER NOT NULL,
+        last_seen REAL NOT NULL,
+        PRIMARY KEY (host, port)
+    )
+'''
+
+OUTBOX_SQL = '''
+    INSERT OR REPLACE INTO outbox(kind, word_id, seq)
+    VALUES (?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM outbox))
+'''
+
+# 已同步到的服务器版本号，与单词在同一个事务里写入
+SYNC_STATE_TABLE = '''
+    CREATE TABLE IF NOT EXISTS sync_state (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+'''
+
+# 全量重传开始时本地已有的单词id，逐页收到的划掉，最后一页之后仍留着的就是服务器上已经没有的
+RESYNC_TABLE = '''
+    CREATE TABLE IF NOT EXISTS resync_pending (
+        word_id INTEGER PRIMARY KEY
+    )
+'''
+
+def _migrate_reviews(conn: sqlite3.Connection):
+    for statement in REVIEWS_SCHEMA:
+        conn.execute(statement)
+
+def _migrate_sync_state(conn: sqlite3.Connection):
+    conn.execute(SYNC_STATE_TABLE)
+
+def _migrate_outbox(conn: sqlite3.Connection):
+    conn.execute(OUTBOX_TABLE)
+
+def _migrate_known_servers(conn: sqlite3.Connection):
+    conn.execute(KNOWN_SERVERS_TABLE)
+
+def _migrate_resync(conn: sqlite3.Connection):
+    conn.execute(RESYNC_TABLE)
+
+MIGRATIONS = (
+    _migrate_reviews,
+    _migrate_sync_state,
+    _migrate_outbox,
+    _migrate_known_servers,
+    _migrate_resync,
+)
+
+Mark = Tuple[str, int, int]
+
+class LocalWordStore:
+    """安卓端的本地单词库：表结构与PC端共用，启动时不整体加载，界面需要哪个单词再按id读取。
+
+    笔记和复习进度双向同步：本地修改记入 outbox 推给PC，拉取的变更里带着PC上(以及其他手机推给PC)
+    的单词和复习记录，单词按 updated_at、复习记录按 reviewed_at “后写者胜”合并。
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        for pragma in PRAGMAS:
+            self.conn.execute(pragma)
+        self._lock = threading.RLock()
+        with self.transaction() as conn:
+            apply_migrations(conn, MIGRATIONS)
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+
+    @property
+    def revision(self) -> int:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM sync_state WHERE key = 'revision'").fetchone()
+        return row[0] if row else 0
+
+    def apply_changes(self, changes: ChangeSet):
+        """把一页变更合并进本地库，并在同一个事务里推进版本号，中断后从这一页之后续传。
+
+        全量重传(PC端数据库被替换过)不清空本地库，按id合并，只删除整个快照里都没有的单词，
+        保留下来的单词的本地复习进度与服务器发来的按 reviewed_at 合并，不会被重置。
+        """
+        with self.transaction() as conn:
+            if changes.full:
+                conn.execute('DELETE FROM resync_pending')
+                conn.execute('INSERT INTO resync_pending(word_id) SELECT id FROM words')
+            conn.executemany('DELETE FROM words WHERE id = ?', ((word_id,) for word_id in changes.deleted))
+            self._merge_words(conn, changes.words)
+            self._merge_reviews(conn, changes.reviews)
+            conn.executemany('DELETE FROM resync_pending WHERE word_id = ?', ((word.id,) for word in changes.words))
+            if not changes.more:
+                conn.execute('DELETE FROM words WHERE id IN (SELECT word_id FROM resync_pending)')
+                conn.execute('DELETE FROM resync_pending')
+            conn.execute("INSERT OR REPLACE INTO sync_state(key, value) VALUES ('revision', ?)",
+                         (changes.revision,))
+
+    @staticmethod
+    def _merge_words(conn: sqlite3.Connection, words: Iterable[Word]):
+        for word in words:
+            # 服务器上删掉再重新添加(或换了数据库)的单词换了id：复习进度和待推送的复习记录
+            # 跟着单词移到新id，再删掉旧行腾出 word 列的唯一键
+            old = conn.execute('SELECT id FROM words WHERE word = ? AND id != ?', (word.word, word.id)).fetchone()
+            if old is not None:
+                conn.execute('UPDATE OR REPLACE reviews SET word_id = ? WHERE word_id = ?', (word.id, old[0]))
+                conn.execute("UPDATE OR REPLACE outbox SET word_id = ? WHERE kind = 'review' AND word_id = ?",
+                             (word.id, old[0]))
+                conn.execute('DELETE FROM words WHERE id = ?', (old[0],))
+            conn.execute(MERGE_SQL, (word.id, word.word, word.translation, word.english_translation,
+                                     word.memory_tip, word.user_note, word.created_at, word.updated_at))
+
+    @staticmethod
+    def _merge_reviews(conn: sqlite3.Connection, reviews: Iterable[ReviewState]):
+        conn.executemany(MERGE_REVIEW_SQL, (
+            (s.word_id, s.ease, s.interval, s.repetitions, s.lapses, s.due_at, s.reviewed_at) for s in reviews
+        ))
+
+    def count_words(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM words').fetchone()[0]
+
+    def get_word(self, word_id: int) -> Optional[WordRow]:
+        with self._lock:
+            row = self.conn.execute(f'SELECT {WORD_COLUMNS} FROM words WHERE id = ?', (word_id,)).fetchone()
+        return WordRow(*row) if row else None
+
+    def page_words(self, query: str = '', before_id: Optional[int] = None, limit: int = 100) -> List[WordRow]:
+        """按id倒序取一页单词(只含 id、单词和中文)，query 不为空时只取单词或中文包含它的。"""
+        conditions, params = [], []
+        if before_id is not None:
+            conditions.append('id < ?')
+            params.append(before_id)
+        if query:
+            pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            conditions.append("(word LIKE ? ESCAPE '\\' OR translation LIKE ? ESCAPE '\\')")
+            params += [pattern, pattern]
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        with self._lock:
+            rows = self.conn.execute(f'SELECT id, word, translation FROM words {where} ORDER BY id DESC LIMIT ?',
+                                     (*params, limit)).fetchall()
+        return [WordRow(*row) for row in rows]
+
+    def next_due_id(self) -> Optional[int]:
+        with self._lock:
+            row = self.conn.execute('SELECT word_id FROM reviews ORDER BY due_at LIMIT 1').fetchone()
+        return row[0] if row else None
+
+    def review_state(self, word_id: int) -> Optional[ReviewState]:
+        with self._lock:
+            row = self.conn.execute(f'SELECT {REVIEW_COLUMNS} FROM reviews WHERE word_id = ?',
+                                    (word_id,)).fetchone()
+        return ReviewState(*row) if row else None
+
+    def save_review(self, state: ReviewState):
+        with self.transaction() as conn:
+            conn.execute(SAVE_REVIEW_SQL, (state.word_id, state.ease, state.interval, state.repetitions,
+                                           state.lapses, state.due_at, state.reviewed_at))
+            conn.execute(OUTBOX_SQL, ('review', state.word_id))
+
+    def update_note(self, word_id: int, note: str, now: Optional[datetime] = None) -> bool:
+        with self.transaction() as conn:
+            cursor = conn.execute('UPDATE words SET user_note = ?, updated_at = ? WHERE id = ?',
+                                  (note, now or datetime.now(), word_id))
+            if not cursor.rowcount:
+                return False
+            conn.execute(OUTBOX_SQL, ('word', word_id))
+            return True
+
+    def count_pending(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM outbox').fetchone()[0]
+
+    def pending_changes(self, limit: int) -> Tuple[WordUpdate, List[Mark]]:
+        """取最早的一批待推送修改，以及推送成功后交给 acknowledge 的标记。"""
+        with self._lock:
+            marks = self.conn.execute('SELECT kind, word_id, seq FROM outbox ORDER BY seq LIMIT ?',
+                                      (limit,)).fetchall()
+            update = WordUpdate()
+            for kind, word_id, seq in marks:
+                if kind == 'word':
+                    word = self.get_word(word_id)
+                    if word is not None:
+                        update.words.append(word)
+                else:
+                    state = self.review_state(word_id)
+                    if state is not None and state.reviewed_at is not None:
+                        update.reviews.append(state)
+        return update, marks
+
+    def acknowledge(self, marks: List[Mark], result: UpdateResult):
+        """服务器已处理这一批：清掉对应的待推送标记，被拒绝的以服务器版本覆盖本地。"""
+        with self.transaction() as conn:
+            conn.executemany('DELETE FROM outbox WHERE kind = ? AND word_id = ? AND seq = ?', marks)
+            self._merge_words(conn, result.words)
+            self._merge_reviews(conn, result.reviews)
+
+    def postpone(self, word_id: int, seconds: float):
+        with self.transaction() as conn:
+            conn.execute('UPDATE reviews SET due_at = due_at + ? WHERE word_id = ?', (seconds, word_id))
+
+    def remember_server(self, host: str, port: int):
+        with self.transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO known_servers(host, port, last_seen) VALUES (?, ?, ?)',
+                         (host, port, time.time()))
+
+    def known_servers(self, limit: int = 3) -> List[Tuple[str, int]]:
+        with self._lock:
+            return self.conn.execute('SELECT host, port FROM known_servers ORDER BY last_seen DESC LIMIT ?',
+                                     (limit,)).fetchall()
+
+    def close(self):
+        self.conn.close()
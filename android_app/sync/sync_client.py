@@ -1,39 +1,127 @@
 import socket
-import json
-from ...shared.models import Word
-from ...shared.protocols import SyncProtocol, MessageType
+import threading
+from typing import Callable, Optional, Sequence, Union
+from shared.discovery import BROADCAST, Address, connect_first, discover
+from shared.protocols import (SyncProtocol, SyncSession, MessageType, ChangeSet, send_frame, recv_frame,
+                              PAGE_SIZE, PUSH_BATCH_SIZE)
+
+# 连接已知地址的等待时间；都连不上再广播查找
+CONNECT_TIMEOUT = 0.5
+DISCOVERY_TIMEOUT = 1.0
+
+Servers = Union[str, Sequence[Address]]
 
 class SyncClient:
-    def __init__(self):
+    def __init__(self, discovery_targets: Sequence[Address] = (BROADCAST,)):
+        self.discovery_targets = discovery_targets
         self.socket = None
-        
-    def sync_from_server(self, host: str, port: int = 8888) -> list:
-        words = []
+        self.server: Optional[Address] = None
+        self.session = SyncSession()
+        self.bytes_received = 0
+        self.pushed = 0
+        self._cancelled = threading.Event()
+
+    def _connect(self, servers: Servers, port: int):
+        """servers 为一个IP，或按优先级排列的 (IP, 端口) 候选列表；为空时直接广播查找。
+        所有候选地址同时连接，用最先连上的那个。"""
+        self.bytes_received = 0
+        self.pushed = 0
+        candidates = [(servers, port)] if isinstance(servers, str) else list(servers)
+        connected = connect_first(candidates, CONNECT_TIMEOUT) if candidates else None
+        if connected is None and not self.cancelled:
+            connected = connect_first(discover(DISCOVERY_TIMEOUT, self.discovery_targets), CONNECT_TIMEOUT)
+        if connected is None:
+            raise ConnectionError("局域网内没有找到PC端同步服务")
+        self.socket, self.server = connected
+        self.socket.settimeout(10)
+        if self.cancelled:
+            raise ConnectionError("同步已取消")
+        self.session = SyncSession()
+        self.session = SyncProtocol.parse_hello_response(self._exchange(SyncProtocol.create_hello()))
+
+    def _exchange(self, request: str) -> str:
+        return self._exchange_payload(request).decode('utf-8')
+
+    def _exchange_payload(self, request: str) -> bytes:
+        send_frame(self.socket, self.session.encode(request))
+        frame = recv_frame(self.socket)
+        if frame is None:
+            raise ConnectionError("服务器关闭了连接")
+        self.bytes_received += len(frame)
+        return self.session.decode_payload(frame)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """可从其他线程调用：关闭连接让阻塞中的收发立即出错，同步在当前页之后停止。
+        取消是一次性的，下次同步使用新的 SyncClient。"""
+        self._cancelled.set()
+        sock = self.socket
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _close(self):
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+
+    def sync_from_server(self, host: Servers, port: int = 8888) -> list:
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.settimeout(10)
-            self.socket.connect((host, port))
-            
+            self._connect(host, port)
             request = SyncProtocol.create_message(MessageType.SYNC_REQUEST)
-            self.socket.send(request.encode('utf-8'))
-            
-            response_data = b""
-            while True:
-                chunk = self.socket.recv(4096)
-                if not chunk:
-                    break
-                response_data += chunk
-                try:
-                    response = response_data.decode('utf-8')
-                    words = SyncProtocol.parse_sync_response(response)
-                    break
-                except json.JSONDecodeError:
-                    continue
-                    
+            return SyncProtocol.parse_sync_response(self._exchange(request))
         except Exception as e:
             print(f"同步失败: {e}")
+            return []
+        finally:
+            self._close()
+
+    def _push(self, outbox):
+        # 每批推送确认后立即清掉标记，中断时已确认的批次不会重发
+        while not self.cancelled:
+            update, marks = outbox.pending_changes(PUSH_BATCH_SIZE)
+            if not marks:
+                return
+            result = SyncProtocol.parse_word_update_response(
+                self._exchange(SyncProtocol.create_word_update(update))
+            )
+            if result is None:
+                raise ConnectionError("服务器不支持推送修改")
+            outbox.acknowledge(marks, result)
+            self.pushed += len(marks)
+
+    def sync_changes_from_server(self, host: Servers, since: int, on_page: Callable[[ChangeSet], None],
+                                 port: int = 8888, page_size: int = PAGE_SIZE, outbox=None) -> Optional[int]:
+        """逐页拉取变更并交给 on_page 应用，返回最终版本号；失败或被 cancel() 取消时返回 None，
+        已应用页面的 revision 即为续传游标。
+
+        给出 outbox (LocalWordStore) 时先分批推送本地修改，再拉取。
+        """
+        try:
+            self._connect(host, port)
+            if outbox is not None:
+                self._push(outbox)
+                if self.cancelled:
+                    return None
+            while True:
+                request = SyncProtocol.create_changes_request(since, page_size)
+                changes = SyncProtocol.unpack_changes_response(self._exchange_payload(request))
+                if changes is None:
+                    return None
+                on_page(changes)
+                since = changes.revision
+                if not changes.more:
+                    return since
+                if self.cancelled:
+                    return None
+        except Exception as e:
+            if not self.cancelled:
+                print(f"同步失败: {e}")
+            return None
         finally:
-            if self.socket:
-                self.socket.close()
-                
-        return words
\ No newline at end of file
+            self._close()
@@ -0,0 +1,115 @@
+from kivy.clock import Clock
+from kivy.properties import NumericProperty
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.popup import Popup
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.textinput import TextInput
+from kivy.metrics import dp
+
+PAGE_SIZE = 200
+# 滚到距底部不足这么多行时预取下一页
+PREFETCH_ROWS = 40
+FILTER_DELAY = 0.15
+
+class WordRowButton(RecycleDataViewBehavior, Button):
+    """RecycleView 只创建可见的几行，滚动时把这些按钮换上新的单词。"""
+
+    word_id = NumericProperty(0)
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.rv = rv
+        return super().refresh_view_attrs(rv, index, data)
+
+    def on_press(self):
+        self.rv.on_select(self.word_id)
+
+class WordRecycleView(RecycleView):
+    def __init__(self, on_select, **kwargs):
+        super().__init__(**kwargs)
+        self.on_select = on_select
+        self.viewclass = WordRowButton
+        layout = RecycleBoxLayout(orientation='vertical', size_hint_y=None,
+                                  default_size=(None, dp(48)), default_size_hint=(1, None))
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+
+def _row_data(row):
+    return {'word_id': row.id, 'text': f"{row.word} - {row.translation}"}
+
+class WordListPopup(Popup):
+    """单词列表：打开时只读第一页，滚动到底部附近再按id续读下一页。
+
+    输入过滤词时，若上一次的结果已经全部读出且新过滤词包含旧词，
+    直接在已读出的行里筛选，否则重新从本地库按页查询。
+    """
+
+    def __init__(self, store, on_select, **kwargs):
+        super().__init__(**kwargs)
+        self.title = '单词列表'
+        self.size_hint = (0.9, 0.8)
+        self.store = store
+        self.on_select = on_select
+        self.query = ''
+        self.exhausted = False
+        self._loading = False
+
+        content = BoxLayout(orientation='vertical')
+
+        self.filter_input = TextInput(hint_text='搜索单词或中文', multiline=False, size_hint_y=None, height=dp(44))
+        self._filter_trigger = Clock.create_trigger(self.apply_filter, FILTER_DELAY)
+        self.filter_input.bind(text=lambda *args: self._filter_trigger())
+        content.add_widget(self.filter_input)
+
+        self.view = WordRecycleView(on_select=self.select)
+        self.view.bind(scroll_y=self._on_scroll)
+        content.add_widget(self.view)
+
+        close_btn = Button(text='关闭', size_hint_y=None, height=dp(48))
+        close_btn.bind(on_press=self.dismiss)
+        content.add_widget(close_btn)
+
+        self.content = content
+        self.load_more()
+
+    def load_more(self):
+        if self.exhausted or self._loading:
+            return
+        self._loading = True
+        data = self.view.data
+        before_id = data[-1]['word_id'] if data else None
+        rows = self.store.page_words(self.query, before_id, PAGE_SIZE)
+        self.exhausted = len(rows) < PAGE_SIZE
+        data.extend(_row_data(row) for row in rows)
+        self._loading = False
+
+    def _on_scroll(self, view, scroll_y):
+        data = self.view.data
+        if not data or self.exhausted:
+            return
+        # scroll_y 为0时在最底部，换算成底部以下还剩多少行
+        hidden = view.children[0].height - view.height
+        if hidden <= 0 or scroll_y * hidden < PREFETCH_ROWS * dp(48):
+            self.load_more()
+
+    def apply_filter(self, *args):
+        query = self.filter_input.text.strip()
+        if query == self.query:
+            return
+        narrower = self.exhausted and self.query in query
+        self.query = query
+        if narrower:
+            # 旧结果已经完整，新条件更严格，只需在其中筛选
+            key = query.lower()
+            self.view.data = [item for item in self.view.data if key in item['text'].lower()]
+        else:
+            self.exhausted = False
+            self.view.data = []
+            self.load_more()
+        self.view.scroll_y = 1
+
+    def select(self, word_id):
+        self.on_select(word_id)
+        self.dismiss()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "android_app"))
+
+from shared.models import Word
+from shared.protocols import ChangeSet
+from storage.local_store import LocalWordStore
+
+# 与 android_app/word_list.py 的 PAGE_SIZE 一致，那里依赖kivy，这里不导入
+PAGE_SIZE = 200
+
+
+
+def timed_ms(func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="安卓单词列表：打开时读取的行数与耗时")
+    parser.add_argument("--words", type=int, default=100000)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalWordStore(os.path.join(tmp, "phone.db"))
+        store.apply_changes(ChangeSet(words=[Word(i + 1, f"word{i}", f"翻译{i}", created_at=now, updated_at=now)
+                                             for i in range(args.words)], revision=args.words, full=True))
+
+        conn = store.conn
+        full_ms, rows = timed_ms(lambda: conn.execute("SELECT id, word, translation FROM words").fetchall(), 3)
+        print(f"{args.words} 个单词")
+        print(f"旧做法 全部读出 {len(rows)} 行 {full_ms:8.1f} ms, 每行一个 Button")
+        ms, rows = timed_ms(lambda: store.page_words(limit=PAGE_SIZE))
+        print(f"打开列表 第一页 {len(rows)} 行 {ms:8.2f} ms")
+        ms, rows = timed_ms(lambda: store.page_words(before_id=args.words // 2, limit=PAGE_SIZE))
+        print(f"滚动续页 {len(rows)} 行 {ms:8.2f} ms")
+        ms, rows = timed_ms(lambda: store.page_words("word9999", limit=PAGE_SIZE))
+        print(f"过滤 'word9999' {len(rows)} 行 {ms:8.2f} ms")
+        ms, rows = timed_ms(lambda: store.page_words("翻译123", limit=PAGE_SIZE))
+        print(f"过滤 '翻译123' {len(rows)} 行 {ms:8.2f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
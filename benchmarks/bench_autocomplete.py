@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.api.offline_dict import OfflineDictionary, build_offline_dictionary
+from pc_app.database.database import WordDatabase
+from pc_app.database.prefix_index import PrefixIndex
+from shared.models import Word
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def random_words(rng, count):
+    words = set()
+    while len(words) < count:
+        word = "".join(rng.choice(LETTERS) for _ in range(rng.randint(3, 12)))
+        words.add(word.capitalize() if rng.random() < 0.1 else word)
+    return list(words)
+
+
+def percentiles(func, args):
+    times = []
+    for arg in args:
+        start = time.perf_counter()
+        func(arg)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return times[len(times) // 2], times[int(len(times) * 0.99)], times[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="前缀补全索引的加载、查询与增量更新耗时")
+    parser.add_argument("--words", type=int, default=1000000)
+    parser.add_argument("--offline-entries", type=int, default=770000)
+    parser.add_argument("--queries", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = WordDatabase(os.path.join(tmp, "bench.db"))
+        db.add_words(Word(word=word) for word in random_words(rng, args.words))
+        dict_path = os.path.join(tmp, "offline_dict.wbd")
+        build_offline_dictionary(((word, "释义", "") for word in random_words(rng, args.offline_entries)), dict_path)
+        offline = OfflineDictionary(dict_path)
+
+        index = PrefixIndex(db, offline)
+        start = time.perf_counter()
+        index.load()
+        load = time.perf_counter() - start
+
+        prefixes = ["".join(rng.choice(LETTERS) for _ in range(rng.randint(1, 4))) for _ in range(args.queries)]
+        # 单词本之外的前缀才会查到离线词典
+        misses = [prefix + "qzx" for prefix in prefixes]
+        new_words = [f"zznew{i}" for i in range(2000)]
+
+        print(f"单词本 {len(index)} 个单词, 离线词典 {len(offline)} 个词条, 加载索引 {load * 1000:.0f} ms")
+        print(f"{'操作':<20}{'p50 ms':>10}{'p99 ms':>10}{'最长 ms':>10}")
+        for name, func, sample in (
+                ("前缀补全(单词本)", lambda p: index.suggest(p, offline=False), prefixes),
+                ("前缀补全(含离线)", index.suggest, prefixes),
+                ("不存在的前缀", index.suggest, misses),
+                ("add", index.add, new_words),
+                ("discard", index.discard, new_words)):
+            p50, p99, worst = percentiles(func, sample)
+            print(f"{name:<20}{p50:>10.4f}{p99:>10.4f}{worst:>10.4f}")
+        offline.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "android_app"))
+
+from pc_app.database.database import WordDatabase
+from pc_app.sync.async_wifi_sync import AsyncWiFiSyncServer
+from shared.models import Word
+from storage.local_store import LocalWordStore
+from sync.sync_client import SyncClient
+
+FRAME = 1 / 60
+
+
+def run_sync(store_path, port, cancel_after=None):
+    """按安卓端的做法在后台线程同步，主线程按60fps循环读卡片，返回 (帧间隔列表, 接收单词数, 是否完成)。"""
+    ui_store = LocalWordStore(store_path)
+    client = SyncClient()
+    counts = {"words": 0}
+    result = {}
+
+    def worker():
+        store = LocalWordStore(store_path)
+
+        def on_page(changes):
+            store.apply_changes(changes)
+            counts["words"] += len(changes.words)
+            if cancel_after is not None and counts["words"] >= cancel_after:
+                client.cancel()
+
+        result["revision"] = client.sync_changes_from_server("127.0.0.1", store.revision, on_page, port=port)
+        store.close()
+
+    thread = threading.Thread(target=worker)
+    frames = []
+    last = time.perf_counter()
+    thread.start()
+    while thread.is_alive():
+        word_id = ui_store.next_due_id()
+        if word_id is not None:
+            ui_store.get_word(word_id)
+        time.sleep(max(0.0, FRAME - (time.perf_counter() - last)))
+        now = time.perf_counter()
+        frames.append(now - last)
+        last = now
+    thread.join()
+    ui_store.close()
+    return frames, counts["words"], result["revision"] is not None
+
+
+def report(label, frames, words):
+    frames = sorted(frames)
+    dropped = sum(1 for frame in frames if frame > FRAME * 1.5)
+    print(f"{label}: {words} 个单词, {len(frames)} 帧, p50 {frames[len(frames) // 2] * 1000:.1f} ms, "
+          f"p99 {frames[int(len(frames) * 0.99)] * 1000:.1f} ms, 最长 {frames[-1] * 1000:.1f} ms, 掉帧 {dropped}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="后台同步时界面线程的帧间隔，以及取消后续传")
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--port", type=int, default=18893)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "server.db")
+        WordDatabase(db_path).add_words(Word(word=f"word{i}", translation=f"翻译{i}") for i in range(args.words))
+        server = AsyncWiFiSyncServer(port=args.port, db_path=db_path)
+        threading.Thread(target=server.start_server, daemon=True).start()
+        server.wait_started(5)
+
+        store_path = os.path.join(tmp, "phone.db")
+        frames, words, done = run_sync(store_path, args.port, cancel_after=args.words // 3)
+        report("取消前", frames, words)
+        assert not done
+        frames, words, done = run_sync(store_path, args.port)
+        report("续传  ", frames, words)
+        assert done
+        store = LocalWordStore(store_path)
+        assert store.count_words() == args.words
+        store.close()
+        server.stop_server()
+
+
+if __name__ == "__main__":
+    main()
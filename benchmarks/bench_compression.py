@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.compression import available_codecs
+from shared.models import Word
+from shared.protocols import SyncProtocol, SyncSession, ChangeSet, WORD_FORMATS
+
+DEFINITIONS = ["to get or be given something", "a person who teaches", "the act of moving quickly",
+               "relating to the natural world", "a small piece of something", "to make something better"]
+
+
+def make_words(count, rng):
+    now = datetime.now()
+    return [Word(id=i, word=f"word{i}", translation=f"释义{rng.randint(0, 9999)}；翻译",
+                 english_translation=rng.choice(DEFINITIONS), memory_tip=f"联想记忆: word{i}",
+                 user_note="", created_at=now, updated_at=now) for i in range(1, count + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比较各编码格式与压缩算法在慢速链路上的体积和传输时间")
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--link-kbps", type=float, default=30.0, help="模拟链路带宽(KB/s)，蓝牙RFCOMM约为数十KB/s")
+    args = parser.parse_args()
+
+    words = make_words(args.words, random.Random(3))
+    changes = ChangeSet(words=words, revision=args.words, full=True)
+    baseline = None
+
+    print(f"{args.words} 个单词, 链路 {args.link_kbps:.0f} KB/s")
+    print(f"{'格式':<10}{'压缩':<10}{'字节数':>12}{'压缩比':>8}{'编码ms':>9}{'解码ms':>9}{'传输s':>9}")
+    for word_format in WORD_FORMATS[::-1]:
+        for codec in available_codecs()[::-1]:
+            session = SyncSession(codec=codec, word_format=word_format)
+
+            start = time.perf_counter()
+            payload = session.encode_payload(SyncProtocol.pack_changes_response(changes, word_format))
+            encode_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            decoded = SyncProtocol.unpack_changes_response(session.decode_payload(payload))
+            decode_s = time.perf_counter() - start
+            assert [word.word for word in decoded.words] == [word.word for word in words]
+
+            baseline = baseline or len(payload)
+            transfer_s = encode_s + len(payload) / (args.link_kbps * 1024) + decode_s
+            print(f"{word_format:<10}{codec:<10}{len(payload):>12}{baseline / len(payload):>8.1f}"
+                  f"{encode_s * 1000:>9.1f}{decode_s * 1000:>9.1f}{transfer_s:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
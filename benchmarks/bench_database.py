@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from shared.models import Word
+
+
+def legacy_get_word(db_path, word_id):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT * FROM words WHERE id = ?', (word_id,))
+    row = cursor.fetchone()
+    conn.close()
+    return row
+
+
+def legacy_add_word(db_path, word):
+    conn = sqlite3.connect(db_path)
+    now = datetime.now()
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO words (word, translation, english_translation, memory_tip, user_note, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (word.word, word.translation, word.english_translation,
+          word.memory_tip, word.user_note, now, now))
+    conn.commit()
+    conn.close()
+
+
+def seed(db_path, count):
+    conn = sqlite3.connect(db_path)
+    now = datetime.now()
+    conn.executemany(
+        'INSERT INTO words (word, translation, english_translation, memory_tip, user_note, created_at, updated_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        ((f"word{i}", f"翻译{i}", "", "", "", now, now) for i in range(count))
+    )
+    conn.commit()
+    conn.close()
+
+
+def per_call_us(func, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比每次调用新建连接与连接池的单次调用延迟")
+    parser.add_argument("--words", type=int, default=200000)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--import-rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        db = WordDatabase(db_path)
+        seed(db_path, args.words)
+
+        results = [
+            ("get_word 旧实现", per_call_us(lambda i: legacy_get_word(db_path, i % args.words + 1), args.calls)),
+            ("get_word 连接池", per_call_us(lambda i: db.get_word(i % args.words + 1), args.calls)),
+            ("add_word 旧实现", per_call_us(lambda i: legacy_add_word(db_path, Word(word=f"legacy{i}", translation="x")), args.calls)),
+            ("add_word 连接池", per_call_us(lambda i: db.add_word(Word(word=f"pooled{i}", translation="x")), args.calls)),
+        ]
+
+        # 新单词、原样重复导入(不应改动任何行)、已有单词换了释义(要更新全文索引)
+        imports = []
+        for name, translation in (("新单词", "翻译{}"), ("已有 未改", "翻译{}"), ("已有 改释义", "新释义{}")):
+            rows = (Word(word=f"bulk{i}", translation=translation.format(i)) for i in range(args.import_rows))
+            start = time.perf_counter()
+            result = db.upsert_words(rows)
+            imports.append((name, args.import_rows / (time.perf_counter() - start), result.written))
+        db.close()
+
+    for name, value in results:
+        print(f"{name:<20} {value:10.1f} us/次")
+    for name, rate, written in imports:
+        print(f"{'upsert_words ' + name:<20} {rate:10.0f} 行/秒  (写入 {written} 行)")
+
+
+if __name__ == "__main__":
+    main()
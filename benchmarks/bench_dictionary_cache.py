@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.api.dictionary_api import DictionaryAPI
+
+
+class StubDictionaryHandler(BaseHTTPRequestHandler):
+    # 本地模拟有道和 dictionaryapi.dev 两个接口，以 zz 开头的单词查无此词，
+    # failure_rate 比例的请求返回503
+    protocol_version = "HTTP/1.1"
+    latency = 0.05
+    failure_rate = 0.0
+    connections = 0
+    requests = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubDictionaryHandler.lock:
+            StubDictionaryHandler.connections += 1
+
+    def do_GET(self):
+        with StubDictionaryHandler.lock:
+            StubDictionaryHandler.requests += 1
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        if random.random() < self.failure_rate:
+            self.reply(503, {})
+        elif url.path == "/suggest":
+            word = parse_qs(url.query)["q"][0]
+            entries = [] if word.startswith("zz") else [{"entry": word, "explain": f"n. {word}的释义"}]
+            self.reply(200, {"data": {"entries": entries}})
+        elif url.path.startswith("/api/v2/entries/en/"):
+            word = url.path.rsplit("/", 1)[-1]
+            if word.startswith("zz"):
+                self.reply(404, {"title": "No Definitions Found"})
+            else:
+                self.reply(200, [{"meanings": [{"definitions": [{"definition": f"definition of {word}"}]}]}])
+        else:
+            self.reply(404, {})
+
+    def reply(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_lookups(api, words):
+    start = time.perf_counter()
+    futures = [api.query_word_async(word) for word in words]
+    for future in futures:
+        future.result()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="词典查询缓存与长连接的效果(本地模拟服务器)")
+    parser.add_argument("--words", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    StubDictionaryHandler.latency = args.latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDictionaryHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    words = [f"word{i}" if i % 10 else f"zzmissing{i}" for i in range(args.words)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        api = DictionaryAPI(max_workers=args.workers, cache_path=os.path.join(tmp, "cache.db"),
+                            youdao_url=f"{base}/suggest", fallback_url=f"{base}/api/v2/entries/en/")
+        cold = run_lookups(api, words)
+        cold_requests, cold_connections = StubDictionaryHandler.requests, StubDictionaryHandler.connections
+        warm = run_lookups(api, words)
+
+        print(f"{args.words} 个单词 (10% 查无此词), 模拟网络延迟 {args.latency_ms:.0f}ms, {args.workers} 个线程")
+        print(f"首次查询   {cold:8.2f} s   请求 {cold_requests} 次, 新建连接 {cold_connections} 个")
+        print(f"再次查询   {warm:8.2f} s   新增请求 {StubDictionaryHandler.requests - cold_requests} 次")
+        for provider, stats in api.stats().items():
+            print(f"{provider:<14} 命中 {stats['hits']:>6}  未命中 {stats['misses']:>6}  查无此词 {stats['not_found']:>5}  "
+                  f"错误 {stats['errors']:>3}  平均延迟 {stats['avg_latency_ms']:6.1f}ms")
+        api.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "android_app"))
+
+from pc_app.database.database import WordDatabase
+from pc_app.sync.async_wifi_sync import AsyncWiFiSyncServer
+from shared.discovery import connect_first, discover
+from shared.models import Word
+from storage.local_store import LocalWordStore
+from sync.sync_client import SyncClient
+
+
+def closed_ports(count):
+    """取几个当前没有监听的本机端口，模拟已经失效的候选地址(连接会被立即拒绝)。"""
+    ports = []
+    for _ in range(count):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            ports.append(sock.getsockname()[1])
+    return ports
+
+
+def first_sync(store_path, servers, targets):
+    """从打开本地库到完成第一次同步的耗时，返回 (秒, 连上的服务器)。"""
+    start = time.perf_counter()
+    store = LocalWordStore(store_path)
+    client = SyncClient(discovery_targets=targets)
+    candidates = servers if servers is not None else store.known_servers()
+    revision = client.sync_changes_from_server(candidates, store.revision, store.apply_changes, outbox=store)
+    assert revision is not None, "同步失败"
+    store.remember_server(*client.server)
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed, client.server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="局域网发现与并行连接的耗时(只使用本机回环地址)")
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=18895)
+    parser.add_argument("--discovery-port", type=int, default=18896)
+    args = parser.parse_args()
+    targets = [("127.0.0.1", args.discovery_port)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "server.db")
+        WordDatabase(db_path).add_words(Word(word=f"word{i}", translation=f"翻译{i}") for i in range(args.words))
+        server = AsyncWiFiSyncServer(port=args.port, db_path=db_path, discovery_port=args.discovery_port)
+        threading.Thread(target=server.start_server, daemon=True).start()
+        assert server.wait_started(5)
+
+        start = time.perf_counter()
+        found = discover(1.0, targets)
+        print(f"发现服务器 {found}: {(time.perf_counter() - start) * 1000:.1f} ms")
+        assert found == [("127.0.0.1", args.port)]
+
+        dead = [("127.0.0.1", port) for port in closed_ports(3)]
+        start = time.perf_counter()
+        sock, address = connect_first(dead + found)
+        sock.close()
+        print(f"并行连接 {len(dead)} 个失效地址和1个有效地址, 选中 {address}: "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+        assert address == found[0]
+
+        store_path = os.path.join(tmp, "phone.db")
+        elapsed, server_address = first_sync(store_path, [], targets)
+        print(f"首次同步(无缓存, 广播查找) {args.words} 个单词: {elapsed * 1000:.1f} ms")
+        elapsed, _ = first_sync(store_path, None, targets)
+        print(f"再次同步(直接连接上次的服务器): {elapsed * 1000:.1f} ms")
+        elapsed, _ = first_sync(store_path, dead, targets)
+        print(f"手动输入的地址都失效, 回退到广播查找: {elapsed * 1000:.1f} ms")
+        server.stop_server()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_dictionary_cache import StubDictionaryHandler
+from pc_app.api.dictionary_api import DictionaryAPI
+from pc_app.api.enrichment import EnrichmentJob
+from pc_app.database.database import WordDatabase
+from shared.models import Word
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量补全单词的吞吐量(本地模拟词典服务器)")
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--rate", type=float, default=0, help="每个词典每秒请求数上限，0为不限")
+    args = parser.parse_args()
+
+    StubDictionaryHandler.latency = args.latency_ms / 1000
+    StubDictionaryHandler.failure_rate = args.failure_rate
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDictionaryHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{args.words} 个单词, 模拟延迟 {args.latency_ms:.0f}ms, {args.failure_rate:.0%} 请求返回503")
+    print(f"{'并发':>6}{'词/秒':>10}{'补全':>8}{'失败':>6}{'耗时s':>9}")
+    for concurrency in args.concurrency:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = WordDatabase(os.path.join(tmp, "bench.db"))
+            db.add_words(Word(word=f"word{i}" if i % 10 else f"zzmissing{i}") for i in range(args.words))
+            # 每轮用新的缓存，测的是真实请求的吞吐
+            api = DictionaryAPI(max_workers=concurrency, cache_path=os.path.join(tmp, "cache.db"),
+                                youdao_url=f"{base}/suggest", fallback_url=f"{base}/api/v2/entries/en/")
+            job = EnrichmentJob(db, api, concurrency=concurrency, backoff=0.05,
+                                rate_limits={provider: args.rate for provider in api.stats()})
+            progress = job.run()
+            print(f"{concurrency:>6}{progress.rate:>10.1f}{progress.updated:>8}{progress.failed:>6}{progress.elapsed:>9.2f}")
+            api.close()
+            db.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
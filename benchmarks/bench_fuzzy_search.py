@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from shared.models import Word
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def random_words(rng, count):
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(LETTERS) for _ in range(rng.randint(4, 12))))
+    return list(words)
+
+
+def misspell(rng, word):
+    """随机做一次删除、插入、替换或相邻互换。"""
+    i = rng.randrange(len(word) - 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return word[:i] + word[i + 1:]
+    if kind == 1:
+        return word[:i] + rng.choice(LETTERS) + word[i:]
+    if kind == 2:
+        return word[:i] + rng.choice(LETTERS) + word[i + 1:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def percentiles(func, args):
+    times = []
+    for arg in args:
+        start = time.perf_counter()
+        func(arg)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return times[len(times) // 2], times[int(len(times) * 0.99)], times[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模糊搜索的延迟与召回率")
+    parser.add_argument("--words", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    words = random_words(rng, args.words)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = WordDatabase(os.path.join(tmp, "bench.db"))
+        db.add_words((Word(word=w, translation="释义") for w in words), chunk_size=20000)
+
+        targets = rng.sample([w for w in words if len(w) >= 6], args.queries)
+        queries = [misspell(rng, w) for w in targets]
+        db.fuzzy_search(queries[0])  # 预热连接
+
+        found = sum(target in [row.word for row in db.fuzzy_search(query, limit=10)]
+                    for target, query in zip(targets, queries))
+        p50, p99, worst = percentiles(lambda q: db.fuzzy_search(q, limit=10), queries)
+        print(f"{args.words} 个单词, {args.queries} 次拼错一处的查询")
+        print(f"fuzzy_search  p50 {p50:.2f} ms, p99 {p99:.2f} ms, max {worst:.2f} ms")
+        print(f"前10条召回原词 {found / len(queries):.1%}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "android_app"))
+
+from pc_app.database.database import WordDatabase
+from pc_app.sync.handler import SyncHandler
+from shared.models import Word
+from shared.protocols import SyncProtocol
+from storage.local_store import LocalWordStore
+
+
+def pull(handler, session, since, on_page, page_size):
+    """不经过网络逐页拉取变更，返回传输的字节数。"""
+    sent = 0
+    while True:
+        payload = handler.changes_since(since, page_size, session)
+        sent += len(payload)
+        changes = SyncProtocol.unpack_changes_response(session.decode_payload(payload))
+        on_page(changes)
+        since = changes.revision
+        if not changes.more:
+            return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="安卓端本地库：重启后的启动耗时和同步流量")
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--edits", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = WordDatabase(os.path.join(tmp, "server.db"))
+        db.add_words(Word(word=f"word{i}", translation=f"翻译{i}", english_translation="an example definition")
+                     for i in range(args.words))
+        handler = SyncHandler(db)
+        session = SyncProtocol.negotiate(SyncProtocol.parse_message(SyncProtocol.create_hello())["data"])
+
+        # 旧做法：单词只在内存里，每次启动都从头全量同步
+        start = time.perf_counter()
+        words_by_id = {}
+
+        def keep_in_memory(changes):
+            for word in changes.words:
+                words_by_id[word.id] = word
+
+        full_bytes = pull(handler, session, 0, keep_in_memory, args.page_size)
+        memory_start = time.perf_counter() - start
+
+        store_path = os.path.join(tmp, "phone.db")
+        store = LocalWordStore(store_path)
+        start = time.perf_counter()
+        pull(handler, session, 0, store.apply_changes, args.page_size)
+        first_sync = time.perf_counter() - start
+        store.close()
+
+        for word in db.page_words(limit=args.edits):
+            word.user_note = "edited"
+            db.update_word(word)
+
+        # 新做法：重启后打开本地库显示第一张卡片，再只拉取离线期间的变更
+        start = time.perf_counter()
+        store = LocalWordStore(store_path)
+        card = store.get_word(store.next_due_id())
+        cold_start = time.perf_counter() - start
+        delta_bytes = pull(handler, session, store.revision, store.apply_changes, args.page_size)
+        assert card is not None and store.count_words() == args.words
+        store.close()
+        db.close()
+
+        print(f"{args.words} 个单词, 离线期间PC端修改 {args.edits} 个, 编码 {session.codec}/{session.word_format}")
+        print(f"内存保存  每次启动全量同步 {full_bytes / 1024:9.1f} KB, 拉取 {memory_start * 1000:8.1f} ms")
+        print(f"本地库    首次同步写入 {first_sync * 1000:8.1f} ms")
+        print(f"本地库    冷启动到第一张卡片 {cold_start * 1000:8.2f} ms, 增量同步 {delta_bytes / 1024:9.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.api.offline_dict import OfflineDictionary, build_offline_dictionary
+from pc_app.convert_dictionary import read_ecdict
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def make_ecdict(path, count, rng):
+    # 生成与 ECDICT 同样表头的CSV，单词随机
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(LETTERS) for _ in range(rng.randint(3, 12))))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["word", "phonetic", "definition", "translation", "pos", "collins", "oxford", "tag"])
+        for word in words:
+            writer.writerow([word, "", f"n. a sample definition of {word}",
+                             f"n. {word}的释义\\nv. 动词用法", "", "", "", ""])
+    return sorted(words)
+
+
+def lookup_us(lookup, words):
+    times = []
+    for word in words:
+        start = time.perf_counter()
+        lookup(word)
+        times.append((time.perf_counter() - start) * 1e6)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线词典的转换、打开与查询耗时")
+    parser.add_argument("--entries", type=int, default=770000, help="词条数，ECDICT约77万")
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "ecdict.csv")
+        dict_path = os.path.join(tmp, "offline_dict.wbd")
+        words = make_ecdict(csv_path, args.entries, rng)
+
+        start = time.perf_counter()
+        build_offline_dictionary(read_ecdict(csv_path), dict_path)
+        convert = time.perf_counter() - start
+
+        start = time.perf_counter()
+        offline = OfflineDictionary(dict_path)
+        open_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        loaded = {word.lower(): (translation, definition) for word, translation, definition in read_ecdict(csv_path)}
+        load_dict = time.perf_counter() - start
+
+        hits = [rng.choice(words) for _ in range(args.lookups)]
+        misses = [word + "q" for word in hits]
+
+        print(f"{args.entries} 个词条")
+        print(f"CSV {os.path.getsize(csv_path) / 1e6:.1f} MB -> 离线词典 {os.path.getsize(dict_path) / 1e6:.1f} MB，"
+              f"转换 {convert:.1f}s")
+        print(f"打开离线词典      {open_ms:8.3f} ms")
+        print(f"读CSV建内存字典   {load_dict * 1000:8.0f} ms  (对照)")
+        print(f"{'查询':<16}{'p50 µs':>10}{'p99 µs':>10}")
+        for name, lookup, sample in (("离线词典 命中", offline.lookup, hits),
+                                     ("离线词典 未命中", offline.lookup, misses),
+                                     ("内存字典 命中", loaded.get, hits)):
+            p50, p99 = lookup_us(lookup, sample)
+            print(f"{name:<16}{p50:>10.2f}{p99:>10.2f}")
+        offline.close()
+
+
+if __name__ == "__main__":
+    main()
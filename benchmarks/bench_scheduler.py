@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from pc_app.database.scheduler import ReviewScheduler
+from shared.models import Word
+
+GRADE_WEIGHTS = ((1, 10), (3, 20), (4, 55), (5, 15))
+
+
+def synthetic_grades(rng):
+    grades = [g for g, weight in GRADE_WEIGHTS for _ in range(weight)]
+    while True:
+        yield rng.choice(grades)
+
+
+def replay_db(db, reviews, rng):
+    scheduler = ReviewScheduler(db, batch_size=200, flush_size=200)
+    grades = synthetic_grades(rng)
+    clock = time.time()
+    start = time.perf_counter()
+    for _ in range(reviews):
+        word, state = scheduler.next_card()
+        clock += 5
+        scheduler.grade(state, next(grades), clock)
+    scheduler.flush()
+    return reviews / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回放合成复习记录，测量调度器吞吐")
+    parser.add_argument("--words", type=int, default=50000)
+    parser.add_argument("--reviews", type=int, default=1000000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = WordDatabase(os.path.join(tmp, "bench.db"))
+        db.add_words(Word(word=f"word{i}", translation=f"翻译{i}") for i in range(args.words))
+        db_rate = replay_db(db, args.reviews, rng)
+        db.close()
+
+    print(f"{args.words} 个单词, 回放 {args.reviews} 次复习")
+    print(f"ReviewScheduler (SQLite) {db_rate:10.0f} 次/秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from shared.models import Word
+
+SYLLABLES = ["re", "ce", "ive", "pro", "duc", "tion", "ab", "sol", "ute", "con", "tra", "ment", "ing", "ex", "pla", "in"]
+HANZI = "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可也你"
+
+
+def make_words(count, rng):
+    for i in range(count):
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + str(i)
+        translation = "".join(rng.choice(HANZI) for _ in range(rng.randint(2, 8)))
+        yield Word(word=word, translation=translation)
+
+
+def timed_ms(func, queries):
+    start = time.perf_counter()
+    for q in queries:
+        func(q)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比LIKE扫描与FTS5全文索引的搜索延迟")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = WordDatabase(os.path.join(tmp, "bench.db"))
+        db.add_words(make_words(args.rows, rng), chunk_size=20000)
+
+        queries = [f"{rng.choice(SYLLABLES)}{rng.choice(SYLLABLES)}{rng.randint(0, args.rows)}"[:7]
+                   for _ in range(args.queries)]
+        conn = db.pool.connection()
+
+        def like_scan(q):
+            pattern = f"%{q}%"
+            conn.execute(
+                "SELECT * FROM words WHERE word LIKE ? OR translation LIKE ? OR user_note LIKE ? "
+                "ORDER BY created_at DESC LIMIT ?", (pattern, pattern, pattern, args.limit)
+            ).fetchall()
+
+        print(f"{args.rows} 行, 每次返回至多 {args.limit} 条")
+        print(f"LIKE 扫描     {timed_ms(like_scan, queries):8.2f} ms/次")
+        print(f"FTS5 trigram {timed_ms(lambda q: db.search_words(q, limit=args.limit), queries):8.2f} ms/次")
+        print(f"前缀查询      {timed_ms(lambda q: db.search_words(q[:4] + '*', limit=args.limit), queries):8.2f} ms/次")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
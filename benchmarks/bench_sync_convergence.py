@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "android_app"))
+
+from pc_app.database.database import WordDatabase
+from pc_app.sync.async_wifi_sync import AsyncWiFiSyncServer
+from shared.models import Word
+from shared.srs import ReviewState
+from storage.local_store import LocalWordStore
+from sync.sync_client import SyncClient
+
+
+class Clock:
+    """逻辑时钟：每次修改取一个严格递增的时间，结果不依赖真实时间，可以复现。"""
+
+    def __init__(self):
+        self.base = datetime.now() + timedelta(days=1)
+        self.ticks = 0
+
+    def next(self) -> datetime:
+        self.ticks += 1
+        return self.base + timedelta(milliseconds=self.ticks)
+
+
+def sync(store, port):
+    client = SyncClient()
+    revision = client.sync_changes_from_server("127.0.0.1", store.revision, store.apply_changes,
+                                               port=port, outbox=store)
+    assert revision is not None, "同步失败"
+    return client.pushed
+
+
+def notes(conn):
+    return dict(conn.execute("SELECT id, user_note FROM words"))
+
+
+def reviews(conn):
+    return {row[0]: row for row in conn.execute(
+        "SELECT word_id, ease, interval, repetitions, lapses, due_at, reviewed_at FROM reviews "
+        "WHERE reviewed_at IS NOT NULL"
+    )}
+
+
+def run_rounds(args, db, stores, port, rng, clock):
+    """每轮每个客户端和PC端都改一批热点单词的笔记、给一些单词评分，再按随机顺序同步。"""
+    word_ids = [row[0] for row in db.pool.connection().execute("SELECT id FROM words ORDER BY id")]
+    hot = rng.sample(word_ids, args.hot)
+    expected_notes, expected_reviews = {}, {}
+
+    for round_no in range(args.rounds):
+        for client_no, store in enumerate(stores):
+            for word_id in rng.sample(hot, args.edits):
+                ts, note = clock.next(), f"c{client_no}-r{round_no}-{word_id}"
+                store.update_note(word_id, note, now=ts)
+                expected_notes[word_id] = note
+            for word_id in rng.sample(hot, args.edits):
+                reviewed_at = clock.next().timestamp()
+                state = ReviewState(word_id=word_id, repetitions=round_no + 1, due_at=reviewed_at + 86400,
+                                    reviewed_at=reviewed_at)
+                store.save_review(state)
+                expected_reviews[word_id] = reviewed_at
+
+        pc_edits = []
+        for word_id in rng.sample(hot, args.edits):
+            word = db.get_word(word_id).to_word()
+            word.user_note, word.updated_at = f"pc-r{round_no}-{word_id}", clock.next()
+            pc_edits.append(word)
+            expected_notes[word_id] = word.user_note
+        pc_reviews = []
+        for word_id in rng.sample(hot, args.edits):
+            reviewed_at = clock.next().timestamp()
+            pc_reviews.append(ReviewState(word_id=word_id, repetitions=round_no + 1, due_at=reviewed_at + 86400,
+                                          reviewed_at=reviewed_at))
+            expected_reviews[word_id] = reviewed_at
+        db.apply_client_changes(pc_edits, pc_reviews)
+
+        order = list(range(len(stores)))
+        rng.shuffle(order)
+        for client_no in order:
+            sync(stores[client_no], port)
+
+    # 最后一轮推送的修改要再拉一次才能到达排在前面同步的客户端
+    for store in stores:
+        sync(store, port)
+    return expected_notes, expected_reviews
+
+
+def check(db, stores, expected_notes, expected_reviews):
+    server = notes(db.pool.connection())
+    for word_id, note in expected_notes.items():
+        assert server[word_id] == note, f"单词 {word_id}: 服务器 {server[word_id]!r}, 应为 {note!r}"
+    server_reviews = reviews(db.pool.connection())
+    for word_id, reviewed_at in expected_reviews.items():
+        assert server_reviews[word_id][-1] == reviewed_at, f"单词 {word_id} 的复习记录不是最新的"
+    for client_no, store in enumerate(stores):
+        assert notes(store.conn) == server, f"客户端 {client_no} 的笔记与服务器不一致"
+        assert reviews(store.conn) == server_reviews, f"客户端 {client_no} 的复习进度与服务器不一致"
+        assert store.count_pending() == 0
+
+
+def measure_bulk(args, db, stores, port, clock):
+    """一个客户端离线改了大量单词后同步：推送合并的耗时，以及另一个客户端拉取合并的耗时。"""
+    writer, reader = stores[0], stores[1]
+    word_ids = [row[0] for row in db.pool.connection().execute("SELECT id FROM words LIMIT ?", (args.bulk,))]
+    for word_id in word_ids:
+        writer.update_note(word_id, f"bulk-{word_id}", now=clock.next())
+
+    start = time.perf_counter()
+    pushed = sync(writer, port)
+    push_time = time.perf_counter() - start
+    start = time.perf_counter()
+    sync(reader, port)
+    pull_time = time.perf_counter() - start
+    assert notes(reader.conn) == notes(db.pool.connection())
+
+    start = time.perf_counter()
+    applied, stale, _ = db.apply_client_changes(
+        [Word(id=word_id, word=f"word{word_id - 1}", translation=f"翻译{word_id - 1}",
+              user_note="direct", updated_at=clock.next()) for word_id in word_ids]
+    )
+    direct_time = time.perf_counter() - start
+    assert applied == len(word_ids) and not stale
+    return pushed, push_time, pull_time, direct_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多客户端双向同步的收敛检查与大批量合并耗时")
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--hot", type=int, default=300, help="各方反复修改的热点单词数，制造冲突")
+    parser.add_argument("--edits", type=int, default=100, help="每方每轮修改的单词数")
+    parser.add_argument("--bulk", type=int, default=20000, help="大批量合并测试的修改数")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--port", type=int, default=18894)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    clock = Clock()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = WordDatabase(os.path.join(tmp, "server.db"))
+        db.add_words(Word(word=f"word{i}", translation=f"翻译{i}") for i in range(args.words))
+        server = AsyncWiFiSyncServer(port=args.port, db_path=db.db_path)
+        threading.Thread(target=server.start_server, daemon=True).start()
+        server.wait_started(5)
+
+        stores = [LocalWordStore(os.path.join(tmp, f"phone{i}.db")) for i in range(args.clients)]
+        for store in stores:
+            sync(store, args.port)
+
+        start = time.perf_counter()
+        expected_notes, expected_reviews = run_rounds(args, db, stores, args.port, rng, clock)
+        rounds_time = time.perf_counter() - start
+        check(db, stores, expected_notes, expected_reviews)
+        print(f"{args.clients} 个客户端 + PC端, {args.rounds} 轮, 热点 {args.hot} 个单词: "
+              f"全部收敛到后写者的版本, 耗时 {rounds_time:.2f}s")
+
+        pushed, push_time, pull_time, direct_time = measure_bulk(args, db, stores, args.port, clock)
+        print(f"离线修改 {pushed} 个单词: 推送合并 {push_time * 1000:.0f} ms, "
+              f"另一客户端拉取合并 {pull_time * 1000:.0f} ms")
+        print(f"服务器端 apply_client_changes {args.bulk} 条: {direct_time * 1000:.0f} ms "
+              f"({args.bulk / direct_time:,.0f} 条/s)")
+
+        for store in stores:
+            store.close()
+        server.stop_server()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
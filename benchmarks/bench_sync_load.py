@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from pc_app.sync.async_wifi_sync import AsyncWiFiSyncServer, read_frame
+from pc_app.sync.wifi_sync import WiFiSyncServer
+from shared.models import Word
+from shared.protocols import SyncProtocol, encode_frame
+
+
+async def simulated_client(port, page_size):
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    since, received = 0, 0
+    while True:
+        request = SyncProtocol.create_changes_request(since, page_size)
+        writer.write(encode_frame(request.encode("utf-8")))
+        await writer.drain()
+        changes = SyncProtocol.parse_changes_response((await read_frame(reader)).decode("utf-8"))
+        received += len(changes.words)
+        since = changes.revision
+        if not changes.more:
+            break
+    writer.close()
+    await writer.wait_closed()
+    return time.perf_counter() - start, received
+
+
+async def run_clients(port, clients, page_size):
+    return await asyncio.gather(*(simulated_client(port, page_size) for _ in range(clients)))
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模拟多个客户端同时同步，统计同步延迟分布")
+    parser.add_argument("--clients", type=int, default=60)
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--server", choices=("async", "thread"), default="async")
+    parser.add_argument("--port", type=int, default=18892)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        WordDatabase(db_path).add_words(Word(word=f"word{i}", translation=f"翻译{i}") for i in range(args.words))
+
+        if args.server == "async":
+            server = AsyncWiFiSyncServer(port=args.port, db_path=db_path)
+        else:
+            server = WiFiSyncServer(port=args.port, db_path=db_path)
+        threading.Thread(target=server.start_server, daemon=True).start()
+        time.sleep(0.5)
+
+        start = time.perf_counter()
+        results = asyncio.run(run_clients(args.port, args.clients, args.page_size))
+        wall = time.perf_counter() - start
+        server.stop_server()
+        cache_stats = server.handler.cache.stats()
+
+    latencies = [elapsed for elapsed, _ in results]
+    print(f"{args.server} 服务器, {args.clients} 个客户端各同步 {results[0][1]} 个单词, 总耗时 {wall:.2f}s")
+    print(f"p50 {percentile(latencies, 50) * 1000:8.1f} ms   p99 {percentile(latencies, 99) * 1000:8.1f} ms   "
+          f"平均 {statistics.mean(latencies) * 1000:8.1f} ms")
+    print(f"快照缓存: 命中 {cache_stats['hits']}, 未命中 {cache_stats['misses']}, 合并等待 {cache_stats['coalesced']}")
+
+
+if __name__ == "__main__":
+    main()
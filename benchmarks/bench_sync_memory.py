@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from pc_app.sync.wifi_sync import WiFiSyncServer, WiFiSyncClient
+from shared.models import Word
+
+
+def peak_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_server(db_path, port):
+    WiFiSyncServer(port=port, db_path=db_path).start_server()
+
+
+def run_client(port, mode, results):
+    client = WiFiSyncClient()
+    client.connect_to_server("127.0.0.1", port)
+    client.socket.settimeout(None)
+    start = time.perf_counter()
+    if mode == "full":
+        count = len(client.sync_words())
+    else:
+        words = {}
+
+        def on_page(changes):
+            for word in changes.words:
+                words[word.id] = word
+
+        client.sync_changes(0, on_page)
+        count = len(words)
+    elapsed = time.perf_counter() - start
+    client.disconnect()
+    results.put((count, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量全量同步与分页同步时服务器和客户端的峰值内存")
+    parser.add_argument("--words", type=int, default=500000)
+    parser.add_argument("--port", type=int, default=18890)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        db = WordDatabase(db_path)
+        db.add_words(Word(word=f"word{i}", translation=f"翻译{i}", english_translation="an example definition")
+                     for i in range(args.words))
+        db.close()
+
+        for offset, mode in enumerate(("full", "paged")):
+            port = args.port + offset
+            server = multiprocessing.Process(target=run_server, args=(db_path, port), daemon=True)
+            server.start()
+            time.sleep(1)
+
+            results = multiprocessing.Queue()
+            client = multiprocessing.Process(target=run_client, args=(port, mode, results))
+            client.start()
+            count, elapsed, client_rss = results.get()
+            client.join()
+            server_rss = peak_rss_mb(server.pid)
+            server.terminate()
+
+            print(f"{mode:<6} {count} 个单词 {elapsed:6.2f}s  服务器峰值 {server_rss:7.1f} MB  客户端峰值 {client_rss:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.models import Word
+from shared.word_codec import encode_words, decode_words
+
+
+def make_words(count):
+    now = datetime.now()
+    words = []
+    for i in range(1, count + 1):
+        created = now - timedelta(seconds=i)
+        words.append(Word(id=i, word=f"word{i}", translation=f"释义{i}；翻译",
+                          english_translation="to get or be given something", memory_tip=f"联想记忆: word{i}",
+                          user_note="", created_at=created, updated_at=created))
+    return words
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比单词批量的JSON编码与二进制编码")
+    parser.add_argument("--words", type=int, default=1000000)
+    args = parser.parse_args()
+
+    words = make_words(args.words)
+
+    json_bytes, json_encode = timed(lambda: json.dumps([w.to_dict() for w in words], ensure_ascii=False).encode("utf-8"))
+    json_words, json_decode = timed(lambda: [Word.from_dict(d) for d in json.loads(json_bytes.decode("utf-8"))])
+    binary_bytes, binary_encode = timed(lambda: encode_words(words))
+    binary_words, binary_decode = timed(lambda: decode_words(binary_bytes))
+    assert json_words == words and binary_words == words
+
+    print(f"{args.words} 个单词")
+    print(f"{'':<8}{'字节数':>14}{'编码s':>9}{'解码s':>9}")
+    print(f"{'json':<8}{len(json_bytes):>14}{json_encode:>9.2f}{json_decode:>9.2f}")
+    print(f"{'binary':<8}{len(binary_bytes):>14}{binary_encode:>9.2f}{binary_decode:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
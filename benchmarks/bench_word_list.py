@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from pc_app.database.word_pages import WordPager
+from shared.models import Word
+
+LIST_COLUMNS = ("word", "translation")
+
+
+def frame_times(pager, tops, visible):
+    # 只计数据部分: 每帧向分页器取一屏可见的行，对应 VirtualWordList.render 里的 rows()
+    times = []
+    for top in tops:
+        start = time.perf_counter()
+        pager.rows(top, visible)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def report(name, times):
+    times = sorted(times)
+    p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+    print(f"{name:<16}{statistics.median(times):>10.3f}{p99:>10.3f}{times[-1]:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="单词列表虚拟滚动的数据读取耗时")
+    parser.add_argument("--words", type=int, default=1000000)
+    parser.add_argument("--visible", type=int, default=12)
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = WordDatabase(os.path.join(tmp, "bench.db"))
+        db.add_words(Word(word=f"word{i}", translation=f"释义{i}；翻译") for i in range(args.words))
+
+        start = time.perf_counter()
+        pager = WordPager(db, LIST_COLUMNS)
+        pager.rows(0, args.visible)
+        open_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        db.get_all_words(columns=LIST_COLUMNS)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        print(f"{args.words} 个单词, 每屏 {args.visible} 行")
+        print(f"打开列表(分页)   {open_ms:10.1f} ms")
+        print(f"打开列表(全量读) {full_ms:10.1f} ms  (旧实现还要为每行创建4个控件)")
+        print(f"{'每帧取数':<16}{'p50 ms':>10}{'p99 ms':>10}{'最长 ms':>10}")
+
+        tops = [i * 3 for i in range(args.frames)]
+        report("滚轮向下", frame_times(WordPager(db, LIST_COLUMNS), tops, args.visible))
+        report("滚轮向上", frame_times(WordPager(db, LIST_COLUMNS), tops[::-1], args.visible))
+
+        rng = random.Random(1)
+        jumps = [rng.randrange(args.words - args.visible) for _ in range(200)]
+        report("拖动滚动条跳转", frame_times(WordPager(db, LIST_COLUMNS), jumps, args.visible))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from shared.models import Word
+
+
+def dataclass_load(db):
+    # 原实现: SELECT * 后为每行构造 Word 并解析两个时间列
+    rows = db.pool.connection().execute('SELECT * FROM words ORDER BY created_at DESC').fetchall()
+    return [Word(id=row[0], word=row[1], translation=row[2], english_translation=row[3],
+                 memory_tip=row[4], user_note=row[5], created_at=datetime.fromisoformat(row[6]),
+                 updated_at=datetime.fromisoformat(row[7])) for row in rows]
+
+
+def measure(load, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = load()
+        best = min(best, time.perf_counter() - start)
+        del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, size, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比 dataclass Word 与 WordRow 的列表加载耗时和内存")
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = WordDatabase(os.path.join(tmp, "bench.db"))
+        db.add_words(Word(word=f"word{i}", translation=f"释义{i}；翻译", english_translation="to get or be given something",
+                          memory_tip=f"联想记忆: word{i}") for i in range(args.words))
+
+        cases = [
+            ("dataclass Word", lambda: dataclass_load(db)),
+            ("WordRow 全部列", lambda: db.get_all_words()),
+            ("WordRow 列表列", lambda: db.get_all_words(columns=("word", "translation"))),
+        ]
+        print(f"{args.words} 个单词")
+        print(f"{'':<18}{'加载ms':>10}{'MB/10万词':>12}")
+        for name, load in cases:
+            seconds, size, count = measure(load, args.repeat)
+            print(f"{name:<18}{seconds * 1000:>10.1f}{size / count * 100000 / 1e6:>12.1f}")
+
+        words = db.get_all_words()
+        start = time.perf_counter()
+        for word in words:
+            word.created_at
+        print(f"{'首次访问全部created_at':<18}{(time.perf_counter() - start) * 1000:>10.1f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
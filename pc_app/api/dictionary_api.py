@@ -1,63 +1,201 @@
 import requests
-import json
-from typing import Dict, Optional
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from requests.adapters import HTTPAdapter
+from pc_app.api.lookup_cache import LookupCache
+from pc_app.api.offline_dict import OfflineDictionary
+
+YOUDAO = "youdao"
+ENGLISH_DICT = "dictionaryapi"
+
+@dataclass
+class ProviderStats:
+    offline_hits: int = 0
+    hits: int = 0
+    misses: int = 0
+    not_found: int = 0
+    errors: int = 0
+    latency: float = 0.0
 
 class DictionaryAPI:
-    def __init__(self):
-        self.youdao_url = "https://dict.youdao.com/suggest"
-        self.fallback_url = "https://api.dictionaryapi.dev/api/v2/entries/en/"
+    def __init__(self, max_workers: int = 4, cache_path: Optional[str] = "dictionary_cache.db",
+                 offline_path: Optional[str] = "offline_dict.wbd",
+                 youdao_url: str = "https://dict.youdao.com/suggest",
+                 fallback_url: str = "https://api.dictionaryapi.dev/api/v2/entries/en/"):
+        self.youdao_url = youdao_url
+        self.fallback_url = fallback_url
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dictionary")
+        # 复用同一个 Session，对同一主机保持长连接，不必每次查询都重新握手
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.cache = LookupCache(cache_path) if cache_path else None
+        # 离线词典用 pc_app/convert_dictionary.py 生成，存在时优先使用，查不到才走网络
+        self.offline = OfflineDictionary(offline_path) if offline_path and os.path.exists(offline_path) else None
+        self._fetchers = {YOUDAO: self._fetch_youdao, ENGLISH_DICT: self._fetch_english_dict}
+        self._stats = {YOUDAO: ProviderStats(), ENGLISH_DICT: ProviderStats()}
+        self._stats_lock = threading.Lock()
     
     def query_word(self, word: str) -> Dict[str, str]:
+        return self.query_word_async(word).result()
+    
+    def query_word_async(self, word: str) -> Future:
+        """两个词典同时在后台线程查询，都结束后 Future 给出与 query_word 相同的结果。
+        取消返回的 Future 会一并取消还没开始的查询，已经发出的请求结果会被丢弃。"""
         result = {
             'word': word,
             'translation': '',
             'english_translation': '',
             'memory_tip': ''
         }
+        future = Future()
+        if self.offline is not None:
+            # 离线词典里两项都有时不必经过线程池
+            entry = self.offline.lookup(word)
+            if entry and all(entry):
+                with self._stats_lock:
+                    self._stats[YOUDAO].offline_hits += 1
+                    self._stats[ENGLISH_DICT].offline_hits += 1
+                result['translation'], result['english_translation'] = entry
+                future.set_result(result)
+                return future
+        parts = {
+            'translation': self.executor.submit(self._query_youdao, word),
+            'english_translation': self.executor.submit(self._query_english_dict, word),
+        }
+        lock = threading.Lock()
+        remaining = [len(parts)]
+        
+        def on_part_done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            if not future.set_running_or_notify_cancel():
+                return
+            for key, part in parts.items():
+                value = None if part.cancelled() else part.result()
+                if value:
+                    result[key] = value
+            future.set_result(result)
+        
+        def on_cancel(done):
+            if done.cancelled():
+                for part in parts.values():
+                    part.cancel()
+        
+        future.add_done_callback(on_cancel)
+        for part in parts.values():
+            part.add_done_callback(on_part_done)
+        return future
+    
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._stats_lock:
+            result = {}
+            for provider, stats in self._stats.items():
+                requests_made = stats.misses + stats.errors
+                lookups = stats.hits + requests_made
+                result[provider] = {
+                    'offline_hits': stats.offline_hits,
+                    'hits': stats.hits,
+                    'misses': stats.misses,
+                    'not_found': stats.not_found,
+                    'errors': stats.errors,
+                    'hit_rate': stats.hits / lookups if lookups else 0.0,
+                    'avg_latency_ms': stats.latency / requests_made * 1000 if requests_made else 0.0,
+                }
+            return result
+    
+    def fetch(self, provider: str, word: str, before_request: Optional[Callable[[], None]] = None) -> Optional[str]:
+        """查询单个词典，依次查离线词典、缓存、网络。查无此词返回 None，网络错误直接抛出；
+        before_request 在真正发出网络请求前调用，批量任务用它做限速。"""
+        if self.offline is not None:
+            entry = self.offline.lookup(word)
+            value = entry[0 if provider == YOUDAO else 1] if entry else None
+            if value:
+                with self._stats_lock:
+                    self._stats[provider].offline_hits += 1
+                return value
         
-        translation = self._query_youdao(word)
-        if translation:
-            result['translation'] = translation
+        if self.cache is not None:
+            hit, value = self.cache.get(provider, word)
+            if hit:
+                with self._stats_lock:
+                    self._stats[provider].hits += 1
+                return value
         
-        english_def = self._query_english_dict(word)
-        if english_def:
-            result['english_translation'] = english_def
+        if before_request is not None:
+            before_request()
+        start = time.perf_counter()
+        try:
+            value = self._fetchers[provider](word)
+        except Exception:
+            with self._stats_lock:
+                self._stats[provider].errors += 1
+                self._stats[provider].latency += time.perf_counter() - start
+            raise
         
-        return result
+        with self._stats_lock:
+            stats = self._stats[provider]
+            stats.misses += 1
+            stats.latency += time.perf_counter() - start
+            if value is None:
+                stats.not_found += 1
+        # 词典明确答复了(包括查无此词)才缓存，网络错误下次还会重试
+        if self.cache is not None:
+            self.cache.put(provider, word, value)
+        return value
     
     def _query_youdao(self, word: str) -> Optional[str]:
         try:
-            params = {
-                'q': word,
-                'doctype': 'json'
-            }
-            response = requests.get(self.youdao_url, params=params, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if 'data' in data and 'entries' in data['data']:
-                    entries = data['data']['entries']
-                    if entries:
-                        return entries[0].get('explain', '')
+            return self.fetch(YOUDAO, word)
         except Exception as e:
             print(f"有道API查询失败: {e}")
-        
-        return None
+            return None
     
     def _query_english_dict(self, word: str) -> Optional[str]:
         try:
-            url = f"{self.fallback_url}{word}"
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if data and len(data) > 0:
-                    meanings = data[0].get('meanings', [])
-                    if meanings:
-                        definitions = meanings[0].get('definitions', [])
-                        if definitions:
-                            return definitions[0].get('definition', '')
+            return self.fetch(ENGLISH_DICT, word)
         except Exception as e:
             print(f"英文词典API查询失败: {e}")
-        
+            return None
+    
+    def _fetch_youdao(self, word: str) -> Optional[str]:
+        params = {
+            'q': word,
+            'doctype': 'json'
+        }
+        response = self.session.get(self.youdao_url, params=params, timeout=5)
+        response.raise_for_status()
+        data = response.json()
+        if 'data' in data and 'entries' in data['data']:
+            entries = data['data']['entries']
+            if entries:
+                return entries[0].get('explain', '')
+        return None
+    
+    def _fetch_english_dict(self, word: str) -> Optional[str]:
+        url = f"{self.fallback_url}{word}"
+        response = self.session.get(url, timeout=5)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        data = response.json()
+        if data and len(data) > 0:
+            meanings = data[0].get('meanings', [])
+            if meanings:
+                definitions = meanings[0].get('definitions', [])
+                if definitions:
+                    return definitions[0].get('definition', '')
         return None
     
     def generate_memory_tip(self, word: str, translation: str) -> str:
@@ -0,0 +1,173 @@
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+from pc_app.api.dictionary_api import DictionaryAPI, YOUDAO, ENGLISH_DICT
+from pc_app.database.database import WordDatabase
+from shared.models import WordRow
+
+DEFAULT_RATE_LIMITS = {YOUDAO: 5.0, ENGLISH_DICT: 5.0}
+
+class RateLimiter:
+    """令牌桶限速：平均每秒 rate 次，最多攒 burst 次突发。"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+@dataclass
+class EnrichmentProgress:
+    done: int = 0
+    total: int = 0
+    updated: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+    @property
+    def rate(self) -> float:
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+class EnrichmentJob:
+    """批量补全中文翻译或英文释义为空的单词。
+
+    按id顺序每次取 batch_size 个单词，用 concurrency 个线程并发查询，每个词典单独限速，
+    网络错误按指数退避重试；一批查完后一次事务写回，再把这批最后的id写进断点文件，
+    中断后再次运行从断点继续。重试后仍查询失败的单词之后断点不再前进，下次运行从它开始重查
+    (之后已补全的单词不会再被取出)；全部成功完成后删除断点文件。
+    """
+
+    def __init__(self, db: WordDatabase, api: DictionaryAPI, concurrency: int = 8,
+                 rate_limits: Optional[Dict[str, float]] = None, max_retries: int = 3,
+                 backoff: float = 0.5, batch_size: int = 200, checkpoint_path: Optional[str] = None):
+        self.db = db
+        self.api = api
+        self.concurrency = concurrency
+        limits = DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits
+        self.limiters = {provider: RateLimiter(rate) for provider, rate in limits.items() if rate}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path or f"{db.db_path}.enrich.json"
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def load_checkpoint(self) -> int:
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                return int(json.load(f).get('last_id', 0))
+        except (OSError, ValueError):
+            return 0
+
+    def _save_checkpoint(self, last_id: int):
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'last_id': last_id}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        try:
+            os.remove(self.checkpoint_path)
+        except OSError:
+            pass
+
+    def run(self, on_progress: Optional[Callable[[EnrichmentProgress], None]] = None,
+            resume: bool = True) -> EnrichmentProgress:
+        self._cancelled.clear()
+        after_id = self.load_checkpoint() if resume else 0
+        # 本次运行中第一个查询失败的单词之前的id，断点最多记到这里
+        retry_from = None
+        progress = EnrichmentProgress(total=self.db.count_words_missing_details(after_id))
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="enrich") as executor:
+            while not self._cancelled.is_set():
+                batch = self.db.words_missing_details(after_id, self.batch_size)
+                if not batch:
+                    break
+
+                updates = []
+                completed = 0
+                for word, result in zip(batch, executor.map(self._enrich, batch)):
+                    if result is None:
+                        continue
+                    completed += 1
+                    translation, english, failed = result
+                    if failed:
+                        progress.failed += 1
+                        if retry_from is None:
+                            retry_from = word.id - 1
+                    if translation or english:
+                        tip = self.api.generate_memory_tip(word.word, translation) if translation else ''
+                        updates.append((word.id, translation, english, tip))
+
+                progress.updated += self.db.fill_details(updates)
+                progress.done += completed
+                progress.elapsed = time.perf_counter() - start
+                if self._cancelled.is_set():
+                    break
+                after_id = batch[-1].id
+                self._save_checkpoint(after_id if retry_from is None else retry_from)
+                if on_progress is not None:
+                    on_progress(progress)
+
+        progress.elapsed = time.perf_counter() - start
+        progress.cancelled = self._cancelled.is_set()
+        if not progress.cancelled and retry_from is None:
+            self.clear_checkpoint()
+        if on_progress is not None:
+            on_progress(progress)
+        return progress
+
+    def _enrich(self, word: WordRow) -> Optional[Tuple[str, str, bool]]:
+        # 取消后还没开始的单词直接跳过，这一批不记断点，下次从头补
+        if self._cancelled.is_set():
+            return None
+        translation = english = ''
+        failed = False
+        if not word.translation:
+            try:
+                translation = self._fetch(YOUDAO, word.word) or ''
+            except Exception as e:
+                print(f"有道API查询 {word.word} 失败: {e}")
+                failed = True
+        if not word.english_translation:
+            try:
+                english = self._fetch(ENGLISH_DICT, word.word) or ''
+            except Exception as e:
+                print(f"英文词典API查询 {word.word} 失败: {e}")
+                failed = True
+        return translation, english, failed
+
+    def _fetch(self, provider: str, word: str) -> Optional[str]:
+        limiter = self.limiters.get(provider)
+        before_request = limiter.acquire if limiter is not None else None
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.api.fetch(provider, word, before_request)
+            except Exception:
+                if attempt == self.max_retries or self._cancelled.is_set():
+                    raise
+                # 指数退避加随机抖动，避免所有线程同时重试
+                time.sleep(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
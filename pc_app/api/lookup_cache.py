@@ -0,0 +1,101 @@
+import time
+from typing import Optional, Tuple
+from pc_app.database.connection import ConnectionPool
+
+DAY = 86400
+HOUR = 3600
+
+class LookupCache:
+    """词典查询结果的本地缓存(SQLite)。
+
+    查到的释义保留 ttl 秒；词典明确答复查无此词时也缓存，保留 negative_ttl 秒，
+    网络错误不缓存。条目超过 max_entries 时按最近访问时间淘汰最旧的。
+
+    访问时间只精确到 access_resolution 秒：命中时上次记录的访问时间还不够旧就不写库，
+    大多数命中只是一次读查询，不占用写锁。
+    """
+
+    def __init__(self, db_path: str = "dictionary_cache.db", ttl: float = 30 * DAY,
+                 negative_ttl: float = DAY, max_entries: int = 50000, access_resolution: float = HOUR):
+        self.pool = ConnectionPool.for_path(db_path)
+        self._closed = False
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.access_resolution = access_resolution
+        self._puts = 0
+        with self.pool.transaction() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS lookups (
+                    provider TEXT NOT NULL,
+                    word TEXT NOT NULL,
+                    value TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (provider, word)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_lookups_accessed_at ON lookups(accessed_at)')
+
+    def get(self, provider: str, word: str, now: Optional[float] = None) -> Tuple[bool, Optional[str]]:
+        """返回 (是否命中, 释义)；命中且释义为 None 表示缓存的"查无此词"。"""
+        now = time.time() if now is None else now
+        conn = self.pool.connection()
+        row = conn.execute('SELECT value, fetched_at, accessed_at FROM lookups WHERE provider = ? AND word = ?',
+                           (provider, word.lower())).fetchone()
+        if row is None:
+            return False, None
+        value, fetched_at, accessed_at = row
+        if now - fetched_at > (self.ttl if value is not None else self.negative_ttl):
+            return False, None
+        if now - accessed_at < self.access_resolution:
+            return True, value
+        with self.pool.transaction() as conn:
+            conn.execute('UPDATE lookups SET accessed_at = ? WHERE provider = ? AND word = ?',
+                         (now, provider, word.lower()))
+        return True, value
+
+    def put(self, provider: str, word: str, value: Optional[str], now: Optional[float] = None):
+        now = time.time() if now is None else now
+        with self.pool.transaction() as conn:
+            conn.execute('''
+                INSERT INTO lookups (provider, word, value, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(provider, word) DO UPDATE SET
+                    value=excluded.value, fetched_at=excluded.fetched_at, accessed_at=excluded.accessed_at
+            ''', (provider, word.lower(), value, now, now))
+            self._puts += 1
+            # 每写入一批检查一次容量，避免每次都 COUNT(*)
+            if self._puts % 100 == 0 or self.max_entries < 100:
+                self._evict(conn)
+
+    def _evict(self, conn):
+        excess = conn.execute('SELECT COUNT(*) FROM lookups').fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute('''
+                DELETE FROM lookups WHERE rowid IN (
+                    SELECT rowid FROM lookups ORDER BY accessed_at LIMIT ?
+                )
+            ''', (excess,))
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        with self.pool.transaction() as conn:
+            cursor = conn.execute('''
+                DELETE FROM lookups
+                WHERE (value IS NOT NULL AND fetched_at < ?) OR (value IS NULL AND fetched_at < ?)
+            ''', (now - self.ttl, now - self.negative_ttl))
+            return cursor.rowcount
+
+    def clear(self):
+        with self.pool.transaction() as conn:
+            conn.execute('DELETE FROM lookups')
+
+    def __len__(self) -> int:
+        conn = self.pool.connection()
+        return conn.execute('SELECT COUNT(*) FROM lookups').fetchone()[0]
+
+    def close(self):
+        # 连接池按使用者计数，重复调用也只归还一次
+        if not self._closed:
+            self._closed = True
+            self.pool.close()
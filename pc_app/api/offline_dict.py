@@ -0,0 +1,166 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+# 离线词典文件格式(小端):
+#   头部:     b'WBDICT' 版本(u8) 填充(u8) 词条数 n(u32) 键区偏移(u64) 值区偏移(u64)
+#   键偏移:   u32 * (n+1)，键区内第i个键的起止位置
+#   值偏移:   u64 * (n+1)，值区内第i个值的起止位置
+#   键前缀:   u64 * n，每个键前8字节(不足补0)按大端解释的整数，与键的字节序一致
+#   键区:     按UTF-8字节序排好的小写单词，直接拼接
+#   值区:     中文翻译 \0 英文释义，UTF-8
+# 打开时只做 mmap；查询先用 bisect 在键前缀数组上定位(C实现)，前缀相同的几个键再逐个比较，
+# 不需要把整个词典读进内存
+MAGIC = b'WBDICT'
+VERSION = 1
+HEADER = struct.Struct('<6sBxIQQ')
+
+def _normalize(word: str) -> bytes:
+    return word.strip().lower().encode('utf-8')
+
+def _prefix(key: bytes) -> int:
+    return int.from_bytes(key[:8].ljust(8, b'\x00'), 'big')
+
+def _le_bytes(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def build_offline_dictionary(entries: Iterable[Tuple[str, str, str]], path: str) -> int:
+    """把 (单词, 中文翻译, 英文释义) 写成离线词典文件，返回词条数。
+    同一单词(不区分大小写)出现多次时，保留第一个有内容的字段。"""
+    merged = {}
+    for word, translation, definition in entries:
+        key = _normalize(word)
+        if not key or b'\x00' in key:
+            continue
+        translation = (translation or '').replace('\x00', '')
+        definition = (definition or '').replace('\x00', '')
+        old = merged.get(key)
+        if old is None:
+            merged[key] = (translation, definition)
+        else:
+            merged[key] = (old[0] or translation, old[1] or definition)
+
+    keys = sorted(merged)
+    key_offsets = array('I', [0])
+    value_offsets = array('Q', [0])
+    values = []
+    key_size = value_size = 0
+    for key in keys:
+        key_size += len(key)
+        key_offsets.append(key_size)
+        translation, definition = merged[key]
+        value = f"{translation}\x00{definition}".encode('utf-8')
+        values.append(value)
+        value_size += len(value)
+        value_offsets.append(value_size)
+    if key_size >= 1 << 32:
+        raise ValueError("词条过多，键区超过4GB")
+
+    count = len(keys)
+    prefixes = array('Q', map(_prefix, keys))
+    keys_offset = HEADER.size + 4 * (count + 1) + 8 * (count + 1) + 8 * count
+    values_offset = keys_offset + key_size
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, count, keys_offset, values_offset))
+        f.write(_le_bytes(key_offsets))
+        f.write(_le_bytes(value_offsets))
+        f.write(_le_bytes(prefixes))
+        f.writelines(keys)
+        f.writelines(values)
+    return count
+
+class OfflineDictionary:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, keys_offset, values_offset = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError("不是离线词典文件")
+        if version != VERSION:
+            raise ValueError(f"不支持的离线词典版本: {version}")
+        self.count = count
+        self._keys_offset = keys_offset
+        self._values_offset = values_offset
+
+        view = memoryview(self._mmap)
+        start = HEADER.size
+        value_start = start + 4 * (count + 1)
+        prefix_start = value_start + 8 * (count + 1)
+        sections = (('I', view[start:value_start]), ('Q', view[value_start:prefix_start]),
+                    ('Q', view[prefix_start:keys_offset]))
+        if sys.byteorder == 'little':
+            # 直接把映射区当作整数数组用，不拷贝
+            arrays = [data.cast(typecode) for typecode, data in sections]
+        else:
+            arrays = []
+            for typecode, data in sections:
+                values = array(typecode, data.tobytes())
+                values.byteswap()
+                arrays.append(values)
+        self._key_offsets, self._value_offsets, self._prefixes = arrays
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _find(self, key: bytes) -> int:
+        mm = self._mmap
+        offsets = self._key_offsets
+        base = self._keys_offset
+        prefix = _prefix(key)
+        low = bisect_left(self._prefixes, prefix)
+        high = bisect_right(self._prefixes, prefix, low)
+        while low < high:
+            mid = (low + high) >> 1
+            if mm[base + offsets[mid]:base + offsets[mid + 1]] < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.count and offsets[low + 1] - offsets[low] == len(key) and \
+                mm[base + offsets[low]:base + offsets[low + 1]] == key:
+            return low
+        return -1
+
+    def lookup(self, word: str) -> Optional[Tuple[str, str]]:
+        """返回 (中文翻译, 英文释义)，查不到返回 None。"""
+        index = self._find(_normalize(word))
+        if index < 0:
+            return None
+        base = self._values_offset
+        value = self._mmap[base + self._value_offsets[index]:base + self._value_offsets[index + 1]]
+        translation, definition = value.decode('utf-8').split('\x00', 1)
+        return translation, definition
+
+    def keys_with_prefix(self, prefix: str, limit: int = 10) -> List[str]:
+        """按字典序返回以 prefix 开头的单词(小写)，最多 limit 个。"""
+        key = _normalize(prefix)
+        if not key:
+            return []
+        mm = self._mmap
+        offsets = self._key_offsets
+        base = self._keys_offset
+        index = bisect_left(self._prefixes, _prefix(key))
+        result = []
+        while index < self.count and len(result) < limit:
+            candidate = mm[base + offsets[index]:base + offsets[index + 1]]
+            index += 1
+            if candidate.startswith(key):
+                result.append(candidate.decode('utf-8'))
+            elif candidate > key:
+                break
+        return result
+
+    def __contains__(self, word: str) -> bool:
+        return self._find(_normalize(word)) >= 0
+
+    def close(self):
+        for values in (self._key_offsets, self._value_offsets, self._prefixes):
+            if isinstance(values, memoryview):
+                values.release()
+        self._mmap.close()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import sys
+import os
+import argparse
+import csv
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.api.offline_dict import build_offline_dictionary
+
+def read_ecdict(path: str):
+    """读取 ECDICT 格式的CSV(表头含 word、translation、definition)，
+    字段中的 \\n 是转义后的换行。"""
+    csv.field_size_limit(1 << 24)
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or 'word' not in reader.fieldnames:
+            raise ValueError("CSV需要包含 word 表头")
+        for row in reader:
+            translation = (row.get('translation') or '').replace('\\n', '\n').strip()
+            definition = (row.get('definition') or '').replace('\\n', '\n').strip()
+            if translation or definition:
+                yield row['word'], translation, definition
+
+def main():
+    parser = argparse.ArgumentParser(description="把ECDICT格式的词典CSV转换成离线词典文件")
+    parser.add_argument('path', help="词典CSV路径(如 ecdict.csv)")
+    parser.add_argument('-o', '--output', default='offline_dict.wbd', help="输出文件，放在运行目录下会被自动使用")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = build_offline_dictionary(read_ecdict(args.path), args.output)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(args.output)
+    print(f"转换完成: {count} 个词条，{size / 1e6:.1f} MB，耗时 {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Set
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+class _ThreadSlot:
+    """放在 threading.local 里，线程结束时随之释放，触发关闭该线程的连接。"""
+
+class ConnectionPool:
+    """每个线程持有一个长连接，WAL模式下读写互不阻塞，写事务在进程内串行化。
+
+    线程结束时它的连接随即关闭，线程池、后台加载等短命线程不会留下打开的连接。
+    同一个数据库文件的各个使用者通过 for_path 共用一个池，按引用计数，最后一个使用者 close() 时才关闭连接。
+    """
+
+    _pools: Dict[str, "ConnectionPool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, db_path: str, timeout: float = 30.0, cached_statements: int = 256):
+        if db_path == ":memory:":
+            # 每个线程的连接会各自打开一个互不相通的空库
+            raise ValueError("ConnectionPool 不支持 :memory: 数据库，请使用文件路径")
+        self.db_path = db_path
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections: Set[sqlite3.Connection] = set()
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._key = None
+        self._users = 0
+
+    @classmethod
+    def for_path(cls, db_path: str) -> "ConnectionPool":
+        key = os.path.abspath(db_path)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls(db_path)
+                pool._key = key
+                cls._pools[key] = pool
+            pool._users += 1
+            return pool
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+            )
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.slot = slot = _ThreadSlot()
+            with self._lock:
+                self._connections.add(conn)
+            weakref.finalize(slot, self._release, conn)
+        return conn
+
+    def _release(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._connections.discard(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.depth = 1
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                self._local.depth = 0
+
+    @contextmanager
+    def snapshot(self):
+        # 只读事务：WAL下多条查询看到同一时刻的数据，不阻塞写入
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.execute("COMMIT")
+
+    def close(self):
+        # 还有其他使用者时只归还自己的引用
+        with self._pools_lock:
+            if self._users > 1:
+                self._users -= 1
+                return
+            self._users = 0
+            if self._key is not None and self._pools.get(self._key) is self:
+                del self._pools[self._key]
+        with self._lock:
+            connections, self._connections = self._connections, set()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
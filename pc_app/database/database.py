@@ -1,136 +1,499 @@
 import sqlite3
-import os
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
-from shared.models import Word
+from itertools import islice
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+from shared.models import Word, WordRow
+from shared.srs import ReviewState
+from pc_app.database.connection import ConnectionPool
+from pc_app.database.fuzzy import edit_distance, trigrams
+from pc_app.database.schema import (BULK_TRIGGERS, FTS_DELETE_SQL, FTS_INDEX_SQL, FTS_OLD_TABLE, REVIEWS_INDEX_SQL,
+                                    has_table, migrate, paused_triggers)
+
+INSERT_SQL = '''
+    INSERT INTO words (word, translation, english_translation, memory_tip, user_note, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# 批量写入直接写好版本号，不再由触发器逐行回写
+BULK_INSERT_SQL = '''
+    INSERT INTO words (word, translation, english_translation, memory_tip, user_note, created_at, updated_at, revision)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# 模糊搜索最多读取的trigram倒排条数和参与计算编辑距离的候选词数
+FUZZY_POSTINGS = 60000
+FUZZY_CANDIDATES = 200
+
+# 全文搜索只对前这么多条匹配(按id顺序)计算bm25排序，常见片段命中上万行时不必逐行打分再连表
+FTS_RANK_LIMIT = 1000
+
+WORD_COLUMNS = ('id', 'word', 'translation', 'english_translation', 'memory_tip',
+                'user_note', 'created_at', 'updated_at')
+
+# 导入的空字段不覆盖已有内容；没有字段真正改变的行不更新，updated_at 和版本号保持不变，
+# 重复导入同一个文件既不会让增量同步重发整本单词书，也不会在“后写者胜”里压过手机上更新的修改
+UPSERT_SQL = BULK_INSERT_SQL + '''
+    ON CONFLICT(word) DO UPDATE SET
+        translation=COALESCE(NULLIF(excluded.translation, ''), words.translation),
+        english_translation=COALESCE(NULLIF(excluded.english_translation, ''), words.english_translation),
+        memory_tip=COALESCE(NULLIF(excluded.memory_tip, ''), words.memory_tip),
+        user_note=COALESCE(NULLIF(excluded.user_note, ''), words.user_note),
+        updated_at=excluded.updated_at,
+        revision=excluded.revision
+    WHERE (excluded.translation != '' AND excluded.translation IS NOT words.translation)
+       OR (excluded.english_translation != '' AND excluded.english_translation IS NOT words.english_translation)
+       OR (excluded.memory_tip != '' AND excluded.memory_tip IS NOT words.memory_tip)
+       OR (excluded.user_note != '' AND excluded.user_note IS NOT words.user_note)
+'''
+
+# 客户端推来的修改按修改时间“后写者胜”：只有比服务器上的更新才覆盖，时间相同时保留服务器的
+CLIENT_WORD_SQL = '''
+    UPDATE words
+    SET word=?, translation=?, english_translation=?, memory_tip=?, user_note=?, updated_at=?
+    WHERE id=? AND (updated_at IS NULL OR updated_at < ?)
+'''
+
+CLIENT_REVIEW_SQL = '''
+    UPDATE reviews SET ease=?, interval=?, repetitions=?, lapses=?, due_at=?, reviewed_at=?
+    WHERE word_id=? AND (reviewed_at IS NULL OR reviewed_at < ?)
+'''
+
+REVIEW_COLUMNS = 'word_id, ease, interval, repetitions, lapses, due_at, reviewed_at'
+
+CHANGE_BOUNDS_SQL = '''
+    SELECT revision FROM words WHERE revision > ?
+    UNION ALL
+    SELECT revision FROM reviews WHERE revision > ?
+    ORDER BY revision LIMIT 2 OFFSET ?
+'''
+
+def word_row_factory(cursor, row) -> WordRow:
+    # 未编辑过的单词两个时间相同，共用同一个字符串对象
+    created_at, updated_at = row[6], row[7]
+    if updated_at == created_at:
+        updated_at = created_at
+    return WordRow(row[0], row[1], row[2], row[3], row[4], row[5], created_at, updated_at)
+
+def projection(columns: Optional[Sequence[str]] = None):
+    """返回 (SELECT列表, 行工厂)。列表界面只取需要的列，id总是包含在内。"""
+    if columns is None:
+        columns = WORD_COLUMNS
+    else:
+        unknown = set(columns) - set(WORD_COLUMNS)
+        if unknown:
+            raise ValueError(f"未知的列: {', '.join(sorted(unknown))}")
+        columns = tuple(name for name in WORD_COLUMNS if name == 'id' or name in columns)
+
+    select = ', '.join(f'words.{name}' for name in columns)
+    if columns == WORD_COLUMNS:
+        return select, word_row_factory
+    return select, lambda cursor, row: WordRow.from_columns(columns, row)
+
+@dataclass
+class BulkResult:
+    written: int = 0
+    skipped: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
 
 class WordDatabase:
     def __init__(self, db_path: str = "word_book.db"):
         self.db_path = db_path
+        self.pool = ConnectionPool.for_path(db_path)
+        self._closed = False
+        self._gram_counts = {}
         self.init_database()
-    
+
     def init_database(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS words (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT NOT NULL UNIQUE,
-                translation TEXT NOT NULL,
-                english_translation TEXT,
-                memory_tip TEXT,
-                user_note TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-    
+        with self.pool.transaction() as conn:
+            migrate(conn)
+            self.has_fts = has_table(conn, 'words_fts')
+            self.has_fts_vocab = has_table(conn, 'words_fts_vocab')
+
+    @staticmethod
+    def _row_to_word(row) -> WordRow:
+        return WordRow(*row[:8])
+
+    def _select(self, sql: str, params=(), columns: Optional[Sequence[str]] = None, conn=None) -> List[WordRow]:
+        # sql 中用 {columns} 占位，时间列保留原始字符串，访问时才解析
+        select, factory = projection(columns)
+        cursor = (conn or self.pool.connection()).cursor()
+        cursor.row_factory = factory
+        return cursor.execute(sql.format(columns=select), params).fetchall()
+
     def add_word(self, word: Word) -> int:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         now = datetime.now()
-        cursor.execute('''
-            INSERT INTO words (word, translation, english_translation, memory_tip, user_note, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (word.word, word.translation, word.english_translation, 
-              word.memory_tip, word.user_note, now, now))
-        
-        word_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return word_id
-    
-    def get_word(self, word_id: int) -> Optional[Word]:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM words WHERE id = ?', (word_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            return Word(
-                id=row[0], word=row[1], translation=row[2],
-                english_translation=row[3], memory_tip=row[4],
-                user_note=row[5], created_at=datetime.fromisoformat(row[6]),
-                updated_at=datetime.fromisoformat(row[7])
+        with self.pool.transaction() as conn:
+            cursor = conn.execute(INSERT_SQL, (word.word, word.translation, word.english_translation,
+                                               word.memory_tip, word.user_note, now, now))
+            return cursor.lastrowid
+
+    def add_words(self, words: Iterable[Union[Word, Exception]], chunk_size: int = 5000) -> BulkResult:
+        return self._bulk_write(BULK_INSERT_SQL + ' ON CONFLICT(word) DO NOTHING', words, chunk_size, updates=False)
+
+    def upsert_words(self, words: Iterable[Union[Word, Exception]], chunk_size: int = 5000) -> BulkResult:
+        return self._bulk_write(UPSERT_SQL, words, chunk_size, updates=True)
+
+    def _bulk_write(self, sql: str, words: Iterable[Union[Word, Exception]], chunk_size: int,
+                    updates: bool) -> BulkResult:
+        # 读取时就已出错的记录以异常对象传入，和空单词一样记为该条的错误
+        result = BulkResult()
+        iterator = iter(words)
+        index = 0
+
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+
+            # 与 sqlite3 默认的 datetime 适配结果相同，整块只转换一次
+            now = datetime.now().isoformat(' ')
+            # 用 rowcount 而不是 total_changes 计数，后者会把触发器(全文索引、版本号、复习表)的改动也算进去
+            failed = 0
+            written = 0
+            with self.pool.transaction() as conn, paused_triggers(conn, BULK_TRIGGERS):
+                # 给这一块预留连续的版本号，出错和被跳过的行只是留下空号
+                first = self._reserve_revisions(conn, len(chunk))
+                rows = []
+                for offset, word in enumerate(chunk):
+                    if isinstance(word, Exception):
+                        result.errors.append((index + offset, str(word)))
+                        continue
+                    text = (word.word or '').strip()
+                    if not text:
+                        result.errors.append((index + offset, "单词为空"))
+                        continue
+                    rows.append((index + offset, (text, word.translation or '', word.english_translation or '',
+                                                  word.memory_tip or '', word.user_note or '', now, now,
+                                                  first + offset)))
+
+                with self._bulk_index(conn, rows, updates):
+                    conn.execute('SAVEPOINT bulk_chunk')
+                    try:
+                        written = conn.executemany(sql, (params for _, params in rows)).rowcount
+                    except sqlite3.Error:
+                        conn.execute('ROLLBACK TO bulk_chunk')
+                        for row_index, params in rows:
+                            try:
+                                written += conn.execute(sql, params).rowcount
+                            except sqlite3.Error as e:
+                                result.errors.append((row_index, str(e)))
+                                failed += 1
+                    conn.execute('RELEASE bulk_chunk')
+
+            result.written += written
+            self._gram_counts.clear()
+            result.skipped += len(rows) - failed - written
+            index += len(chunk)
+
+        return result
+
+    @staticmethod
+    def _reserve_revisions(conn: sqlite3.Connection, count: int) -> int:
+        """把 sync_meta 中的版本号一次推进 count，返回预留的第一个版本号。"""
+        last = conn.execute("SELECT value FROM sync_meta WHERE key = 'revision'").fetchone()[0]
+        conn.execute("UPDATE sync_meta SET value = ? WHERE key = 'revision'", (last + count,))
+        return last + 1
+
+    @contextmanager
+    def _bulk_index(self, conn: sqlite3.Connection, rows, updates: bool):
+        """批量写入时复习表和全文索引的触发器已暂停，整块写完后在这里一次补上。
+
+        新行的id都大于写入前的 MAX(id)(AUTOINCREMENT不复用id)；upsert 可能改到的已有行先把旧内容
+        存进临时表，写完后只留下索引列真正变了的行，按旧内容从索引里删掉，再按新内容一次加入。
+        """
+        last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM words').fetchone()[0]
+        reindex = updates and self.has_fts
+        if reindex:
+            conn.execute(FTS_OLD_TABLE)
+            texts = json.dumps([params[0] for _, params in rows], ensure_ascii=False)
+            conn.execute('''
+                INSERT INTO temp.fts_old SELECT id, word, translation, user_note FROM words
+                WHERE word IN (SELECT value FROM json_each(?))
+            ''', (texts,))
+
+        try:
+            yield
+            conn.execute(REVIEWS_INDEX_SQL, (last_id,))
+            if not self.has_fts:
+                return
+            if reindex:
+                conn.execute('''
+                    DELETE FROM temp.fts_old WHERE EXISTS (
+                        SELECT 1 FROM words WHERE words.id = fts_old.id
+                        AND words.translation IS fts_old.translation AND words.user_note IS fts_old.user_note
+                    )
+                ''')
+                conn.execute(FTS_DELETE_SQL)
+                conn.execute(FTS_INDEX_SQL + ' WHERE id IN (SELECT id FROM temp.fts_old)')
+            conn.execute(FTS_INDEX_SQL + ' WHERE id > ?', (last_id,))
+        finally:
+            if reindex:
+                conn.execute('DELETE FROM temp.fts_old')
+
+    def get_word(self, word_id: int) -> Optional[WordRow]:
+        rows = self._select('SELECT {columns} FROM words WHERE id = ?', (word_id,))
+        return rows[0] if rows else None
+
+    def get_all_words(self, columns: Optional[Sequence[str]] = None) -> List[WordRow]:
+        return self._select('SELECT {columns} FROM words ORDER BY created_at DESC', columns=columns)
+
+    def count_words(self) -> int:
+        conn = self.pool.connection()
+        return conn.execute('SELECT COUNT(*) FROM words').fetchone()[0]
+
+    def page_words(self, before_id: Optional[int] = None, after_id: Optional[int] = None, limit: int = 100,
+                   columns: Optional[Sequence[str]] = None) -> List[WordRow]:
+        """按id倒序(新单词在前)取一页: 给出 before_id 取它后面的一页，给出 after_id 取它前面的一页。"""
+        if after_id is not None:
+            words = self._select('SELECT {columns} FROM words WHERE id > ? ORDER BY id LIMIT ?',
+                                 (after_id, limit), columns)
+            words.reverse()
+            return words
+        if before_id is not None:
+            return self._select('SELECT {columns} FROM words WHERE id < ? ORDER BY id DESC LIMIT ?',
+                                (before_id, limit), columns)
+        return self._select('SELECT {columns} FROM words ORDER BY id DESC LIMIT ?', (limit,), columns)
+
+    def word_texts(self) -> List[str]:
+        # 只扫描 word 列的唯一索引，供前缀索引加载
+        conn = self.pool.connection()
+        return [row[0] for row in conn.execute('SELECT word FROM words ORDER BY word')]
+
+    def word_id_near(self, offset: int, total: int) -> Optional[int]:
+        """按id倒序排在第 offset 行附近的单词id，供列表跳转定位。
+
+        OFFSET 要逐行跳过前面的行，这里按 offset/total 在最大和最小id之间换算出一个id再走主键，
+        没有删除过单词时是准确位置，删除留下的空洞分布不均时只是近似位置。
+        """
+        conn = self.pool.connection()
+        low, high = conn.execute('SELECT (SELECT MIN(id) FROM words), (SELECT MAX(id) FROM words)').fetchone()
+        if low is None:
+            return None
+        target = high - round(offset * (high - low) / max(1, total - 1))
+        row = conn.execute('SELECT id FROM words WHERE id <= ? ORDER BY id DESC LIMIT 1', (target,)).fetchone()
+        return row[0] if row else low
+
+    def current_revision(self) -> int:
+        conn = self.pool.connection()
+        row = conn.execute("SELECT value FROM sync_meta WHERE key = 'revision'").fetchone()
+        return row[0] if row else 0
+
+    def get_changes_since(self, revision: int, limit: Optional[int] = None
+                          ) -> Tuple[List[WordRow], List[ReviewState], List[int], int, bool]:
+        """返回 revision 之后的一页变更: (单词, 复习记录, 删除的id, 下一页游标, 是否还有更多)。
+
+        单词和复习记录共用一个版本号序列，limit 限制的是两者合计的条数。
+        """
+        # 同一个读事务内取版本号和变更，避免并发写入造成遗漏
+        with self.pool.snapshot() as conn:
+            cursor = self.current_revision()
+            more = False
+            if limit is not None:
+                # 第 limit 条和第 limit+1 条变更的版本号：前者是这一页的游标，后者存在说明还有下一页
+                bounds = conn.execute(CHANGE_BOUNDS_SQL, (revision, revision, limit - 1)).fetchall()
+                more = len(bounds) > 1
+                if more:
+                    cursor = bounds[0][0]
+
+            words = self._select(
+                'SELECT {columns} FROM words WHERE revision > ? AND revision <= ? ORDER BY revision',
+                (revision, cursor), conn=conn
             )
-        return None
-    
-    def get_all_words(self) -> List[Word]:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM words ORDER BY created_at DESC')
-        rows = cursor.fetchall()
-        conn.close()
-        
-        words = []
-        for row in rows:
-            words.append(Word(
-                id=row[0], word=row[1], translation=row[2],
-                english_translation=row[3], memory_tip=row[4],
-                user_note=row[5], created_at=datetime.fromisoformat(row[6]),
-                updated_at=datetime.fromisoformat(row[7])
-            ))
-        
-        return words
-    
+            reviews = [ReviewState(*row) for row in conn.execute(
+                f'SELECT {REVIEW_COLUMNS} FROM reviews WHERE revision > ? AND revision <= ? ORDER BY revision',
+                (revision, cursor)
+            )]
+            deleted = [row[0] for row in conn.execute(
+                'SELECT id FROM deleted_words WHERE revision > ? AND revision <= ? ORDER BY revision',
+                (revision, cursor)
+            )]
+        return words, reviews, deleted, cursor, more
+
     def update_word(self, word: Word) -> bool:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE words 
-            SET word=?, translation=?, english_translation=?, memory_tip=?, user_note=?, updated_at=?
-            WHERE id=?
-        ''', (word.word, word.translation, word.english_translation,
-              word.memory_tip, word.user_note, datetime.now(), word.id))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        
-        return success
-    
+        with self.pool.transaction() as conn:
+            cursor = conn.execute('''
+                UPDATE words
+                SET word=?, translation=?, english_translation=?, memory_tip=?, user_note=?, updated_at=?
+                WHERE id=?
+            ''', (word.word, word.translation, word.english_translation,
+                  word.memory_tip, word.user_note, datetime.now(), word.id))
+            return cursor.rowcount > 0
+
+    def apply_client_changes(self, words: Iterable[Word], reviews: Iterable[ReviewState] = ()
+                             ) -> Tuple[int, List[WordRow], List[ReviewState]]:
+        """在一个事务里应用客户端推来的修改，返回 (应用条数, 被拒绝单词的服务器版本, 被拒绝复习记录的服务器版本)。
+
+        被拒绝的是服务器上更新、时间相同或已删除的记录；已删除的不返回，客户端下次拉取时会收到删除。
+        """
+        applied, stale_words, stale_reviews = 0, [], []
+        with self.pool.transaction() as conn:
+            for word in words:
+                try:
+                    cursor = conn.execute(CLIENT_WORD_SQL, (
+                        word.word, word.translation, word.english_translation, word.memory_tip,
+                        word.user_note, word.updated_at, word.id, word.updated_at
+                    ))
+                except sqlite3.IntegrityError:
+                    # 改成了服务器上另一个单词的拼写，按冲突处理
+                    cursor = None
+                if cursor is not None and cursor.rowcount:
+                    applied += 1
+                else:
+                    stale_words.append(word.id)
+
+            for state in reviews:
+                cursor = conn.execute(CLIENT_REVIEW_SQL, (
+                    state.ease, state.interval, state.repetitions, state.lapses, state.due_at,
+                    state.reviewed_at, state.word_id, state.reviewed_at
+                ))
+                if cursor.rowcount:
+                    applied += 1
+                else:
+                    stale_reviews.append(state.word_id)
+
+            server_words, server_reviews = [], []
+            for start in range(0, max(len(stale_words), len(stale_reviews)), 500):
+                ids = stale_words[start:start + 500]
+                if ids:
+                    placeholders = ', '.join('?' * len(ids))
+                    server_words += self._select(f'SELECT {{columns}} FROM words WHERE id IN ({placeholders})',
+                                                 ids, conn=conn)
+                ids = stale_reviews[start:start + 500]
+                if ids:
+                    placeholders = ', '.join('?' * len(ids))
+                    server_reviews += [ReviewState(*row) for row in conn.execute(
+                        f'SELECT {REVIEW_COLUMNS} FROM reviews WHERE word_id IN ({placeholders})', ids
+                    )]
+        return applied, server_words, server_reviews
+
+    def words_missing_details(self, after_id: int = 0, limit: int = 500) -> List[WordRow]:
+        """按id顺序取中文翻译或英文释义为空的单词，供批量查询补全。"""
+        return self._select('''
+            SELECT {columns} FROM words
+            WHERE id > ? AND (COALESCE(translation, '') = '' OR COALESCE(english_translation, '') = '')
+            ORDER BY id LIMIT ?
+        ''', (after_id, limit))
+
+    def count_words_missing_details(self, after_id: int = 0) -> int:
+        conn = self.pool.connection()
+        return conn.execute('''
+            SELECT COUNT(*) FROM words
+            WHERE id > ? AND (COALESCE(translation, '') = '' OR COALESCE(english_translation, '') = '')
+        ''', (after_id,)).fetchone()[0]
+
+    def fill_details(self, updates: Iterable[Tuple[int, str, str, str]]) -> int:
+        """批量写回 (id, 中文翻译, 英文释义, 记忆方法)，只填原本为空的字段，不覆盖用户已经写的内容。"""
+        now = datetime.now()
+        with self.pool.transaction() as conn:
+            cursor = conn.executemany('''
+                UPDATE words SET
+                    translation=CASE WHEN COALESCE(translation, '') = '' THEN ?1 ELSE translation END,
+                    english_translation=CASE WHEN COALESCE(english_translation, '') = '' THEN ?2 ELSE english_translation END,
+                    memory_tip=CASE WHEN COALESCE(memory_tip, '') = '' THEN ?3 ELSE memory_tip END,
+                    updated_at=?4
+                WHERE id=?5 AND (
+                    (COALESCE(translation, '') = '' AND ?1 != '') OR
+                    (COALESCE(english_translation, '') = '' AND ?2 != '') OR
+                    (COALESCE(memory_tip, '') = '' AND ?3 != '')
+                )
+            ''', ((translation or '', english or '', tip or '', now, word_id)
+                  for word_id, translation, english, tip in updates))
+            return cursor.rowcount
+
     def delete_word(self, word_id: int) -> bool:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM words WHERE id = ?', (word_id,))
-        success = cursor.rowcount > 0
-        
-        conn.commit()
-        conn.close()
-        
-        return success
-    
-    def search_words(self, keyword: str) -> List[Word]:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM words 
-            WHERE word LIKE ? OR translation LIKE ? OR user_note LIKE ?
-            ORDER BY created_at DESC
-        ''', (f'%{keyword}%', f'%{keyword}%', f'%{keyword}%'))
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        words = []
-        for row in rows:
-            words.append(Word(
-                id=row[0], word=row[1], translation=row[2],
-                english_translation=row[3], memory_tip=row[4],
-                user_note=row[5], created_at=datetime.fromisoformat(row[6]),
-                updated_at=datetime.fromisoformat(row[7])
-            ))
-        
-        return words
\ No newline at end of file
+        with self.pool.transaction() as conn:
+            cursor = conn.execute('DELETE FROM words WHERE id = ?', (word_id,))
+            return cursor.rowcount > 0
+
+    def search_words(self, keyword: str, limit: Optional[int] = None,
+                     columns: Optional[Sequence[str]] = None) -> List[WordRow]:
+        keyword = keyword.strip()
+        limit = -1 if limit is None else limit
+
+        if keyword.endswith('*') and len(keyword) > 1:
+            # 前缀查询走 word 列的唯一索引: prefix <= word < prefix + U+10FFFF
+            prefix = keyword[:-1]
+            return self._select('''
+                SELECT {columns} FROM words WHERE word >= ? AND word < ?
+                ORDER BY word LIMIT ?
+            ''', (prefix, prefix + '\U0010ffff', limit), columns)
+        elif self.has_fts and len(keyword) >= 3:
+            query = '"' + keyword.replace('"', '""') + '"'
+            return self._select('''
+                SELECT {columns} FROM (
+                    SELECT rowid, bm25(words_fts, 10.0, 5.0, 1.0) AS score FROM words_fts
+                    WHERE words_fts MATCH ? LIMIT ?
+                ) AS hits
+                JOIN words ON words.id = hits.rowid
+                ORDER BY hits.score LIMIT ?
+            ''', (query, max(limit, FTS_RANK_LIMIT), limit), columns)
+        else:
+            # trigram至少需要3个字符，更短的关键词仍按子串扫描
+            pattern = f'%{keyword}%'
+            return self._select('''
+                SELECT {columns} FROM words
+                WHERE word LIKE ? OR translation LIKE ? OR user_note LIKE ?
+                ORDER BY created_at DESC LIMIT ?
+            ''', (pattern, pattern, pattern, limit), columns)
+
+    def fuzzy_search(self, keyword: str, limit: int = 20, max_distance: Optional[int] = None,
+                     columns: Optional[Sequence[str]] = None) -> List[WordRow]:
+        """按编辑距离找拼写相近的单词，距离小的在前；距离相同时共有片段多、长度接近的在前。
+
+        候选词来自 words_fts 的 trigram 索引，写入时由触发器同步更新：先查出关键词各个
+        trigram 的出现次数，从最少见的开始取，总量不超过 FUZZY_POSTINGS 条，按共有片段
+        数取前 FUZZY_CANDIDATES 个单词，再逐个算编辑距离。
+        """
+        query = keyword.strip().lower()
+        if max_distance is None:
+            max_distance = 1 if len(query) <= 4 else 2
+        grams = trigrams(query)
+        if not grams or not self.has_fts_vocab:
+            # 不足3个字母或没有全文索引时退回普通搜索
+            return self.search_words(keyword, limit, columns)
+
+        conn = self.pool.connection()
+        # 统计出现次数要扫描倒排表，缓存下来；次数只用来挑片段，不必精确
+        unknown = [gram for gram in grams if gram not in self._gram_counts]
+        if unknown:
+            placeholders = ', '.join('?' * len(unknown))
+            self._gram_counts.update(conn.execute(f'''
+                SELECT term, doc FROM words_fts_vocab WHERE col = 'word' AND term IN ({placeholders})
+            ''', unknown).fetchall())
+        counts = {gram: self._gram_counts[gram] for gram in grams if gram in self._gram_counts}
+        chosen, postings = [], 0
+        for gram in sorted(counts, key=counts.get):
+            if chosen and postings + counts[gram] > FUZZY_POSTINGS:
+                break
+            chosen.append('word : "' + gram.replace('"', '""') + '"')
+            postings += counts[gram]
+        if not chosen:
+            return []
+
+        union = ' UNION ALL '.join(['SELECT rowid FROM words_fts WHERE words_fts MATCH ?'] * len(chosen))
+        shared = dict(conn.execute(f'''
+            SELECT rowid, count(*) AS shared FROM ({union})
+            GROUP BY rowid ORDER BY shared DESC LIMIT {FUZZY_CANDIDATES}
+        ''', chosen).fetchall())
+
+        if columns is not None and 'word' not in columns:
+            columns = tuple(columns) + ('word',)
+        placeholders = ', '.join('?' * len(shared))
+        ranked = []
+        for row in self._select(f'SELECT {{columns}} FROM words WHERE id IN ({placeholders})',
+                                tuple(shared), columns, conn):
+            text = row.word.lower()
+            distance = edit_distance(query, text, max_distance)
+            if distance <= max_distance:
+                ranked.append((distance, -shared[row.id], abs(len(text) - len(query)), text, row))
+        ranked.sort(key=lambda item: item[:4])
+        return [item[4] for item in ranked[:limit]]
+
+    def close(self):
+        # 连接池按使用者计数，重复调用也只归还一次
+        if not self._closed:
+            self._closed = True
+            self.pool.close()
@@ -0,0 +1,101 @@
+import threading
+from bisect import bisect_left, insort
+from typing import List, Optional
+from pc_app.database.database import WordDatabase
+
+class PrefixIndex:
+    """单词本里所有单词的前缀索引：按小写排序的列表，用 bisect 定位前缀。
+
+    load_async() 在后台线程加载，加载完成前 suggest() 返回空列表；
+    添加、删除单词后调用 add() / discard() 增量更新，加载期间的改动会在加载后补上。
+    可选的离线词典用来补充单词本里没有的候选词。
+    """
+
+    def __init__(self, db: WordDatabase, offline=None):
+        self.db = db
+        self.offline = offline
+        self._words: List[str] = []
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._loading = False
+        self._pending = []
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def load_async(self):
+        with self._lock:
+            if self._loading or self._ready.is_set():
+                return
+            self._loading = True
+        threading.Thread(target=self.load, daemon=True).start()
+
+    def load(self):
+        words = self.db.word_texts()
+        # 已按二进制序排好，按小写重排时基本有序，timsort很快
+        words.sort(key=str.lower)
+        with self._lock:
+            self._words = words
+            pending, self._pending = self._pending, []
+            for op, word in pending:
+                (self._insert if op == 'add' else self._remove)(word)
+            self._ready.set()
+
+    def add(self, word: str):
+        with self._lock:
+            if not self._ready.is_set():
+                self._pending.append(('add', word))
+                return
+            self._insert(word)
+
+    def discard(self, word: str):
+        with self._lock:
+            if not self._ready.is_set():
+                self._pending.append(('discard', word))
+                return
+            self._remove(word)
+
+    def _position(self, word: str) -> Optional[int]:
+        key = word.lower()
+        index = bisect_left(self._words, key, key=str.lower)
+        while index < len(self._words) and self._words[index].lower() == key:
+            if self._words[index] == word:
+                return index
+            index += 1
+        return None
+
+    def _insert(self, word: str):
+        if self._position(word) is None:
+            insort(self._words, word, key=str.lower)
+
+    def _remove(self, word: str):
+        index = self._position(word)
+        if index is not None:
+            del self._words[index]
+
+    def suggest(self, prefix: str, limit: int = 8, offline: bool = True) -> List[str]:
+        key = prefix.strip().lower()
+        if not key or not self._ready.is_set():
+            return []
+        result = []
+        with self._lock:
+            index = bisect_left(self._words, key, key=str.lower)
+            while index < len(self._words) and len(result) < limit:
+                word = self._words[index]
+                if not word.lower().startswith(key):
+                    break
+                result.append(word)
+                index += 1
+
+        if offline and self.offline is not None and len(result) < limit:
+            seen = {word.lower() for word in result}
+            for word in self.offline.keys_with_prefix(key, limit):
+                if word not in seen:
+                    result.append(word)
+                    if len(result) >= limit:
+                        break
+        return result
+
+    def __len__(self) -> int:
+        return len(self._words)
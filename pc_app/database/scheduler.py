@@ -0,0 +1,76 @@
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+from shared.models import WordRow
+from shared.srs import ReviewState, schedule
+from pc_app.database.database import WordDatabase
+
+DUE_QUEUE_SQL = '''
+    SELECT words.id, words.word, words.translation, words.english_translation,
+           words.memory_tip, words.user_note, words.created_at, words.updated_at,
+           reviews.ease, reviews.interval, reviews.repetitions, reviews.lapses,
+           reviews.due_at, reviews.reviewed_at
+    FROM reviews JOIN words ON words.id = reviews.word_id
+    ORDER BY reviews.due_at LIMIT ?
+'''
+
+# 版本号随评分一起写入(整批预留)，reviews_revision_au 触发器不必逐行回写
+UPDATE_REVIEW_SQL = '''
+    UPDATE reviews SET ease=?, interval=?, repetitions=?, lapses=?, due_at=?, reviewed_at=?, revision=?
+    WHERE word_id=?
+'''
+
+class ReviewScheduler:
+    """按 due_at 索引分批预取到期卡片，评分结果攒批后在一个事务里写回。"""
+
+    def __init__(self, db: WordDatabase, batch_size: int = 50, flush_size: int = 20):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_size = flush_size
+        self._queue = deque()
+        self._pending: Dict[int, ReviewState] = {}
+
+    def next_card(self) -> Optional[Tuple[WordRow, ReviewState]]:
+        if not self._queue:
+            self._refill()
+        if not self._queue:
+            return None
+        return self._queue.popleft()
+
+    def _refill(self):
+        # 先写回评分，否则刚复习过的卡片会按旧的 due_at 再次被取出
+        self.flush()
+        conn = self.db.pool.connection()
+        for row in conn.execute(DUE_QUEUE_SQL, (self.batch_size,)):
+            word = self.db._row_to_word(row)
+            state = ReviewState(word_id=row[0], ease=row[8], interval=row[9], repetitions=row[10],
+                                lapses=row[11], due_at=row[12], reviewed_at=row[13])
+            self._queue.append((word, state))
+
+    def grade(self, state: ReviewState, grade: int, now: Optional[float] = None) -> ReviewState:
+        new_state = schedule(state, grade, now)
+        self._pending[state.word_id] = new_state
+        if len(self._pending) >= self.flush_size:
+            self.flush()
+        return new_state
+
+    def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        with self.db.pool.transaction() as conn:
+            first = self.db._reserve_revisions(conn, len(pending))
+            conn.executemany(UPDATE_REVIEW_SQL, (
+                (s.ease, s.interval, s.repetitions, s.lapses, s.due_at, s.reviewed_at, first + offset, s.word_id)
+                for offset, s in enumerate(pending.values())
+            ))
+
+    def due_count(self, now: Optional[float] = None) -> int:
+        if now is None:
+            now = time.time()
+        conn = self.db.pool.connection()
+        return conn.execute('SELECT COUNT(*) FROM reviews WHERE due_at <= ?', (now,)).fetchone()[0]
+
+    def reset(self):
+        self.flush()
+        self._queue.clear()
@@ -0,0 +1,201 @@
+import sqlite3
+from contextlib import contextmanager
+from typing import Sequence
+from shared.schema import REVIEWS_SCHEMA, apply_migrations, has_table
+
+# trigram分词对中文释义同样有效，words_fts 只存索引，正文仍在 words 表
+FTS_SCHEMA = (
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+        word, translation, user_note,
+        content='words', content_rowid='id', tokenize='trigram'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS words_fts_ai AFTER INSERT ON words BEGIN
+        INSERT INTO words_fts(rowid, word, translation, user_note)
+        VALUES (new.id, new.word, new.translation, new.user_note);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS words_fts_ad AFTER DELETE ON words BEGIN
+        INSERT INTO words_fts(words_fts, rowid, word, translation, user_note)
+        VALUES ('delete', old.id, old.word, old.translation, old.user_note);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS words_fts_au AFTER UPDATE OF word, translation, user_note ON words BEGIN
+        INSERT INTO words_fts(words_fts, rowid, word, translation, user_note)
+        VALUES ('delete', old.id, old.word, old.translation, old.user_note);
+        INSERT INTO words_fts(rowid, word, translation, user_note)
+        VALUES (new.id, new.word, new.translation, new.user_note);
+    END
+    ''',
+    "INSERT INTO words_fts(words_fts) VALUES ('rebuild')",
+)
+
+# 批量写入时暂停的逐行触发器：全文索引和复习记录每块写完后各用一条 INSERT ... SELECT 补齐，
+# 版本号在插入和更新时直接写入(新单词的id不会出现在 deleted_words 里，不需要清理墓碑)；
+# words_revision_au 的 WHEN 条件此时总不成立，但每更新一行仍要为它准备一次触发器程序
+BULK_TRIGGERS = ('words_fts_ai', 'words_fts_au', 'words_revision_ai', 'words_revision_au', 'reviews_ai')
+
+REVIEWS_INDEX_SQL = '''
+    INSERT OR IGNORE INTO reviews(word_id, due_at)
+    SELECT id, CAST(strftime('%s', 'now') AS REAL) FROM words WHERE id > ?
+'''
+
+FTS_INDEX_SQL = 'INSERT INTO words_fts(rowid, word, translation, user_note) SELECT id, word, translation, user_note FROM words'
+
+# upsert 可能改到的已有行在写入前的索引内容，每块写完后据此一次删掉旧索引
+FTS_OLD_TABLE = '''
+    CREATE TEMP TABLE IF NOT EXISTS fts_old (
+        id INTEGER PRIMARY KEY, word TEXT, translation TEXT, user_note TEXT
+    )
+'''
+
+FTS_DELETE_SQL = '''
+    INSERT INTO words_fts(words_fts, rowid, word, translation, user_note)
+    SELECT 'delete', id, word, translation, user_note FROM temp.fts_old
+'''
+
+@contextmanager
+def paused_triggers(conn: sqlite3.Connection, names: Sequence[str]):
+    """在当前写事务里暂时删除这些触发器，退出时按原定义重建；事务回滚时一并撤销。"""
+    placeholders = ', '.join('?' * len(names))
+    definitions = [row[0] for row in conn.execute(
+        f"SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})", tuple(names)
+    )]
+    for name in names:
+        conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+    try:
+        yield
+    finally:
+        for sql in definitions:
+            conn.execute(sql)
+
+def _create_fts(conn: sqlite3.Connection) -> bool:
+    conn.execute('SAVEPOINT create_fts')
+    try:
+        for statement in FTS_SCHEMA:
+            conn.execute(statement)
+    except sqlite3.OperationalError as e:
+        # 部分平台的SQLite未编译FTS5/trigram，撤销建了一半的表和触发器，退回LIKE搜索
+        conn.execute('ROLLBACK TO create_fts')
+        print(f"全文索引不可用: {e}")
+        return False
+    finally:
+        conn.execute('RELEASE create_fts')
+    return True
+
+def _migrate_fts(conn: sqlite3.Connection):
+    _create_fts(conn)
+
+def _migrate_reviews(conn: sqlite3.Connection):
+    for statement in REVIEWS_SCHEMA:
+        conn.execute(statement)
+
+# 每次增删改都从 sync_meta 取下一个版本号写入 words.revision；删除留下墓碑，供增量同步
+REVISION_SCHEMA = (
+    'ALTER TABLE words ADD COLUMN revision INTEGER NOT NULL DEFAULT 0',
+    'UPDATE words SET revision = id',
+    'CREATE INDEX IF NOT EXISTS idx_words_revision ON words(revision)',
+    '''
+    CREATE TABLE IF NOT EXISTS sync_meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )
+    ''',
+    '''
+    INSERT OR IGNORE INTO sync_meta(key, value)
+    VALUES ('revision', COALESCE((SELECT MAX(id) FROM words), 0))
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS deleted_words (
+        id INTEGER PRIMARY KEY,
+        word TEXT NOT NULL,
+        revision INTEGER NOT NULL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_deleted_words_revision ON deleted_words(revision)',
+    '''
+    CREATE TRIGGER IF NOT EXISTS words_revision_ai AFTER INSERT ON words BEGIN
+        UPDATE sync_meta SET value = value + 1 WHERE key = 'revision';
+        UPDATE words SET revision = (SELECT value FROM sync_meta WHERE key = 'revision')
+        WHERE id = new.id;
+        DELETE FROM deleted_words WHERE id = new.id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS words_revision_au AFTER UPDATE ON words
+    WHEN new.revision = old.revision BEGIN
+        UPDATE sync_meta SET value = value + 1 WHERE key = 'revision';
+        UPDATE words SET revision = (SELECT value FROM sync_meta WHERE key = 'revision')
+        WHERE id = new.id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS words_revision_ad AFTER DELETE ON words BEGIN
+        UPDATE sync_meta SET value = value + 1 WHERE key = 'revision';
+        INSERT OR REPLACE INTO deleted_words(id, word, revision)
+        VALUES (old.id, old.word, (SELECT value FROM sync_meta WHERE key = 'revision'));
+    END
+    ''',
+)
+
+def _migrate_revision(conn: sqlite3.Connection):
+    for statement in REVISION_SCHEMA:
+        conn.execute(statement)
+
+# 复习记录与单词共用 sync_meta 的版本号，增量同步据此把复习进度发给手机；
+# 迁移时已复习过的记录各取一个新版本号，升级后所有客户端都会收到一次
+REVIEW_REVISION_SCHEMA = (
+    'ALTER TABLE reviews ADD COLUMN revision INTEGER NOT NULL DEFAULT 0',
+    '''
+    UPDATE reviews SET revision = (SELECT value FROM sync_meta WHERE key = 'revision') + word_id
+    WHERE reviewed_at IS NOT NULL
+    ''',
+    '''
+    UPDATE sync_meta SET value = value + COALESCE((SELECT MAX(word_id) FROM reviews WHERE revision > 0), 0)
+    WHERE key = 'revision'
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_reviews_revision ON reviews(revision)',
+    '''
+    CREATE TRIGGER IF NOT EXISTS reviews_revision_au AFTER UPDATE ON reviews
+    WHEN new.revision = old.revision BEGIN
+        UPDATE sync_meta SET value = value + 1 WHERE key = 'revision';
+        UPDATE reviews SET revision = (SELECT value FROM sync_meta WHERE key = 'revision')
+        WHERE word_id = new.word_id;
+    END
+    ''',
+)
+
+def _migrate_review_revision(conn: sqlite3.Connection):
+    for statement in REVIEW_REVISION_SCHEMA:
+        conn.execute(statement)
+
+# 每个trigram在 word 列中出现的单词数，模糊搜索用它挑出最少见的片段
+FTS_VOCAB_TABLE = "CREATE VIRTUAL TABLE IF NOT EXISTS words_fts_vocab USING fts5vocab(words_fts, 'col')"
+
+def _migrate_fts_vocab(conn: sqlite3.Connection):
+    if not has_table(conn, 'words_fts'):
+        return
+    try:
+        conn.execute(FTS_VOCAB_TABLE)
+    except sqlite3.OperationalError as e:
+        print(f"模糊搜索索引不可用: {e}")
+
+MIGRATIONS = (
+    _migrate_fts,
+    _migrate_reviews,
+    _migrate_revision,
+    _migrate_fts_vocab,
+    _migrate_review_revision,
+)
+
+def migrate(conn: sqlite3.Connection):
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    apply_migrations(conn, MIGRATIONS)
+    # 之后的迁移(ALTER TABLE 等)不能重复执行，user_version 只能继续前进；当初没能建立的
+    # 全文索引在之后每次启动时重试(例如换了支持FTS5的SQLite)，建成后补上模糊搜索索引
+    if version > 0 and not has_table(conn, 'words_fts') and _create_fts(conn):
+        _migrate_fts_vocab(conn)
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+from pc_app.database.database import WordDatabase
+from shared.models import WordRow
+
+class WordPager:
+    """按页读取单词列表(新单词在前)，只缓存最近访问的若干页。
+
+    相邻页用 id 做键集分页。拖动滚动条跳到没缓存的位置时按 id 估算位置(见 word_id_near)，
+    估出的页和已缓存的页未必首尾相接，所以跳转时清掉缓存，之后的相邻页都从这一页接着读；
+    首页和末页总是从两端按真实顺序读，滚到两端时位置的误差就消掉了。
+    """
+
+    def __init__(self, db: WordDatabase, columns: Optional[Sequence[str]] = None,
+                 page_size: int = 200, max_pages: int = 16):
+        self.db = db
+        self.columns = columns
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[int, List[WordRow]]" = OrderedDict()
+        self._count = None
+        self._exact = True
+
+    def count(self) -> int:
+        if self._count is None:
+            self._count = self.db.count_words()
+        return self._count
+
+    def rows(self, start: int, count: int) -> List[WordRow]:
+        end = min(start + count, self.count())
+        result = []
+        if start < end:
+            # 先读可见范围最后一行所在的页，跨页时前一页从它往前接；视图碰到末页时末页按真实顺序读出
+            self._page((end - 1) // self.page_size)
+        while start < end:
+            index, offset = divmod(start, self.page_size)
+            page = self._page(index)
+            if offset >= len(page):
+                break
+            chunk = page[offset:offset + end - start]
+            result.extend(chunk)
+            start += len(chunk)
+        return result
+
+    def _page(self, index: int) -> List[WordRow]:
+        page = self._pages.get(index)
+        if page is not None:
+            self._pages.move_to_end(index)
+            return page
+
+        last = max(0, self.count() - 1) // self.page_size
+        if index in (0, last) and not self._exact:
+            self._pages.clear()
+
+        previous = self._pages.get(index - 1)
+        following = self._pages.get(index + 1)
+        if previous:
+            page = self.db.page_words(before_id=previous[-1].id, limit=self.page_size, columns=self.columns)
+        elif following:
+            page = self.db.page_words(after_id=following[0].id, limit=self.page_size, columns=self.columns)
+        elif index == 0:
+            page = self.db.page_words(limit=self.page_size, columns=self.columns)
+            self._exact = True
+        elif index == last:
+            page = self.db.page_words(after_id=0, limit=self.count() - index * self.page_size,
+                                      columns=self.columns)
+            self._exact = True
+        else:
+            self._pages.clear()
+            anchor = self.db.word_id_near(index * self.page_size, self.count())
+            page = [] if anchor is None else self.db.page_words(before_id=anchor + 1, limit=self.page_size,
+                                                                 columns=self.columns)
+            self._exact = False
+
+        self._pages[index] = page
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return page
+
+    def discard(self, word_id: int):
+        # 删除后各页的边界都会移动，直接丢掉缓存重新读
+        self._pages.clear()
+        self._count = None
+        self._exact = True
+
+class ListPager:
+    """搜索结果已经全部在内存里，提供和 WordPager 相同的接口。"""
+
+    def __init__(self, words: List[WordRow]):
+        self.words = words
+
+    def count(self) -> int:
+        return len(self.words)
+
+    def rows(self, start: int, count: int) -> List[WordRow]:
+        return self.words[start:start + count]
+
+    def discard(self, word_id: int):
+        self.words = [word for word in self.words if word.id != word_id]
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+import sys
+import os
+import argparse
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.api.dictionary_api import DictionaryAPI, YOUDAO, ENGLISH_DICT
+from pc_app.api.enrichment import EnrichmentJob, EnrichmentProgress
+from pc_app.database.database import WordDatabase
+
+def print_progress(progress: EnrichmentProgress):
+    print(f"\r已处理 {progress.done}/{progress.total}，补全 {progress.updated}，失败 {progress.failed}，"
+          f"{progress.rate:.1f} 词/秒", end='', flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="批量查询词典，补全中文翻译或英文释义为空的单词")
+    parser.add_argument('--db', default='word_book.db', help="数据库路径")
+    parser.add_argument('--concurrency', type=int, default=8, help="同时查询的单词数")
+    parser.add_argument('--youdao-rate', type=float, default=5, help="有道接口每秒请求数上限，0为不限")
+    parser.add_argument('--dict-rate', type=float, default=5, help="英文词典接口每秒请求数上限，0为不限")
+    parser.add_argument('--retries', type=int, default=3, help="网络错误重试次数")
+    parser.add_argument('--batch-size', type=int, default=200, help="每批写回数据库的单词数")
+    parser.add_argument('--restart', action='store_true', help="忽略断点，从头开始")
+    args = parser.parse_args()
+
+    db = WordDatabase(args.db)
+    api = DictionaryAPI(max_workers=args.concurrency)
+    job = EnrichmentJob(db, api, concurrency=args.concurrency,
+                        rate_limits={YOUDAO: args.youdao_rate, ENGLISH_DICT: args.dict_rate},
+                        max_retries=args.retries, batch_size=args.batch_size)
+
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(progress=job.run(print_progress, resume=not args.restart)))
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.2)
+    except KeyboardInterrupt:
+        print("\n正在停止，等待进行中的查询结束...")
+        job.cancel()
+        worker.join()
+    print()
+
+    progress = result.get('progress')
+    if progress is not None:
+        if progress.cancelled:
+            print(f"已中断，下次运行从断点继续 ({job.checkpoint_path})")
+        elif progress.failed:
+            print(f"{progress.failed} 个单词查询失败，下次运行从第一个失败的单词开始重查 ({job.checkpoint_path})")
+        print(f"处理 {progress.done} 个单词，补全 {progress.updated}，失败 {progress.failed}，"
+              f"耗时 {progress.elapsed:.1f}s ({progress.rate:.1f} 词/秒)")
+    for provider, stats in api.stats().items():
+        print(f"{provider}: 缓存命中 {stats['hits']}，请求 {stats['misses'] + stats['errors']}，"
+              f"平均延迟 {stats['avg_latency_ms']:.0f}ms")
+    api.close()
+    db.close()
+
+if __name__ == "__main__":
+    main()
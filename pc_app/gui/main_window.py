@@ -1,9 +1,21 @@
+import threading
 import customtkinter as ctk
 from tkinter import messagebox
-import random
 from pc_app.database.database import WordDatabase
+from pc_app.database.scheduler import ReviewScheduler
+from pc_app.database.word_pages import WordPager, ListPager
+from pc_app.database.prefix_index import PrefixIndex
+from pc_app.gui.word_list_view import VirtualWordList
+from pc_app.gui.suggestions import SuggestionBox
 from pc_app.api.dictionary_api import DictionaryAPI
+from pc_app.api.enrichment import EnrichmentJob
+from pc_app.sync.async_wifi_sync import AsyncWiFiSyncServer
+from shared.discovery import local_addresses
 from shared.models import Word
+from shared.srs import GRADES
+
+# 列表只显示单词和中文释义，不读取其余列
+LIST_COLUMNS = ('word', 'translation')
 
 class MainWindow:
     def __init__(self):
@@ -13,8 +25,17 @@ class MainWindow:
         
         self.db = WordDatabase()
         self.api = DictionaryAPI()
+        self.scheduler = ReviewScheduler(self.db)
+        self.prefix_index = PrefixIndex(self.db, self.api.offline)
+        self.prefix_index.load_async()
         self.current_word = None
+        self.current_review = None
         self.card_flipped = False
+        self.query_future = None
+        self.query_text = None
+        self.query_seq = 0
+        self.enrich_job = None
+        self.sync_server = None
         
         self.setup_ui()
         
@@ -45,6 +66,9 @@ class MainWindow:
         self.card_btn = ctk.CTkButton(self.sidebar, text="单词卡", command=self.show_word_card)
         self.card_btn.pack(pady=5, padx=20, fill="x")
         
+        self.enrich_btn = ctk.CTkButton(self.sidebar, text="批量查询", command=self.show_enrich)
+        self.enrich_btn.pack(pady=5, padx=20, fill="x")
+        
         self.sync_btn = ctk.CTkButton(self.sidebar, text="同步数据", command=self.sync_data)
         self.sync_btn.pack(pady=5, padx=20, fill="x")
         
@@ -55,6 +79,7 @@ class MainWindow:
         welcome_label.pack(expand=True)
         
     def clear_main_frame(self):
+        self.cancel_query()
         for widget in self.main_frame.winfo_children():
             widget.destroy()
             
@@ -70,9 +95,11 @@ class MainWindow:
         ctk.CTkLabel(form_frame, text="单词:").pack(pady=5)
         self.word_entry = ctk.CTkEntry(form_frame, width=300)
         self.word_entry.pack(pady=5)
+        self.word_entry.bind("<KeyRelease>", self.on_word_entry_changed)
+        SuggestionBox(self.word_entry, self.prefix_index.suggest)
         
-        query_btn = ctk.CTkButton(form_frame, text="自动查询", command=self.auto_query_word)
-        query_btn.pack(pady=5)
+        self.query_btn = ctk.CTkButton(form_frame, text="自动查询", command=self.auto_query_word)
+        self.query_btn.pack(pady=5)
         
         ctk.CTkLabel(form_frame, text="中文翻译:").pack(pady=5)
         self.translation_entry = ctk.CTkTextbox(form_frame, width=300, height=80)
@@ -99,8 +126,36 @@ class MainWindow:
             messagebox.showwarning("警告", "请先输入单词")
             return
             
+        # 查询在后台线程进行，结果通过 root.after 回到界面线程，窗口不会卡住
+        self.cancel_query()
+        seq = self.query_seq
+        self.query_btn.configure(text="查询中...")
+        self.query_text = word
+        self.query_future = self.api.query_word_async(word)
+        self.query_future.add_done_callback(
+            lambda future: self.root.after(0, self.on_query_done, seq, word, future))
+        
+    def cancel_query(self):
+        # 序号加一后，已经在路上的结果到达时会被丢弃
+        self.query_seq += 1
+        if self.query_future is not None:
+            self.query_future.cancel()
+            self.query_future = None
+        
+    def on_word_entry_changed(self, event=None):
+        # 输入了别的单词，正在进行的查询结果已经没用了
+        if self.query_future is not None and self.word_entry.get().strip() != self.query_text:
+            self.cancel_query()
+            self.query_btn.configure(text="自动查询")
+        
+    def on_query_done(self, seq, word, future):
+        if seq != self.query_seq or future.cancelled():
+            return
+        self.query_future = None
+        self.query_btn.configure(text="自动查询")
+        
         try:
-            result = self.api.query_word(word)
+            result = future.result()
             self.translation_entry.delete("1.0", "end")
             self.translation_entry.insert("1.0", result['translation'])
             
@@ -129,6 +184,7 @@ class MainWindow:
         
         try:
             self.db.add_word(word)
+            self.prefix_index.add(word.word)
             messagebox.showinfo("成功", "单词添加成功")
             self.word_entry.delete(0, "end")
             self.translation_entry.delete("1.0", "end")
@@ -149,60 +205,49 @@ class MainWindow:
         
         self.search_entry = ctk.CTkEntry(search_frame, placeholder_text="搜索单词...")
         self.search_entry.pack(side="left", padx=10, pady=10, fill="x", expand=True)
+        SuggestionBox(self.search_entry, lambda prefix: self.prefix_index.suggest(prefix, offline=False),
+                      on_select=lambda word: self.search_words())
         
         search_btn = ctk.CTkButton(search_frame, text="搜索", command=self.search_words)
         search_btn.pack(side="right", padx=10, pady=10)
         
-        self.word_listbox = ctk.CTkScrollableFrame(self.main_frame)
-        self.word_listbox.pack(pady=10, padx=20, fill="both", expand=True)
+        self.fuzzy_var = ctk.BooleanVar(value=False)
+        fuzzy_check = ctk.CTkCheckBox(search_frame, text="模糊", variable=self.fuzzy_var, command=self.search_words)
+        fuzzy_check.pack(side="right", padx=10, pady=10)
         
-        self.load_word_list()
+        self.word_listbox = VirtualWordList(self.main_frame, WordPager(self.db, LIST_COLUMNS),
+                                            on_edit=self.edit_word, on_delete=self.delete_word)
+        self.word_listbox.pack(pady=10, padx=20, fill="both", expand=True)
         
     def search_words(self):
         keyword = self.search_entry.get().strip()
         if keyword:
-            words = self.db.search_words(keyword)
+            words = [] if self.fuzzy_var.get() else self.db.search_words(keyword, columns=LIST_COLUMNS)
+            if not words:
+                # 勾选模糊或精确搜索没有结果时，按拼写相近程度列出
+                words = self.db.fuzzy_search(keyword, columns=LIST_COLUMNS)
+            self.word_listbox.set_source(ListPager(words))
         else:
-            words = self.db.get_all_words()
-        self.display_word_list(words)
+            self.load_word_list()
         
     def load_word_list(self):
-        words = self.db.get_all_words()
-        self.display_word_list(words)
+        self.word_listbox.set_source(WordPager(self.db, LIST_COLUMNS))
         
-    def display_word_list(self, words):
-        for widget in self.word_listbox.winfo_children():
-            widget.destroy()
-            
-        for word in words:
-            word_frame = ctk.CTkFrame(self.word_listbox)
-            word_frame.pack(fill="x", pady=5, padx=10)
-            
-            word_label = ctk.CTkLabel(word_frame, text=f"{word.word} - {word.translation}", 
-                                    font=ctk.CTkFont(size=14))
-            word_label.pack(side="left", padx=10, pady=10)
-            
-            edit_btn = ctk.CTkButton(word_frame, text="编辑", width=60,
-                                   command=lambda w=word: self.edit_word(w))
-            edit_btn.pack(side="right", padx=5, pady=5)
-            
-            delete_btn = ctk.CTkButton(word_frame, text="删除", width=60,
-                                     command=lambda w=word: self.delete_word(w))
-            delete_btn.pack(side="right", padx=5, pady=5)
-            
     def edit_word(self, word):
         pass
         
     def delete_word(self, word):
         if messagebox.askyesno("确认", f"确定要删除单词 '{word.word}' 吗?"):
             self.db.delete_word(word.id)
-            self.load_word_list()
+            self.prefix_index.discard(word.word)
+            self.word_listbox.discard(word.id)
             messagebox.showinfo("成功", "单词删除成功")
             
     def show_word_card(self):
         self.clear_main_frame()
+        self.scheduler.reset()
         
-        title = ctk.CTkLabel(self.main_frame, text="随机单词卡", font=ctk.CTkFont(size=20, weight="bold"))
+        title = ctk.CTkLabel(self.main_frame, text="复习单词卡", font=ctk.CTkFont(size=20, weight="bold"))
         title.pack(pady=20)
         
         self.card_frame = ctk.CTkFrame(self.main_frame, width=400, height=300)
@@ -227,13 +272,21 @@ class MainWindow:
                                      command=self.delete_current_word)
             delete_btn.pack(side="left", padx=10)
             
+        grade_frame = ctk.CTkFrame(self.main_frame)
+        grade_frame.pack(pady=(0, 20))
+        
+        for text, grade in GRADES:
+            grade_btn = ctk.CTkButton(grade_frame, text=text, width=80,
+                                    command=lambda g=grade: self.grade_card(g))
+            grade_btn.pack(side="left", padx=5)
+            
     def next_card(self):
-        words = self.db.get_all_words()
-        if not words:
+        card = self.scheduler.next_card()
+        if not card:
             self.card_content.configure(text="暂无单词，请先添加单词")
             return
             
-        self.current_word = random.choice(words)
+        self.current_word, self.current_review = card
         self.card_flipped = False
         self.card_content.configure(text=self.current_word.word)
         
@@ -252,17 +305,125 @@ class MainWindow:
             self.card_content.configure(text=self.current_word.word)
             self.card_flipped = False
             
+    def grade_card(self, grade):
+        if not self.current_review:
+            return
+            
+        self.scheduler.grade(self.current_review, grade)
+        self.next_card()
+        
     def delete_current_word(self):
         if not self.current_word:
             return
             
         if messagebox.askyesno("确认", f"确定要删除单词 '{self.current_word.word}' 吗?"):
             self.db.delete_word(self.current_word.id)
+            self.prefix_index.discard(self.current_word.word)
+            self.current_review = None
             messagebox.showinfo("成功", "单词删除成功")
             self.next_card()
             
+    def show_enrich(self):
+        self.clear_main_frame()
+        
+        title = ctk.CTkLabel(self.main_frame, text="批量查询", font=ctk.CTkFont(size=20, weight="bold"))
+        title.pack(pady=20)
+        
+        missing = self.db.count_words_missing_details()
+        ctk.CTkLabel(self.main_frame, text=f"有 {missing} 个单词缺少中文翻译或英文释义").pack(pady=10)
+        
+        self.enrich_progress = ctk.CTkProgressBar(self.main_frame, width=400)
+        self.enrich_progress.set(0)
+        self.enrich_progress.pack(pady=10)
+        
+        self.enrich_status = ctk.CTkLabel(self.main_frame, text="")
+        self.enrich_status.pack(pady=5)
+        
+        self.enrich_start_btn = ctk.CTkButton(self.main_frame, text="开始", command=self.start_enrich)
+        self.enrich_start_btn.pack(pady=10)
+        
+        if self.enrich_job is not None:
+            self.enrich_start_btn.configure(text="停止", command=self.stop_enrich)
+        
+    def start_enrich(self):
+        if self.enrich_job is not None:
+            return
+        job = self.enrich_job = EnrichmentJob(self.db, self.api)
+        self.enrich_start_btn.configure(text="停止", command=self.stop_enrich)
+        
+        # 任务在后台线程运行，进度通过 root.after 回到界面线程；出错时也要回到界面线程收尾，
+        # 否则 enrich_job 一直不清空，之后无法再次开始
+        def run():
+            progress, error = None, None
+            try:
+                progress = job.run(lambda p: self.root.after(0, self.update_enrich_progress, p))
+            except Exception as e:
+                error = e
+            finally:
+                self.root.after(0, self.finish_enrich, progress, error)
+        
+        threading.Thread(target=run, daemon=True).start()
+        
+    def stop_enrich(self):
+        if self.enrich_job is not None:
+            self.enrich_job.cancel()
+            self.enrich_start_btn.configure(text="正在停止...", state="disabled")
+        
+    def update_enrich_progress(self, progress):
+        if not self.enrich_status.winfo_exists():
+            return
+        if progress.total:
+            self.enrich_progress.set(min(1.0, progress.done / progress.total))
+        self.enrich_status.configure(
+            text=f"已处理 {progress.done}/{progress.total}，补全 {progress.updated}，"
+                 f"失败 {progress.failed}，{progress.rate:.1f} 词/秒")
+        
+    def finish_enrich(self, progress, error=None):
+        self.enrich_job = None
+        if self.enrich_start_btn.winfo_exists():
+            if progress is not None:
+                self.update_enrich_progress(progress)
+            self.enrich_start_btn.configure(text="开始", command=self.start_enrich, state="normal")
+        if error is not None:
+            messagebox.showerror("错误", f"批量查询出错: {error}\n已完成的部分已保存，下次从断点继续")
+        elif progress.cancelled:
+            messagebox.showinfo("提示", f"已停止，补全了 {progress.updated} 个单词，下次从断点继续")
+        else:
+            messagebox.showinfo("完成", f"批量查询完成，补全了 {progress.updated} 个单词")
+        
     def sync_data(self):
-        messagebox.showinfo("提示", "数据同步功能开发中...")
+        if self.sync_server is not None:
+            self.show_sync_info()
+            return
+        server = AsyncWiFiSyncServer(db_path=self.db.db_path)
+        self.sync_btn.configure(text="正在启动...", state="disabled")
+        
+        # 在后台线程等待服务器启动，结果通过 root.after 回到界面线程，主循环不被阻塞
+        def wait():
+            self.root.after(0, self.finish_sync_start, server, server.wait_started(5))
+        
+        threading.Thread(target=server.start_server, daemon=True).start()
+        threading.Thread(target=wait, daemon=True).start()
+        
+    def finish_sync_start(self, server, started: bool):
+        self.sync_btn.configure(text="同步数据", state="normal")
+        if not started:
+            server.stop_server()
+            messagebox.showerror("错误", "同步服务启动失败")
+            return
+        self.sync_server = server
+        self.show_sync_info()
+        
+    def show_sync_info(self):
+        addresses = ", ".join(local_addresses()) or "127.0.0.1"
+        messagebox.showinfo("同步", f"同步服务已启动，端口 {self.sync_server.port}\n"
+                                   f"手机端点击“同步数据”即可自动找到本机({addresses})")
         
     def run(self):
-        self.root.mainloop()
\ No newline at end of file
+        self.root.mainloop()
+        if self.enrich_job is not None:
+            self.enrich_job.cancel()
+        self.api.close()
+        if self.sync_server is not None:
+            self.sync_server.stop_server()
+        self.scheduler.flush()
\ No newline at end of file
@@ -0,0 +1,96 @@
+import tkinter
+from typing import Callable, List, Optional
+
+DEBOUNCE_MS = 120
+IGNORED_KEYS = {"Up", "Down", "Return", "Escape", "Tab", "Shift_L", "Shift_R", "Control_L", "Control_R"}
+
+class SuggestionBox:
+    """输入框下方的候选词列表。
+
+    停止输入 DEBOUNCE_MS 毫秒后才调用 provider 查询，连续按键只查最后一次；
+    上下键移动，回车或单击选中，Esc 或输入框失去焦点时收起。
+    """
+
+    def __init__(self, entry, provider: Callable[[str], List[str]],
+                 on_select: Optional[Callable[[str], None]] = None, limit: int = 8):
+        self.entry = entry
+        self.provider = provider
+        self.on_select = on_select
+        self.root = entry.winfo_toplevel()
+        self.listbox = tkinter.Listbox(self.root, height=limit, activestyle="none", exportselection=False)
+        self.listbox.bind("<ButtonRelease-1>", self._on_click)
+        self._after_id = None
+        self._visible = False
+
+        entry.bind("<KeyRelease>", self._on_key, add="+")
+        entry.bind("<Down>", lambda event: self._move(1), add="+")
+        entry.bind("<Up>", lambda event: self._move(-1), add="+")
+        entry.bind("<Return>", self._on_return, add="+")
+        entry.bind("<Escape>", lambda event: self.hide(), add="+")
+        entry.bind("<FocusOut>", lambda event: self.root.after(150, self.hide), add="+")
+        entry.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _on_key(self, event):
+        if event.keysym in IGNORED_KEYS:
+            return
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after(DEBOUNCE_MS, self._refresh)
+
+    def _refresh(self):
+        self._after_id = None
+        if not self.listbox.winfo_exists():
+            return
+        suggestions = self.provider(self.entry.get())
+        if not suggestions:
+            self.hide()
+            return
+        self.listbox.delete(0, "end")
+        for word in suggestions:
+            self.listbox.insert("end", word)
+        self.listbox.configure(height=len(suggestions))
+        x = self.entry.winfo_rootx() - self.root.winfo_rootx()
+        y = self.entry.winfo_rooty() - self.root.winfo_rooty() + self.entry.winfo_height()
+        self.listbox.place(x=x, y=y, width=self.entry.winfo_width())
+        self.listbox.lift()
+        self._visible = True
+
+    def _move(self, step: int):
+        if not self._visible:
+            return
+        current = self.listbox.curselection()
+        index = (current[0] + step) if current else (0 if step > 0 else self.listbox.size() - 1)
+        index = max(0, min(index, self.listbox.size() - 1))
+        self.listbox.selection_clear(0, "end")
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+
+    def _on_return(self, event):
+        current = self.listbox.curselection() if self._visible else ()
+        if current:
+            self._choose(self.listbox.get(current[0]))
+            return "break"
+
+    def _on_click(self, event):
+        current = self.listbox.curselection()
+        if current:
+            self._choose(self.listbox.get(current[0]))
+
+    def _choose(self, word: str):
+        self.entry.delete(0, "end")
+        self.entry.insert(0, word)
+        self.hide()
+        if self.on_select is not None:
+            self.on_select(word)
+
+    def hide(self):
+        if self._visible and self.listbox.winfo_exists():
+            self.listbox.place_forget()
+        self._visible = False
+
+    def _on_destroy(self, event):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.listbox.winfo_exists():
+            self.listbox.destroy()
@@ -0,0 +1,150 @@
+import time
+from collections import deque
+from typing import Callable
+import customtkinter as ctk
+
+ROW_HEIGHT = 44
+WHEEL_ROWS = 3
+FRAME_BUDGET_MS = 16.7
+
+class VirtualWordList(ctk.CTkFrame):
+    """只为可见的几行创建控件，滚动时复用这些控件换上新的单词。
+
+    数据来自 WordPager / ListPager: count() 给出总行数，rows(start, count) 取可见的一段。
+    每次重绘的耗时记在 frame_times 里，由 frame_stats() 汇总，其中包括超过一帧预算的帧数。
+    """
+
+    def __init__(self, master, source, on_edit: Callable, on_delete: Callable, **kwargs):
+        super().__init__(master, **kwargs)
+        self.source = source
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+        self.top = 0
+        self.visible = 0
+        self.slots = []
+        self.frame_times = deque(maxlen=600)
+        self._render_pending = False
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.body.grid_columnconfigure(0, weight=1)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+
+    def set_source(self, source):
+        self.source = source
+        self.top = 0
+        self.schedule_render()
+
+    def refresh(self):
+        self.schedule_render()
+
+    def discard(self, word_id: int):
+        self.source.discard(word_id)
+        self.schedule_render()
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+
+    def _create_slot(self, index: int):
+        frame = ctk.CTkFrame(self.body, height=ROW_HEIGHT - 4)
+        label = ctk.CTkLabel(frame, text="", anchor="w", font=ctk.CTkFont(size=14))
+        label.pack(side="left", padx=10, fill="x", expand=True)
+        delete_btn = ctk.CTkButton(frame, text="删除", width=60,
+                                   command=lambda: self._on_action(index, self.on_delete))
+        delete_btn.pack(side="right", padx=5, pady=5)
+        edit_btn = ctk.CTkButton(frame, text="编辑", width=60,
+                                 command=lambda: self._on_action(index, self.on_edit))
+        edit_btn.pack(side="right", padx=5, pady=5)
+        for widget in (frame, label, edit_btn, delete_btn):
+            self._bind_wheel(widget)
+        frame.pack_propagate(False)
+        self.slots.append({'frame': frame, 'label': label, 'word': None})
+
+    def _on_action(self, index: int, callback: Callable):
+        word = self.slots[index]['word']
+        if word is not None:
+            callback(word)
+
+    def _on_resize(self, event):
+        visible = max(1, event.height // ROW_HEIGHT)
+        if visible == self.visible:
+            return
+        self.visible = visible
+        while len(self.slots) < visible:
+            self._create_slot(len(self.slots))
+        self.schedule_render()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.top - WHEEL_ROWS)
+        else:
+            self.scroll_to(self.top + WHEEL_ROWS)
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self.source.count()))
+        elif args[0] == "scroll":
+            step = self.visible if len(args) > 2 and args[2] == "pages" else 1
+            self.scroll_to(self.top + int(float(args[1])) * step)
+
+    def scroll_to(self, top: int):
+        top = max(0, min(top, self.source.count() - self.visible))
+        if top != self.top:
+            self.top = top
+            self.schedule_render()
+
+    def schedule_render(self):
+        # 一次空闲回调里只重绘一次，连续的滚轮事件合并成一帧
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self.render)
+
+    def render(self):
+        self._render_pending = False
+        if not self.winfo_exists():
+            return
+        start = time.perf_counter()
+
+        total = self.source.count()
+        self.top = max(0, min(self.top, total - self.visible))
+        words = self.source.rows(self.top, self.visible)
+        for i, slot in enumerate(self.slots):
+            word = words[i] if i < len(words) and i < self.visible else None
+            if word is None:
+                if slot['word'] is not None:
+                    slot['frame'].grid_remove()
+                slot['word'] = None
+                continue
+            if slot['word'] is None:
+                slot['frame'].grid(row=i, column=0, sticky="ew", pady=2, padx=10)
+            slot['word'] = word
+            slot['label'].configure(text=f"{word.word} - {word.translation}")
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.update_idletasks()
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.frame_times.append(elapsed)
+
+    def frame_stats(self):
+        times = sorted(self.frame_times)
+        if not times:
+            return None
+        return {
+            'frames': len(times),
+            'p50_ms': times[len(times) // 2],
+            'p99_ms': times[min(len(times) - 1, int(len(times) * 0.99))],
+            'max_ms': times[-1],
+            'over_budget': sum(1 for t in times if t > FRAME_BUDGET_MS),
+        }
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+import sys
+import os
+import argparse
+import csv
+import json
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from shared.models import Word
+
+FIELDS = ('word', 'translation', 'english_translation', 'memory_tip', 'user_note')
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.tsv':
+        return 'tsv'
+    if ext in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    return 'csv'
+
+def read_delimited(path: str, delimiter: str):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        columns = None
+        while True:
+            # 含NUL字节、字段超长等无法解析的行和 read_jsonl 一样记为该条记录的错误，继续读下一行
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield ValueError(f"第 {reader.line_num} 行格式错误: {e}")
+                continue
+
+            if columns is None:
+                if 'word' in row:
+                    columns = row
+                    continue
+                columns = FIELDS
+            if row:
+                yield Word(**{k: v for k, v in zip(columns, row) if k in FIELDS})
+
+def read_jsonl(path: str):
+    with open(path, encoding='utf-8-sig') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            # 有问题的行以 ValueError 传给批量写入，记为该条记录的错误，不中断整个导入
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield ValueError(f"第 {line_no} 行JSON格式错误: {e}")
+                continue
+            if not isinstance(data, dict):
+                yield ValueError(f"第 {line_no} 行不是JSON对象")
+                continue
+            values = {k: data.get(k) or '' for k in FIELDS}
+            invalid = [k for k, v in values.items() if not isinstance(v, str)]
+            if invalid:
+                yield ValueError(f"第 {line_no} 行字段不是字符串: {', '.join(invalid)}")
+                continue
+            yield Word(**values)
+
+def read_words(path: str, fmt: str):
+    if fmt == 'jsonl':
+        return read_jsonl(path)
+    return read_delimited(path, '\t' if fmt == 'tsv' else ',')
+
+def main():
+    parser = argparse.ArgumentParser(description="从CSV/TSV/JSONL文件批量导入单词")
+    parser.add_argument('path', help="导入文件路径")
+    parser.add_argument('--format', choices=('csv', 'tsv', 'jsonl'), help="文件格式，默认按扩展名判断")
+    parser.add_argument('--db', default='word_book.db', help="数据库路径")
+    parser.add_argument('--upsert', action='store_true', help="已存在的单词用导入内容更新")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="每个事务写入的行数")
+    args = parser.parse_args()
+
+    db = WordDatabase(args.db)
+    words = read_words(args.path, args.format or detect_format(args.path))
+
+    start = time.perf_counter()
+    if args.upsert:
+        result = db.upsert_words(words, chunk_size=args.chunk_size)
+    else:
+        result = db.add_words(words, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    for index, error in result.errors:
+        print(f"第 {index + 1} 条记录导入失败: {error}")
+
+    total = result.written + result.skipped + len(result.errors)
+    rate = total / elapsed if elapsed > 0 else 0
+    print(f"导入完成: 写入 {result.written}，跳过 {result.skipped}，失败 {len(result.errors)}，"
+          f"耗时 {elapsed:.2f}s ({rate:.0f} 行/秒)")
+    db.close()
+
+if __name__ == "__main__":
+    main()
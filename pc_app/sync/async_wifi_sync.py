@@ -0,0 +1,108 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from pc_app.database.database import WordDatabase
+from pc_app.sync.handler import SyncHandler
+from pc_app.sync.snapshot_cache import SnapshotCache
+from shared.discovery import DISCOVERY_PORT, ServiceAnnouncer
+from shared.protocols import SyncSession, FRAME_HEADER, MAX_FRAME_SIZE, FrameError, encode_frame
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[bytes]:
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise FrameError(f"帧长度超出限制: {length}")
+    return await reader.readexactly(length)
+
+class AsyncWiFiSyncServer:
+    """asyncio 版本的WiFi同步服务器：单线程处理所有连接，数据库查询放到有界线程池，
+    并用信号量限制同时进行的同步数量。"""
+
+    def __init__(self, port: int = 8888, db_path: str = "word_book.db",
+                 max_concurrent_syncs: int = 16, db_workers: int = 4, backlog: int = 256,
+                 cache: Optional[SnapshotCache] = None, discovery_port: Optional[int] = DISCOVERY_PORT):
+        self.port = port
+        self.backlog = backlog
+        self.max_concurrent_syncs = max_concurrent_syncs
+        self.db = WordDatabase(db_path)
+        self.handler = SyncHandler(self.db, cache)
+        self.executor = ThreadPoolExecutor(max_workers=db_workers, thread_name_prefix="sync-db")
+        self.is_running = False
+        self.active_clients = 0
+        self._loop = None
+        self._server = None
+        self._sync_slots = None
+        self._started = threading.Event()
+        # discovery_port 为 None 时不响应局域网发现
+        self.announcer = ServiceAnnouncer(port, discovery_port) if discovery_port else None
+
+    def start_server(self):
+        try:
+            asyncio.run(self.serve())
+        except Exception as e:
+            print(f"服务器启动失败: {e}")
+        finally:
+            self.is_running = False
+            if self.announcer:
+                self.announcer.stop()
+            self._started.set()
+            self.executor.shutdown(wait=False)
+
+    async def serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._sync_slots = asyncio.Semaphore(self.max_concurrent_syncs)
+        self._server = await asyncio.start_server(
+            self.handle_client, '0.0.0.0', self.port, backlog=self.backlog
+        )
+        self.is_running = True
+        if self.announcer:
+            self.announcer.start()
+        self._started.set()
+        print(f"WiFi同步服务器启动(asyncio)，端口: {self.port}")
+
+        async with self._server:
+            try:
+                await self._server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+    def wait_started(self, timeout: Optional[float] = None) -> bool:
+        return self._started.wait(timeout) and self.is_running
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        address = writer.get_extra_info('peername')
+        self.active_clients += 1
+        session = SyncSession()
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame is None:
+                    break
+
+                async with self._sync_slots:
+                    response = await self._loop.run_in_executor(
+                        self.executor, self.handler.handle_frame, frame, session
+                    )
+
+                if response:
+                    writer.write(encode_frame(response))
+                    # 慢速客户端的发送缓冲写满时在这里挂起，不再继续读请求
+                    await writer.drain()
+
+        except Exception as e:
+            print(f"处理客户端 {address} 时出错: {e}")
+        finally:
+            self.active_clients -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def stop_server(self):
+        if self._loop and self._server:
+            self._loop.call_soon_threadsafe(self._server.close)
@@ -1,15 +1,17 @@
 import bluetooth
 import threading
-import json
-from typing import Optional
-from ..database.database import WordDatabase
-from ...shared.protocols import SyncProtocol, MessageType
+from typing import Callable, Optional
+from pc_app.database.database import WordDatabase
+from pc_app.sync.handler import SyncHandler
+from pc_app.sync.snapshot_cache import SnapshotCache
+from shared.protocols import SyncProtocol, SyncSession, MessageType, ChangeSet, send_frame, recv_frame, PAGE_SIZE
 
 class BluetoothSyncServer:
-    def __init__(self):
+    def __init__(self, db_path: str = "word_book.db", cache: Optional[SnapshotCache] = None):
         self.server_socket = None
         self.is_running = False
-        self.db = WordDatabase()
+        self.db = WordDatabase(db_path)
+        self.handler = SyncHandler(self.db, cache)
         
     def start_server(self):
         try:
@@ -55,17 +57,17 @@ class BluetoothSyncServer:
             self.stop_server()
             
     def handle_client(self, client_socket, client_info):
+        session = SyncSession()
         try:
             while self.is_running:
-                data = client_socket.recv(1024).decode('utf-8')
-                if not data:
+                frame = recv_frame(client_socket)
+                if frame is None:
                     break
                     
-                message = SyncProtocol.parse_message(data)
-                response = self.process_message(message)
+                response = self.handler.handle_frame(frame, session)
                 
                 if response:
-                    client_socket.send(response.encode('utf-8'))
+                    send_frame(client_socket, response)
                     
         except Exception as e:
             print(f"处理蓝牙客户端时出错: {e}")
@@ -73,17 +75,8 @@ class BluetoothSyncServer:
             client_socket.close()
             print(f"蓝牙客户端 {client_info} 断开连接")
             
-    def process_message(self, message) -> Optional[str]:
-        msg_type = message.get('type')
-        
-        if msg_type == MessageType.SYNC_REQUEST.value:
-            words = self.db.get_all_words()
-            return SyncProtocol.create_sync_response(words)
-        
-        elif msg_type == MessageType.HEARTBEAT.value:
-            return SyncProtocol.create_message(MessageType.HEARTBEAT)
-            
-        return None
+    def process_message(self, message) -> Optional[bytes]:
+        return self.handler.process_message(message)
         
     def stop_server(self):
         self.is_running = False
@@ -93,6 +86,7 @@ class BluetoothSyncServer:
 class BluetoothSyncClient:
     def __init__(self):
         self.socket = None
+        self.session = SyncSession()
         self.is_connected = False
         
     def discover_devices(self):
@@ -108,21 +102,34 @@ class BluetoothSyncClient:
         try:
             self.socket = bluetooth.BluetoothSocket(bluetooth.RFCOMM)
             self.socket.connect((address, port))
+            self._negotiate()
             self.is_connected = True
             return True
         except Exception as e:
             print(f"连接蓝牙服务器失败: {e}")
             return False
             
+    def _negotiate(self):
+        self.session = SyncSession()
+        self.session = SyncProtocol.parse_hello_response(self._request(SyncProtocol.create_hello()))
+        
+    def _request(self, request: str) -> str:
+        return self._request_payload(request).decode('utf-8')
+        
+    def _request_payload(self, request: str) -> bytes:
+        send_frame(self.socket, self.session.encode(request))
+        frame = recv_frame(self.socket)
+        if frame is None:
+            raise ConnectionError("蓝牙服务器关闭了连接")
+        return self.session.decode_payload(frame)
+        
     def sync_words(self) -> list:
         if not self.is_connected:
             return []
             
         try:
             request = SyncProtocol.create_message(MessageType.SYNC_REQUEST)
-            self.socket.send(request.encode('utf-8'))
-            
-            response = self.socket.recv(1024).decode('utf-8')
+            response = self._request(request)
             words = SyncProtocol.parse_sync_response(response)
             
             return words
@@ -130,6 +137,25 @@ class BluetoothSyncClient:
             print(f"蓝牙同步数据失败: {e}")
             return []
             
+    def sync_changes(self, since: int, on_page: Callable[[ChangeSet], None],
+                     page_size: int = PAGE_SIZE) -> Optional[int]:
+        if not self.is_connected:
+            return None
+            
+        try:
+            while True:
+                request = SyncProtocol.create_changes_request(since, page_size)
+                changes = SyncProtocol.unpack_changes_response(self._request_payload(request))
+                if changes is None:
+                    return None
+                on_page(changes)
+                since = changes.revision
+                if not changes.more:
+                    return since
+        except Exception as e:
+            print(f"蓝牙同步数据失败: {e}")
+            return None
+            
     def disconnect(self):
         if self.socket:
             self.socket.close()
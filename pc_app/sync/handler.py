@@ -0,0 +1,80 @@
+from typing import Optional
+from pc_app.database.database import WordDatabase
+from pc_app.sync.snapshot_cache import SnapshotCache
+from shared.protocols import SyncProtocol, SyncSession, MessageType, ChangeSet, UpdateResult
+
+MAX_PAGE_SIZE = 5000
+
+class SyncHandler:
+    """WiFi和蓝牙服务器共用的消息处理逻辑，返回已按连接协商结果编码的响应帧内容。"""
+
+    def __init__(self, db: WordDatabase, cache: Optional[SnapshotCache] = None):
+        self.db = db
+        self.cache = cache if cache is not None else SnapshotCache()
+
+    def handle_frame(self, frame: bytes, session: SyncSession) -> Optional[bytes]:
+        message = SyncProtocol.parse_message(session.decode(frame))
+
+        if message.get('type') == MessageType.HELLO.value:
+            negotiated = SyncProtocol.negotiate(message.get('data'))
+            # HELLO的回复仍按协商前的方式编码，之后的帧才切换
+            response = session.encode(SyncProtocol.create_hello_response(negotiated))
+            session.codec = negotiated.codec
+            session.word_format = negotiated.word_format
+            return response
+
+        return self.process_message(message, session)
+
+    def process_message(self, message, session: Optional[SyncSession] = None) -> Optional[bytes]:
+        if session is None:
+            session = SyncSession()
+        msg_type = message.get('type')
+
+        if msg_type == MessageType.SYNC_REQUEST.value:
+            return self.cache.get_or_build(
+                ('all', session.codec), self.db.current_revision(),
+                lambda: session.encode(SyncProtocol.create_sync_response(self.db.get_all_words()))
+            )
+
+        elif msg_type == MessageType.CHANGES_REQUEST.value:
+            data = message.get('data') or {}
+            return self.changes_since(data.get('since', 0), data.get('limit'), session)
+
+        elif msg_type == MessageType.WORD_UPDATE.value:
+            return session.encode(SyncProtocol.create_word_update_response(
+                self.apply_update(message.get('data'))
+            ))
+
+        elif msg_type == MessageType.HEARTBEAT.value:
+            return session.encode(SyncProtocol.create_message(MessageType.HEARTBEAT))
+
+        return None
+
+    def apply_update(self, data) -> UpdateResult:
+        # 应用后版本号前进，快照缓存随之失效，其他客户端下次拉取就能收到这些修改
+        update = SyncProtocol.parse_word_update(data)
+        applied, words, reviews = self.db.apply_client_changes(update.words, update.reviews)
+        return UpdateResult(applied=applied, words=words, reviews=reviews, revision=self.db.current_revision())
+
+    def changes_since(self, since: int, limit: Optional[int] = None,
+                      session: Optional[SyncSession] = None) -> bytes:
+        if session is None:
+            session = SyncSession()
+        # 客户端版本号为0或大于服务器（数据库被替换过）时从头全量同步；
+        # 分页时客户端把每页返回的 revision 作为下一页的 since，中断后也从这里续传
+        revision = self.db.current_revision()
+        full = since <= 0 or since > revision
+        if full:
+            since = 0
+        if limit is not None:
+            limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        def build() -> bytes:
+            words, reviews, deleted, cursor, more = self.db.get_changes_since(since, limit)
+            changes = ChangeSet(words=words, reviews=reviews, deleted=[] if full else deleted,
+                                revision=cursor, full=full, more=more)
+            return session.encode_payload(SyncProtocol.pack_changes_response(changes, session.word_format))
+
+        # 同时同步的客户端请求的是同一组游标，按 (since, limit, 编码方式, 版本号) 共享压缩后的结果
+        key = ('changes', since, limit, session.codec, session.word_format)
+        return self.cache.get_or_build(key, revision, build)
@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable
+
+class SnapshotCache:
+    """按数据库版本号缓存已编码的同步响应。
+
+    同一个key同时只构建一次，其余请求等待同一个结果；出现更新的版本号后，
+    旧版本的条目全部作废。WiFi和蓝牙服务器可以共用同一个实例。
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._revision = -1
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get_or_build(self, key: Hashable, revision: int, builder: Callable[[], bytes]) -> bytes:
+        full_key = (key, revision)
+        with self._lock:
+            if revision > self._revision:
+                self._drop_all()
+                self._revision = revision
+
+            value = self._entries.get(full_key)
+            if value is not None:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return value
+
+            future = self._inflight.get(full_key)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                future = Future()
+                self._inflight[full_key] = future
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = builder()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(full_key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(full_key, None)
+            # 构建期间版本号已经前进的话结果照常返回，但不再缓存
+            if revision == self._revision and len(value) <= self.max_bytes:
+                self._entries[full_key] = value
+                self._size += len(value)
+                self._evict()
+        future.set_result(value)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._drop_all()
+
+    def _drop_all(self):
+        self.evictions += len(self._entries)
+        self._entries.clear()
+        self._size = 0
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            _, value = self._entries.popitem(last=False)
+            self._size -= len(value)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'revision': self._revision,
+            }
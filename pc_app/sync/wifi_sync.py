@@ -1,17 +1,21 @@
 import socket
 import threading
-import json
 from typing import Callable, Optional
-from ..database.database import WordDatabase
-from ...shared.protocols import SyncProtocol, MessageType
+from pc_app.database.database import WordDatabase
+from pc_app.sync.handler import SyncHandler
+from pc_app.sync.snapshot_cache import SnapshotCache
+from shared.discovery import DISCOVERY_PORT, ServiceAnnouncer, local_addresses
+from shared.protocols import SyncProtocol, SyncSession, MessageType, ChangeSet, send_frame, recv_frame, PAGE_SIZE
 
 class WiFiSyncServer:
-    def __init__(self, port: int = 8888):
+    def __init__(self, port: int = 8888, db_path: str = "word_book.db",
+                 cache: Optional[SnapshotCache] = None, discovery_port: Optional[int] = DISCOVERY_PORT):
         self.port = port
         self.server_socket = None
+        self.announcer = ServiceAnnouncer(port, discovery_port) if discovery_port else None
         self.is_running = False
-        self.db = WordDatabase()
-        self.clients = []
+        self.db = WordDatabase(db_path)
+        self.handler = SyncHandler(self.db, cache)
         
     def start_server(self):
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -21,6 +25,8 @@ class WiFiSyncServer:
             self.server_socket.bind(('0.0.0.0', self.port))
             self.server_socket.listen(5)
             self.is_running = True
+            if self.announcer:
+                self.announcer.start()
             
             print(f"WiFi同步服务器启动，端口: {self.port}")
             
@@ -44,21 +50,23 @@ class WiFiSyncServer:
         except Exception as e:
             print(f"服务器启动失败: {e}")
         finally:
+            if self.announcer:
+                self.announcer.stop()
             if self.server_socket:
                 self.server_socket.close()
                 
     def handle_client(self, client_socket: socket.socket, address):
+        session = SyncSession()
         try:
             while self.is_running:
-                data = client_socket.recv(4096).decode('utf-8')
-                if not data:
+                frame = recv_frame(client_socket)
+                if frame is None:
                     break
                     
-                message = SyncProtocol.parse_message(data)
-                response = self.process_message(message)
+                response = self.handler.handle_frame(frame, session)
                 
                 if response:
-                    client_socket.send(response.encode('utf-8'))
+                    send_frame(client_socket, response)
                     
         except Exception as e:
             print(f"处理客户端 {address} 时出错: {e}")
@@ -66,17 +74,8 @@ class WiFiSyncServer:
             client_socket.close()
             print(f"客户端 {address} 断开连接")
             
-    def process_message(self, message) -> Optional[str]:
-        msg_type = message.get('type')
-        
-        if msg_type == MessageType.SYNC_REQUEST.value:
-            words = self.db.get_all_words()
-            return SyncProtocol.create_sync_response(words)
-        
-        elif msg_type == MessageType.HEARTBEAT.value:
-            return SyncProtocol.create_message(MessageType.HEARTBEAT)
-            
-        return None
+    def process_message(self, message) -> Optional[bytes]:
+        return self.handler.process_message(message)
         
     def stop_server(self):
         self.is_running = False
@@ -84,18 +83,14 @@ class WiFiSyncServer:
             self.server_socket.close()
             
     def get_server_ip(self) -> str:
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-            s.close()
-            return ip
-        except:
-            return "127.0.0.1"
+        # 仅用于界面显示，客户端通过局域网发现得到地址
+        addresses = local_addresses()
+        return addresses[0] if addresses else "127.0.0.1"
 
 class WiFiSyncClient:
     def __init__(self):
         self.socket = None
+        self.session = SyncSession()
         self.is_connected = False
         
     def connect_to_server(self, host: str, port: int = 8888) -> bool:
@@ -103,21 +98,34 @@ class WiFiSyncClient:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.settimeout(5)
             self.socket.connect((host, port))
+            self._negotiate()
             self.is_connected = True
             return True
         except Exception as e:
             print(f"连接服务器失败: {e}")
             return False
             
+    def _negotiate(self):
+        self.session = SyncSession()
+        self.session = SyncProtocol.parse_hello_response(self._request(SyncProtocol.create_hello()))
+        
+    def _request(self, request: str) -> str:
+        return self._request_payload(request).decode('utf-8')
+        
+    def _request_payload(self, request: str) -> bytes:
+        send_frame(self.socket, self.session.encode(request))
+        frame = recv_frame(self.socket)
+        if frame is None:
+            raise ConnectionError("服务器关闭了连接")
+        return self.session.decode_payload(frame)
+        
     def sync_words(self) -> list:
         if not self.is_connected:
             return []
             
         try:
             request = SyncProtocol.create_message(MessageType.SYNC_REQUEST)
-            self.socket.send(request.encode('utf-8'))
-            
-            response = self.socket.recv(4096).decode('utf-8')
+            response = self._request(request)
             words = SyncProtocol.parse_sync_response(response)
             
             return words
@@ -125,6 +133,25 @@ class WiFiSyncClient:
             print(f"同步数据失败: {e}")
             return []
             
+    def sync_changes(self, since: int, on_page: Callable[[ChangeSet], None],
+                     page_size: int = PAGE_SIZE) -> Optional[int]:
+        if not self.is_connected:
+            return None
+            
+        try:
+            while True:
+                request = SyncProtocol.create_changes_request(since, page_size)
+                changes = SyncProtocol.unpack_changes_response(self._request_payload(request))
+                if changes is None:
+                    return None
+                on_page(changes)
+                since = changes.revision
+                if not changes.more:
+                    return since
+        except Exception as e:
+            print(f"同步数据失败: {e}")
+            return None
+            
     def disconnect(self):
         if self.socket:
             self.socket.close()
@@ -0,0 +1,64 @@
+import zlib
+from typing import Iterable, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+IDENTITY = "identity"
+ZLIB = "zlib"
+ZSTD = "zstd"
+
+def available_codecs() -> List[str]:
+    # 按优先级排列，协商时取双方都支持的第一个
+    codecs = [ZLIB, IDENTITY]
+    if zstandard is not None:
+        codecs.insert(0, ZSTD)
+    return codecs
+
+def choose_codec(offered: Iterable[str]) -> str:
+    offered = set(offered or ())
+    for codec in available_codecs():
+        if codec in offered:
+            return codec
+    return IDENTITY
+
+def compress(codec: str, data: bytes) -> bytes:
+    if codec == ZSTD:
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    if codec == ZLIB:
+        return zlib.compress(data, 6)
+    return data
+
+class OutputLimitError(ValueError):
+    """解压后的数据超过了允许的大小。"""
+
+def decompress(codec: str, data: bytes, max_size: Optional[int] = None) -> bytes:
+    """解压 data；给出 max_size 时最多只解出 max_size+1 字节，超出即报错，防止很小的帧解压出巨大的数据。"""
+    if codec == ZSTD:
+        if max_size is None:
+            return zstandard.ZstdDecompressor().decompress(data)
+        # 不用 decompress()：帧头声明的原始大小不可信，它会按声明的大小分配内存
+        chunks, total = [], 0
+        with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+            while total <= max_size:
+                chunk = reader.read(max_size + 1 - total)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                total += len(chunk)
+        result = b''.join(chunks)
+    elif codec == ZLIB:
+        if max_size is None:
+            return zlib.decompress(data)
+        decompressor = zlib.decompressobj()
+        result = decompressor.decompress(data, max_size + 1)
+        if not decompressor.eof and not decompressor.unconsumed_tail and len(result) <= max_size:
+            raise zlib.error("压缩数据不完整")
+    else:
+        result = data
+
+    if max_size is not None and len(result) > max_size:
+        raise OutputLimitError(f"解压后超出限制: 大于 {max_size} 字节")
+    return result
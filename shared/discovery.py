@@ -0,0 +1,158 @@
+import json
+import select
+import socket
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+# 局域网发现: 客户端向 DISCOVERY_PORT 广播探测包，PC端回复自己的同步端口，
+# 客户端从回复的来源地址得到服务器IP，不需要手动输入
+DISCOVERY_PORT = 8889
+SERVICE = "word_book"
+BROADCAST = ("255.255.255.255", DISCOVERY_PORT)
+
+Address = Tuple[str, int]
+
+def _encode(message_type: str, **data) -> bytes:
+    return json.dumps({"service": SERVICE, "type": message_type, **data}).encode("utf-8")
+
+def _decode(data: bytes) -> Optional[dict]:
+    try:
+        message = json.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(message, dict) or message.get("service") != SERVICE:
+        return None
+    return message
+
+def local_addresses() -> List[str]:
+    """本机的非回环IPv4地址。不向外发送数据，没有外网也能用。"""
+    addresses = []
+    try:
+        addresses += socket.gethostbyname_ex(socket.gethostname())[2]
+    except OSError:
+        pass
+    try:
+        # UDP的connect只选路由不发包，取默认网卡的地址
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+            probe.connect(("10.255.255.255", 1))
+            addresses.insert(0, probe.getsockname()[0])
+    except OSError:
+        pass
+    return [address for address in dict.fromkeys(addresses) if not address.startswith("127.")]
+
+class ServiceAnnouncer:
+    """PC端：在 DISCOVERY_PORT 上等待客户端的探测包，回复本机同步服务的端口。"""
+
+    def __init__(self, sync_port: int, discovery_port: int = DISCOVERY_PORT, host: str = ""):
+        self.sync_port = sync_port
+        self.discovery_port = discovery_port
+        self.host = host
+        self.is_running = False
+        self._socket = None
+        self._thread = None
+
+    def start(self) -> bool:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind((self.host, self.discovery_port))
+        except OSError as e:
+            sock.close()
+            print(f"局域网发现不可用: {e}")
+            return False
+        self._socket = sock
+        self.is_running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return True
+
+    def _serve(self):
+        reply = _encode("announce", port=self.sync_port, name=socket.gethostname())
+        while self.is_running:
+            try:
+                data, sender = self._socket.recvfrom(1024)
+            except OSError:
+                break
+            message = _decode(data)
+            if message is not None and message.get("type") == "probe":
+                try:
+                    self._socket.sendto(reply, sender)
+                except OSError:
+                    pass
+
+    def stop(self):
+        self.is_running = False
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+def discover(timeout: float = 1.0, targets: Sequence[Address] = (BROADCAST,), settle: float = 0.1) -> List[Address]:
+    """广播探测包并收集回复，返回 (IP, 同步端口) 列表，先回复的在前。
+
+    收到第一个回复后只再等 settle 秒收集其他服务器，不必等满 timeout。
+    """
+    found = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.bind(("", 0))
+        probe = _encode("probe")
+        for target in targets:
+            try:
+                sock.sendto(probe, target)
+            except OSError:
+                pass
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([sock], [], [], remaining)
+            if not readable:
+                break
+            data, sender = sock.recvfrom(1024)
+            message = _decode(data)
+            if message is None or message.get("type") != "announce":
+                continue
+            address = (sender[0], int(message.get("port", 0)))
+            if address not in found:
+                found.append(address)
+            deadline = min(deadline, time.monotonic() + settle)
+    return found
+
+def connect_first(candidates: Sequence[Address], timeout: float = 1.0) -> Optional[Tuple[socket.socket, Address]]:
+    """同时向所有候选地址发起TCP连接，返回最先连上的 (socket, 地址)，其余的关闭。"""
+    pending = {}
+    for address in dict.fromkeys(candidates):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            sock.connect_ex(address)
+        except OSError:
+            sock.close()
+            continue
+        pending[sock] = address
+
+    winner = None
+    deadline = time.monotonic() + timeout
+    try:
+        while pending and winner is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _, writable, _ = select.select([], list(pending), [], remaining)
+            for sock in writable:
+                address = pending.pop(sock)
+                # 连接被拒绝的地址也会变为可写，要看 SO_ERROR
+                if winner is None and sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    winner = (sock, address)
+                else:
+                    sock.close()
+    finally:
+        for sock in pending:
+            sock.close()
+
+    if winner is not None:
+        winner[0].setblocking(True)
+    return winner
@@ -36,4 +36,86 @@ class Word:
             user_note=data.get('user_note', ''),
             created_at=datetime.fromisoformat(data['created_at']) if data.get('created_at') else None,
             updated_at=datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else None
-        )
\ No newline at end of file
+        )
+
+class WordRow:
+    """数据库读出的单词行：用 __slots__ 节省内存，时间字段保留原始字符串，首次访问时才解析。
+
+    与 Word 的属性和 to_dict() 一致，可以直接用于界面和同步。
+    """
+
+    __slots__ = ('id', 'word', 'translation', 'english_translation', 'memory_tip', 'user_note',
+                 '_created_at', '_updated_at')
+
+    def __init__(self, id=None, word='', translation='', english_translation='', memory_tip='',
+                 user_note='', created_at=None, updated_at=None):
+        self.id = id
+        self.word = word
+        self.translation = translation
+        self.english_translation = english_translation
+        self.memory_tip = memory_tip
+        self.user_note = user_note
+        self._created_at = created_at
+        self._updated_at = updated_at
+
+    @classmethod
+    def from_columns(cls, names, values):
+        row = cls()
+        for name, value in zip(names, values):
+            setattr(row, name, value)
+        return row
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        value = self._created_at
+        if isinstance(value, str):
+            value = self._created_at = datetime.fromisoformat(value)
+        return value
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_at = value
+
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        value = self._updated_at
+        if isinstance(value, str):
+            value = self._updated_at = datetime.fromisoformat(value)
+        return value
+
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated_at = value
+
+    @staticmethod
+    def _isoformat(value) -> Optional[str]:
+        # 数据库里存的是 str(datetime)，把日期和时间之间的空格换成T即为 isoformat()，无需解析
+        if isinstance(value, str):
+            return value.replace(' ', 'T', 1)
+        return value.isoformat() if value else None
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'word': self.word,
+            'translation': self.translation,
+            'english_translation': self.english_translation,
+            'memory_tip': self.memory_tip,
+            'user_note': self.user_note,
+            'created_at': self._isoformat(self._created_at),
+            'updated_at': self._isoformat(self._updated_at)
+        }
+
+    def to_word(self) -> Word:
+        return Word(self.id, self.word, self.translation, self.english_translation,
+                    self.memory_tip, self.user_note, self.created_at, self.updated_at)
+
+    def __eq__(self, other):
+        if isinstance(other, (Word, WordRow)):
+            return self.to_word() == (other.to_word() if isinstance(other, WordRow) else other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"WordRow(id={self.id!r}, word={self.word!r}, translation={self.translation!r})"
@@ -1,14 +1,149 @@
 import json
+import struct
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .models import Word
+from .srs import ReviewState
+from .compression import IDENTITY, OutputLimitError, available_codecs, choose_codec, compress, decompress
+from .word_codec import encode_words, decode_words
+
+# 帧格式: 4字节大端长度 + UTF-8消息体，所有传输方式（WiFi/蓝牙/安卓客户端）共用
+FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 256 * 1024 * 1024
+RECV_CHUNK_SIZE = 64 * 1024
+PAGE_SIZE = 1000
+# 客户端推送本地修改时每条 WORD_UPDATE 消息最多携带的单词/复习记录数
+PUSH_BATCH_SIZE = 500
+
+# 单词批量的编码格式: json 为逐个对象的字典列表，columnar 按字段分列，避免每个单词重复键名
+FORMAT_JSON = "json"
+FORMAT_COLUMNAR = "columnar"
+FORMAT_BINARY = "binary"
+WORD_FORMATS = (FORMAT_BINARY, FORMAT_COLUMNAR, FORMAT_JSON)
+
+# binary 格式的响应: 0x00 + JSON头部长度(u32) + JSON头部 + word_codec编码的单词；
+# JSON消息不会以0x00开头，解析时据此区分
+BINARY_MARKER = b'\x00'
+WORD_FIELDS = ('id', 'word', 'translation', 'english_translation', 'memory_tip', 'user_note')
+REVIEW_FIELDS = tuple(f.name for f in fields(ReviewState))
+
+class FrameError(Exception):
+    pass
+
+def encode_frame(payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+def send_frame(sock, payload: bytes):
+    # 小帧合并成一次发送，避免头部单独成包触发Nagle与延迟ACK的等待
+    if len(payload) <= RECV_CHUNK_SIZE:
+        sock.sendall(encode_frame(payload))
+    else:
+        sock.sendall(FRAME_HEADER.pack(len(payload)))
+        sock.sendall(payload)
+
+def _recv_exactly(sock, size: int, on_progress=None) -> Optional[bytearray]:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        chunk = sock.recv(min(RECV_CHUNK_SIZE, size - received))
+        if not chunk:
+            return None
+        view[received:received + len(chunk)] = chunk
+        received += len(chunk)
+        if on_progress:
+            on_progress(received, size)
+    return buffer
+
+def recv_frame(sock, on_progress=None) -> Optional[bytes]:
+    header = _recv_exactly(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise FrameError(f"帧长度超出限制: {length}")
+    payload = _recv_exactly(sock, length, on_progress)
+    if payload is None:
+        raise FrameError("连接在帧传输中途断开")
+    return bytes(payload)
+
+@dataclass
+class ChangeSet:
+    words: List[Word] = field(default_factory=list)
+    reviews: List[ReviewState] = field(default_factory=list)
+    deleted: List[int] = field(default_factory=list)
+    revision: int = 0
+    full: bool = False
+    more: bool = False
+
+@dataclass
+class WordUpdate:
+    """客户端推送的本地修改：编辑过的单词和复习记录，各自带修改时间。"""
+    words: List[Word] = field(default_factory=list)
+    reviews: List[ReviewState] = field(default_factory=list)
+
+@dataclass
+class UpdateResult:
+    """服务器应用 WordUpdate 的结果：被拒绝的(服务器上更新或已删除)修改以服务器当前版本返回。"""
+    applied: int = 0
+    words: List[Word] = field(default_factory=list)
+    reviews: List[ReviewState] = field(default_factory=list)
+    revision: int = 0
+
+@dataclass
+class SyncSession:
+    """一条连接上协商好的压缩算法和单词编码格式，HELLO之后的帧都按此编解码。"""
+    codec: str = IDENTITY
+    word_format: str = FORMAT_JSON
+
+    def encode(self, message: str) -> bytes:
+        return compress(self.codec, message.encode('utf-8'))
+
+    def decode(self, payload: bytes) -> str:
+        return self.decode_payload(payload).decode('utf-8')
+
+    def encode_payload(self, data: bytes) -> bytes:
+        return compress(self.codec, data)
+
+    def decode_payload(self, payload: bytes) -> bytes:
+        # 帧长度限制的是压缩后的大小，解压后的大小同样不能超过它
+        try:
+            return decompress(self.codec, payload, MAX_FRAME_SIZE)
+        except OutputLimitError as e:
+            raise FrameError(str(e)) from e
+
+def words_to_columns(words: List[Word]) -> Dict[str, list]:
+    columns = {name: [getattr(word, name) for word in words] for name in WORD_FIELDS}
+    columns['created_at'] = [w.created_at.isoformat() if w.created_at else None for w in words]
+    columns['updated_at'] = [w.updated_at.isoformat() if w.updated_at else None for w in words]
+    return columns
+
+def words_from_columns(columns: Dict[str, list]) -> List[Word]:
+    parse = lambda value: datetime.fromisoformat(value) if value else None
+    return [
+        Word(id=id_, word=word, translation=translation, english_translation=english,
+             memory_tip=tip, user_note=note, created_at=parse(created), updated_at=parse(updated))
+        for id_, word, translation, english, tip, note, created, updated in zip(
+            *(columns[name] for name in WORD_FIELDS), columns['created_at'], columns['updated_at']
+        )
+    ]
+
+def reviews_to_columns(reviews: List[ReviewState]) -> Dict[str, list]:
+    return {name: [getattr(state, name) for state in reviews] for name in REVIEW_FIELDS}
+
+def reviews_from_columns(columns: Dict[str, list]) -> List[ReviewState]:
+    return [ReviewState(*values) for values in zip(*(columns[name] for name in REVIEW_FIELDS))]
 
 class MessageType(Enum):
     SYNC_REQUEST = "sync_request"
     SYNC_RESPONSE = "sync_response"
     WORD_UPDATE = "word_update"
     HEARTBEAT = "heartbeat"
+    CHANGES_REQUEST = "changes_request"
+    CHANGES_RESPONSE = "changes_response"
+    HELLO = "hello"
 
 class SyncProtocol:
     @staticmethod
@@ -34,4 +169,135 @@ class SyncProtocol:
         parsed = SyncProtocol.parse_message(message)
         if parsed["type"] == MessageType.SYNC_RESPONSE.value:
             return [Word.from_dict(word_data) for word_data in parsed["data"]]
-        return []
\ No newline at end of file
+        return []
+    
+    @staticmethod
+    def create_changes_request(since: int, limit: Optional[int] = None) -> str:
+        return SyncProtocol.create_message(MessageType.CHANGES_REQUEST, {"since": since, "limit": limit})
+    
+    @staticmethod
+    def create_changes_response(changes: ChangeSet, word_format: str = FORMAT_JSON) -> str:
+        if word_format == FORMAT_BINARY:
+            # binary 不是JSON文本，要用 pack_changes_response 生成
+            raise ValueError("binary 格式的响应请使用 pack_changes_response")
+        if word_format == FORMAT_COLUMNAR:
+            words_data = words_to_columns(changes.words)
+        else:
+            words_data = [word.to_dict() for word in changes.words]
+        return SyncProtocol._changes_message(changes, words_data, word_format)
+    
+    @staticmethod
+    def _changes_message(changes: ChangeSet, words_data: Any, word_format: str) -> str:
+        # 复习记录在 columnar 和 binary 格式下都按列放在JSON里
+        if word_format == FORMAT_JSON:
+            reviews_data = [asdict(state) for state in changes.reviews]
+        else:
+            reviews_data = reviews_to_columns(changes.reviews)
+        return SyncProtocol.create_message(MessageType.CHANGES_RESPONSE, {
+            "revision": changes.revision,
+            "full": changes.full,
+            "more": changes.more,
+            "words": words_data,
+            "reviews": reviews_data,
+            "deleted": changes.deleted
+        })
+    
+    @staticmethod
+    def parse_changes_response(message: str) -> Optional[ChangeSet]:
+        parsed = SyncProtocol.parse_message(message)
+        if parsed["type"] != MessageType.CHANGES_RESPONSE.value:
+            return None
+        data = parsed["data"]
+        reviews = data.get("reviews") or []
+        return ChangeSet(
+            words=(words_from_columns(data["words"]) if isinstance(data["words"], dict)
+                   else [Word.from_dict(word_data) for word_data in data["words"]]),
+            reviews=(reviews_from_columns(reviews) if isinstance(reviews, dict)
+                     else [ReviewState(**state) for state in reviews]),
+            deleted=data["deleted"],
+            revision=data["revision"],
+            full=data["full"],
+            more=data.get("more", False)
+        )
+    
+    @staticmethod
+    def pack_changes_response(changes: ChangeSet, word_format: str = FORMAT_JSON) -> bytes:
+        if word_format != FORMAT_BINARY:
+            return SyncProtocol.create_changes_response(changes, word_format).encode('utf-8')
+        header = SyncProtocol._changes_message(changes, [], FORMAT_BINARY).encode('utf-8')
+        return BINARY_MARKER + FRAME_HEADER.pack(len(header)) + header + encode_words(changes.words)
+    
+    @staticmethod
+    def unpack_changes_response(data: bytes) -> Optional[ChangeSet]:
+        if not data.startswith(BINARY_MARKER):
+            return SyncProtocol.parse_changes_response(data.decode('utf-8'))
+        offset = len(BINARY_MARKER)
+        (header_size,) = FRAME_HEADER.unpack_from(data, offset)
+        offset += FRAME_HEADER.size
+        changes = SyncProtocol.parse_changes_response(data[offset:offset + header_size].decode('utf-8'))
+        if changes is not None:
+            changes.words = decode_words(data[offset + header_size:])
+        return changes
+    
+    @staticmethod
+    def create_word_update(update: WordUpdate) -> str:
+        return SyncProtocol.create_message(MessageType.WORD_UPDATE, {
+            "words": [word.to_dict() for word in update.words],
+            "reviews": [asdict(state) for state in update.reviews]
+        })
+    
+    @staticmethod
+    def parse_word_update(data: Dict[str, Any]) -> WordUpdate:
+        data = data or {}
+        return WordUpdate(
+            words=[Word.from_dict(word_data) for word_data in data.get("words", ())],
+            reviews=[ReviewState(**state) for state in data.get("reviews", ())]
+        )
+    
+    @staticmethod
+    def create_word_update_response(result: UpdateResult) -> str:
+        return SyncProtocol.create_message(MessageType.WORD_UPDATE, {
+            "applied": result.applied,
+            "revision": result.revision,
+            "words": [word.to_dict() for word in result.words],
+            "reviews": [asdict(state) for state in result.reviews]
+        })
+    
+    @staticmethod
+    def parse_word_update_response(message: str) -> Optional[UpdateResult]:
+        parsed = SyncProtocol.parse_message(message)
+        if parsed["type"] != MessageType.WORD_UPDATE.value:
+            return None
+        data = parsed["data"]
+        update = SyncProtocol.parse_word_update(data)
+        return UpdateResult(applied=data["applied"], words=update.words, reviews=update.reviews,
+                            revision=data["revision"])
+    
+    @staticmethod
+    def create_hello() -> str:
+        return SyncProtocol.create_message(MessageType.HELLO, {
+            "codecs": available_codecs(),
+            "formats": list(WORD_FORMATS)
+        })
+    
+    @staticmethod
+    def negotiate(offer: Dict[str, Any]) -> SyncSession:
+        offer = offer or {}
+        formats = offer.get("formats") or ()
+        word_format = next((fmt for fmt in WORD_FORMATS if fmt in formats), FORMAT_JSON)
+        return SyncSession(codec=choose_codec(offer.get("codecs")), word_format=word_format)
+    
+    @staticmethod
+    def create_hello_response(session: SyncSession) -> str:
+        return SyncProtocol.create_message(MessageType.HELLO, {
+            "codec": session.codec,
+            "format": session.word_format
+        })
+    
+    @staticmethod
+    def parse_hello_response(message: str) -> SyncSession:
+        parsed = SyncProtocol.parse_message(message)
+        data = parsed.get("data") or {}
+        if parsed["type"] != MessageType.HELLO.value:
+            return SyncSession()
+        return SyncSession(codec=data.get("codec", IDENTITY), word_format=data.get("format", FORMAT_JSON))
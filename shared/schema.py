@@ -0,0 +1,59 @@
+import sqlite3
+from typing import Callable, Sequence
+
+# PC端数据库和安卓端本地存储共用的表结构
+WORDS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS words (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        word TEXT NOT NULL UNIQUE,
+        translation TEXT NOT NULL,
+        english_translation TEXT,
+        memory_tip TEXT,
+        user_note TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# 每个单词一行复习状态，due_at/reviewed_at 为Unix时间戳；新单词在插入时即到期
+REVIEWS_SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS reviews (
+        word_id INTEGER PRIMARY KEY,
+        ease REAL NOT NULL DEFAULT 2.5,
+        interval REAL NOT NULL DEFAULT 0,
+        repetitions INTEGER NOT NULL DEFAULT 0,
+        lapses INTEGER NOT NULL DEFAULT 0,
+        due_at REAL NOT NULL,
+        reviewed_at REAL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_reviews_due_at ON reviews(due_at)',
+    '''
+    CREATE TRIGGER IF NOT EXISTS reviews_ai AFTER INSERT ON words BEGIN
+        INSERT OR IGNORE INTO reviews(word_id, due_at)
+        VALUES (new.id, CAST(strftime('%s', 'now') AS REAL));
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS reviews_ad AFTER DELETE ON words BEGIN
+        DELETE FROM reviews WHERE word_id = old.id;
+    END
+    ''',
+    '''
+    INSERT OR IGNORE INTO reviews(word_id, due_at)
+    SELECT id, CAST(strftime('%s', 'now') AS REAL) FROM words
+    ''',
+)
+
+def has_table(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row is not None
+
+def apply_migrations(conn: sqlite3.Connection, migrations: Sequence[Callable[[sqlite3.Connection], None]]):
+    """按 PRAGMA user_version 依次执行尚未执行过的迁移步骤。"""
+    conn.execute(WORDS_TABLE)
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for target, step in enumerate(migrations[version:], version + 1):
+        step(conn)
+        conn.execute(f'PRAGMA user_version = {target}')
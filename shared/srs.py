@@ -0,0 +1,51 @@
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+DAY = 86400
+RELEARN_DELAY = 600
+MIN_EASE = 1.3
+
+# 卡片界面上的四个评分按钮，对应SM-2的0-5分
+GRADES = (
+    ("忘记", 1),
+    ("模糊", 3),
+    ("记得", 4),
+    ("简单", 5),
+)
+
+@dataclass
+class ReviewState:
+    word_id: int
+    ease: float = 2.5
+    interval: float = 0.0
+    repetitions: int = 0
+    lapses: int = 0
+    due_at: float = 0.0
+    reviewed_at: Optional[float] = None
+
+def schedule(state: ReviewState, grade: int, now: Optional[float] = None) -> ReviewState:
+    """SM-2: grade >= 3 视为记住，间隔按 1天、6天、interval*ease 增长；否则10分钟后重学。"""
+    if now is None:
+        now = time.time()
+    grade = max(0, min(5, grade))
+
+    if grade < 3:
+        repetitions = 0
+        interval = 0.0
+        lapses = state.lapses + 1
+        due_at = now + RELEARN_DELAY
+    else:
+        if state.repetitions == 0:
+            interval = 1.0
+        elif state.repetitions == 1:
+            interval = 6.0
+        else:
+            interval = round(state.interval * state.ease, 2)
+        repetitions = state.repetitions + 1
+        lapses = state.lapses
+        due_at = now + interval * DAY
+
+    ease = max(MIN_EASE, state.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    return replace(state, ease=ease, interval=interval, repetitions=repetitions,
+                   lapses=lapses, due_at=due_at, reviewed_at=now)
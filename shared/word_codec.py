@@ -0,0 +1,149 @@
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import List, Optional
+from .models import Word
+
+# 单词批量的二进制编码（按列存储）:
+#   头部:   b'WB' 版本(u8) 数量(u32)
+#   id列:   int64 小端
+#   文本列: word/translation/english_translation/memory_tip/user_note 依次为
+#           标志(u8) [空值位图] [长度数组 u32] 字节数(u32) UTF-8内容
+#           内容默认用 \0 分隔，遇到含 \0 的文本改用长度数组
+#   时间列: created_at/updated_at，自1970-01-01起的微秒数 int64，空值为 INT64_MIN
+MAGIC = b'WB'
+VERSION = 1
+HEADER = struct.Struct('<2sBI')
+U32 = struct.Struct('<I')
+TEXT_FIELDS = ('word', 'translation', 'english_translation', 'memory_tip', 'user_note')
+NULL_TIME = -(1 << 63)
+FLAG_LENGTHS = 1
+FLAG_NULLS = 2
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def _le(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _from_le(typecode: str, data: memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+def _encode_text(values: List[Optional[str]], out: bytearray):
+    flags = 0
+    nulls = None
+    if None in values:
+        flags |= FLAG_NULLS
+        nulls = bytearray((len(values) + 7) // 8)
+        for i, value in enumerate(values):
+            if value is None:
+                nulls[i >> 3] |= 1 << (i & 7)
+        values = ['' if value is None else value for value in values]
+
+    joined = '\x00'.join(values)
+    if joined.count('\x00') != max(len(values) - 1, 0):
+        flags |= FLAG_LENGTHS
+        encoded = [value.encode('utf-8') for value in values]
+        blob = b''.join(encoded)
+        lengths = array('I', map(len, encoded))
+    else:
+        blob = joined.encode('utf-8')
+        lengths = None
+
+    out.append(flags)
+    if nulls is not None:
+        out += nulls
+    if lengths is not None:
+        out += _le(lengths)
+    out += U32.pack(len(blob))
+    out += blob
+
+def _decode_text(data: memoryview, offset: int, count: int):
+    flags = data[offset]
+    offset += 1
+    nulls = None
+    if flags & FLAG_NULLS:
+        size = (count + 7) // 8
+        nulls = bytes(data[offset:offset + size])
+        offset += size
+    lengths = None
+    if flags & FLAG_LENGTHS:
+        lengths = _from_le('I', data[offset:offset + 4 * count])
+        offset += 4 * count
+    (blob_size,) = U32.unpack_from(data, offset)
+    offset += U32.size
+    blob = bytes(data[offset:offset + blob_size])
+    offset += blob_size
+
+    if lengths is not None:
+        values = []
+        position = 0
+        for length in lengths:
+            values.append(blob[position:position + length].decode('utf-8'))
+            position += length
+    elif count:
+        values = blob.decode('utf-8').split('\x00')
+    else:
+        values = []
+
+    if nulls is not None:
+        for i in range(count):
+            if nulls[i >> 3] & (1 << (i & 7)):
+                values[i] = None
+    return values, offset
+
+def _encode_time(value: Optional[datetime]) -> int:
+    if value is None:
+        return NULL_TIME
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+def _decode_time(value: int) -> Optional[datetime]:
+    if value == NULL_TIME:
+        return None
+    return _EPOCH + timedelta(0, 0, value)
+
+def encode_words(words: List[Word]) -> bytes:
+    out = bytearray(HEADER.pack(MAGIC, VERSION, len(words)))
+    out += _le(array('q', [word.id or 0 for word in words]))
+    for name in TEXT_FIELDS:
+        _encode_text([getattr(word, name) for word in words], out)
+    # 未编辑过的单词 created_at == updated_at，批量导入的单词时间也大量重复，按不同取值只换算一次
+    created = [word.created_at for word in words]
+    updated = [word.updated_at for word in words]
+    times = {value: _encode_time(value) for value in set(created).union(updated)}
+    out += _le(array('q', map(times.__getitem__, created)))
+    out += _le(array('q', map(times.__getitem__, updated)))
+    return bytes(out)
+
+def decode_words(data: bytes) -> List[Word]:
+    view = memoryview(data)
+    magic, version, count = HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("不是单词二进制编码")
+    if version != VERSION:
+        raise ValueError(f"不支持的单词编码版本: {version}")
+    offset = HEADER.size
+
+    ids = _from_le('q', view[offset:offset + 8 * count])
+    offset += 8 * count
+    columns = []
+    for _ in TEXT_FIELDS:
+        values, offset = _decode_text(view, offset, count)
+        columns.append(values)
+    created = _from_le('q', view[offset:offset + 8 * count])
+    offset += 8 * count
+    updated = _from_le('q', view[offset:offset + 8 * count])
+
+    ids = [word_id or None for word_id in ids]
+    times = {value: _decode_time(value) for value in set(created).union(updated)}
+    return list(map(Word, ids, *columns, map(times.__getitem__, created), map(times.__getitem__, updated)))
@@ -0,0 +1,94 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from pc_app.database.schema import BULK_TRIGGERS
+from shared.models import Word
+
+
+def triggers(conn):
+    return dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'"))
+
+
+class BulkWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = WordDatabase(os.path.join(self.tmp, "words.db"))
+        self.conn = self.db.pool.connection()
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def assert_consistent(self):
+        """暂停的触发器都已恢复，版本号、复习记录和全文索引与逐行写入时一致。"""
+        self.assertTrue(set(BULK_TRIGGERS) <= set(triggers(self.conn)))
+        revisions = [row[0] for row in self.conn.execute('SELECT revision FROM words')]
+        self.assertEqual(len(revisions), len(set(revisions)))
+        self.assertLessEqual(max(revisions), self.db.current_revision())
+        orphans = self.conn.execute(
+            'SELECT COUNT(*) FROM words WHERE id NOT IN (SELECT word_id FROM reviews)').fetchone()[0]
+        self.assertEqual(orphans, 0)
+        self.conn.execute("INSERT INTO words_fts(words_fts, rank) VALUES ('integrity-check', 1)")
+
+    def test_add_words_in_chunks(self):
+        before = triggers(self.conn)
+        self.db.add_word(Word(word="word3", translation="已有"))
+        words = [Word(word=f"word{i}", translation=f"翻译{i}") for i in range(100)]
+        words[10:10] = [ValueError("第 11 行格式错误"), Word(word="  ")]
+
+        result = self.db.add_words(words, chunk_size=30)
+        self.assertEqual(result.written, 99)
+        self.assertEqual(result.skipped, 1)
+        self.assertEqual([index for index, _ in result.errors], [10, 11])
+        self.assertEqual(self.db.count_words(), 100)
+        self.assertEqual(triggers(self.conn), before)
+        self.assert_consistent()
+        self.assertEqual([w.word for w in self.db.search_words("翻译42")], ["word42"])
+
+        # 批量写入之后逐行写入的触发器照常工作
+        revision = self.db.current_revision()
+        word_id = self.db.add_word(Word(word="single", translation="单个"))
+        self.assertEqual(self.conn.execute('SELECT revision FROM words WHERE id = ?', (word_id,)).fetchone()[0],
+                         revision + 1)
+        self.assert_consistent()
+
+    def test_upsert_only_touches_changed_rows(self):
+        self.db.add_words(Word(word=f"word{i}", translation=f"翻译{i}", user_note=f"笔记{i}") for i in range(50))
+        before = dict(self.conn.execute('SELECT word, revision FROM words'))
+        stamps = dict(self.conn.execute('SELECT word, updated_at FROM words'))
+
+        result = self.db.upsert_words([
+            Word(word="word1", translation="新翻译"),
+            Word(word="word2", translation="翻译2", user_note="笔记2"),
+            Word(word="word3", translation="", memory_tip="新记忆方法"),
+            Word(word="word99", translation="新单词"),
+        ], chunk_size=3)
+        self.assertEqual((result.written, result.skipped), (3, 1))
+
+        after = dict(self.conn.execute('SELECT word, revision FROM words'))
+        changed = {word for word in after if after[word] != before.get(word)}
+        self.assertEqual(changed, {"word1", "word3", "word99"})
+        self.assertEqual(self.conn.execute("SELECT updated_at FROM words WHERE word = 'word2'").fetchone()[0],
+                         stamps["word2"])
+        word3 = self.db.search_words("word3")[0]
+        self.assertEqual((word3.translation, word3.memory_tip), ("翻译3", "新记忆方法"))
+        self.assert_consistent()
+        self.assertEqual([w.word for w in self.db.search_words("新翻译")], ["word1"])
+        self.assertNotIn("word1", [w.word for w in self.db.search_words("翻译1", limit=100)])
+
+        # 同一份内容再导入一次不产生任何变更
+        revision = self.db.current_revision()
+        self.assertEqual(self.db.upsert_words([Word(word="word1", translation="新翻译")]).skipped, 1)
+        self.assertEqual(self.db.get_changes_since(revision)[0], [])
+        self.assertEqual(self.conn.execute("SELECT revision FROM words WHERE word = 'word1'").fetchone()[0],
+                         after["word1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import struct
+import sys
+import unittest
+import zlib
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared import protocols
+from shared.compression import IDENTITY, ZLIB, OutputLimitError, available_codecs, compress, decompress
+from shared.models import Word
+from shared.protocols import WORD_FORMATS, ChangeSet, FrameError, SyncProtocol, SyncSession
+from shared.srs import ReviewState
+from shared.word_codec import decode_words, encode_words
+
+CREATED = datetime(2024, 5, 1, 8, 30, 15, 123456)
+
+WORDS = [
+    Word(id=1, word="apple", translation="苹果", english_translation="a fruit", memory_tip="",
+         user_note=None, created_at=CREATED, updated_at=CREATED),
+    Word(id=2, word="naïve 🍎", translation="天真的", english_translation=None, memory_tip="记\x00忆",
+         user_note="", created_at=CREATED, updated_at=CREATED + timedelta(days=3, microseconds=1)),
+    Word(id=3, word="zero", translation="", created_at=None, updated_at=None),
+]
+
+
+class WordCodecTest(unittest.TestCase):
+    def test_round_trip(self):
+        self.assertEqual(decode_words(encode_words(WORDS)), WORDS)
+        self.assertEqual(decode_words(encode_words([])), [])
+
+    def test_mixed_batch(self):
+        # 空值位图跨多个字节，个别含 \0 的列改用长度数组，其余列仍用分隔符
+        words = [Word(id=i + 1, word=f"w{i}", translation="t" * (i % 3),
+                      memory_tip=None if i % 7 == 0 else ("\x00" if i % 11 == 0 else f"tip{i}"),
+                      user_note=None if i % 2 else "", created_at=CREATED + timedelta(seconds=i % 4),
+                      updated_at=CREATED)
+                 for i in range(100)]
+        self.assertEqual(decode_words(encode_words(words)), words)
+
+    def test_aware_times_stored_as_wall_clock(self):
+        aware = CREATED.replace(tzinfo=timezone(timedelta(hours=8)))
+        decoded = decode_words(encode_words([Word(id=1, word="a", created_at=aware, updated_at=aware)]))
+        self.assertEqual(decoded[0].created_at, CREATED)
+
+    def test_rejects_foreign_data(self):
+        data = bytearray(encode_words(WORDS))
+        with self.assertRaises(ValueError):
+            decode_words(b"XX" + bytes(data[2:]))
+        struct.pack_into('B', data, 2, 99)
+        with self.assertRaisesRegex(ValueError, "99"):
+            decode_words(bytes(data))
+
+
+class ChangesMessageTest(unittest.TestCase):
+    def test_round_trip_in_every_format(self):
+        changes = ChangeSet(
+            words=WORDS,
+            reviews=[ReviewState(word_id=1, ease=2.36, interval=6.0, repetitions=2, lapses=1,
+                                 due_at=1714550000.5, reviewed_at=1714500000.25),
+                     ReviewState(word_id=2, due_at=1714550000.0)],
+            deleted=[7, 9], revision=42, full=False, more=True,
+        )
+        for word_format in WORD_FORMATS:
+            with self.subTest(format=word_format):
+                data = SyncProtocol.pack_changes_response(changes, word_format)
+                self.assertEqual(data.startswith(protocols.BINARY_MARKER), word_format == protocols.FORMAT_BINARY)
+                self.assertEqual(SyncProtocol.unpack_changes_response(data), changes)
+
+    def test_response_without_reviews_from_older_server(self):
+        message = SyncProtocol.create_message(protocols.MessageType.CHANGES_RESPONSE, {
+            "revision": 3, "full": True, "words": [WORDS[0].to_dict()], "deleted": []
+        })
+        changes = SyncProtocol.parse_changes_response(message)
+        self.assertEqual((changes.words, changes.reviews, changes.more), ([WORDS[0]], [], False))
+
+    def test_negotiation_falls_back_to_plain_json(self):
+        session = SyncProtocol.negotiate({"codecs": ["br", ZLIB], "formats": ["xml", "columnar"]})
+        self.assertEqual((session.codec, session.word_format), (ZLIB, "columnar"))
+        self.assertEqual(SyncProtocol.negotiate(None), SyncSession())
+
+
+class CompressionTest(unittest.TestCase):
+    DATA = "单词本 word book ".encode('utf-8') * 2000
+
+    def test_round_trip_with_every_codec(self):
+        for codec in available_codecs():
+            with self.subTest(codec=codec):
+                packed = compress(codec, self.DATA)
+                self.assertEqual(decompress(codec, packed), self.DATA)
+                self.assertEqual(decompress(codec, packed, len(self.DATA)), self.DATA)
+                if codec != IDENTITY:
+                    self.assertLess(len(packed), len(self.DATA) // 10)
+
+    def test_output_limit(self):
+        for codec in available_codecs():
+            with self.subTest(codec=codec):
+                with self.assertRaises(OutputLimitError):
+                    decompress(codec, compress(codec, self.DATA), len(self.DATA) - 1)
+
+    def test_truncated_zlib_stream(self):
+        with self.assertRaises(zlib.error):
+            decompress(ZLIB, compress(ZLIB, self.DATA)[:-8], len(self.DATA))
+
+    def test_session_limits_decompressed_frame(self):
+        session = SyncSession(codec=ZLIB)
+        payload = session.encode_payload(self.DATA)
+        with mock.patch.object(protocols, "MAX_FRAME_SIZE", len(self.DATA) - 1):
+            with self.assertRaises(FrameError):
+                session.decode_payload(payload)
+        self.assertEqual(session.decode_payload(payload), self.DATA)
+
+
+if __name__ == "__main__":
+    unittest.main()
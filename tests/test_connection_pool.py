@@ -0,0 +1,62 @@
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.connection import ConnectionPool
+from pc_app.database.database import WordDatabase
+from shared.models import Word
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "words.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_shared_pool_survives_other_users_close(self):
+        gui = WordDatabase(self.path)
+        enrichment = WordDatabase(self.path)
+        self.assertIs(gui.pool, enrichment.pool)
+        gui.add_word(Word(word="apple"))
+
+        # 重复关闭也只归还一次引用
+        enrichment.close()
+        enrichment.close()
+        self.assertEqual(gui.count_words(), 1)
+        self.assertEqual(len(gui.pool._connections), 1)
+
+        pool = gui.pool
+        gui.close()
+        self.assertEqual(len(pool._connections), 0)
+
+        reopened = WordDatabase(self.path)
+        self.assertIsNot(reopened.pool, pool)
+        self.assertEqual(reopened.count_words(), 1)
+        reopened.close()
+
+    def test_thread_connection_closed_when_thread_exits(self):
+        db = WordDatabase(self.path)
+        db.count_words()
+        for _ in range(5):
+            thread = threading.Thread(target=db.count_words)
+            thread.start()
+            thread.join()
+        gc.collect()
+        self.assertEqual(len(db.pool._connections), 1)
+        db.close()
+
+    def test_memory_database_rejected(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool(":memory:")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "android_app"))
+
+from pc_app.database.database import WordDatabase
+from pc_app.database.scheduler import ReviewScheduler
+from pc_app.sync.handler import SyncHandler
+from shared.models import Word
+from shared.protocols import WORD_FORMATS, SyncProtocol, SyncSession
+from shared.srs import ReviewState
+from storage.local_store import LocalWordStore
+
+
+class DeltaSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = WordDatabase(os.path.join(self.tmp, "server.db"))
+        self.db.add_words(Word(word=f"word{i}", translation=f"翻译{i}") for i in range(25))
+        self.handler = SyncHandler(self.db)
+        self.store = LocalWordStore(os.path.join(self.tmp, "phone.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.db.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def pages(self, since, limit, word_format="json"):
+        session = SyncSession(word_format=word_format)
+        while True:
+            changes = SyncProtocol.unpack_changes_response(
+                session.decode_payload(self.handler.changes_since(since, limit, session)))
+            yield changes
+            if not changes.more:
+                return
+            since = changes.revision
+
+    def pull(self, limit=10):
+        for changes in self.pages(self.store.revision, limit):
+            self.store.apply_changes(changes)
+
+    def local_words(self):
+        return self.store.conn.execute("SELECT id, word, translation, user_note FROM words ORDER BY id").fetchall()
+
+    def server_words(self):
+        return self.db.pool.connection().execute(
+            "SELECT id, word, translation, user_note FROM words ORDER BY id").fetchall()
+
+    def test_pages_cover_every_change_once(self):
+        for word_format in WORD_FORMATS:
+            with self.subTest(format=word_format):
+                pages = list(self.pages(0, 7, word_format))
+                self.assertEqual([len(page.words) for page in pages], [7, 7, 7, 4])
+                # 只有第一页标记全量，之后的页从上一页的游标继续
+                self.assertEqual([page.full for page in pages], [True, False, False, False])
+                ids = [word.id for page in pages for word in page.words]
+                self.assertEqual(sorted(ids), [row[0] for row in self.server_words()])
+                self.assertEqual(pages[-1].revision, self.db.current_revision())
+
+    def test_incremental_changes_and_tombstones(self):
+        self.pull()
+        since = self.store.revision
+        self.assertEqual(self.local_words(), self.server_words())
+
+        word = self.db.get_word(3).to_word()
+        word.user_note = "新笔记"
+        self.db.update_word(word)
+        self.db.delete_word(5)
+        self.db.delete_word(6)
+        new_id = self.db.add_word(Word(word="newword", translation="新单词"))
+        scheduler = ReviewScheduler(self.db)
+        state = scheduler.grade(ReviewState(word_id=8, due_at=0.0), 4, 1000.0)
+        scheduler.flush()
+
+        # 每页2条: 单词、墓碑和复习记录按版本号交错分页
+        pages = list(self.pages(since, 2))
+        self.assertFalse(any(page.full for page in pages))
+        self.assertEqual(sorted(word.id for page in pages for word in page.words), [3, new_id])
+        self.assertEqual(sorted(i for page in pages for i in page.deleted), [5, 6])
+        self.assertEqual([review for page in pages for review in page.reviews], [state])
+        self.assertTrue(all(len(page.words) + len(page.reviews) <= 2 for page in pages))
+
+        for changes in pages:
+            self.store.apply_changes(changes)
+        self.assertEqual(self.local_words(), self.server_words())
+        self.assertEqual(self.store.review_state(8), state)
+        self.assertEqual(list(self.pages(self.store.revision, 2))[0].words, [])
+
+    def test_interrupted_pull_resumes_after_last_page(self):
+        pages = self.pages(0, 10)
+        self.store.apply_changes(next(pages))
+        self.assertEqual(self.store.count_words(), 10)
+        resumed = list(self.pages(self.store.revision, 10))
+        self.assertEqual(resumed[0].words[0].id, 11)
+        for changes in resumed:
+            self.store.apply_changes(changes)
+        self.assertEqual(self.local_words(), self.server_words())
+
+    def test_full_resync_when_server_database_replaced(self):
+        self.pull()
+        progress = ReviewState(word_id=2, repetitions=3, due_at=5000.0, reviewed_at=1000.0)
+        self.store.save_review(progress)
+
+        # 换成另一个更小的数据库: 客户端的版本号比服务器还大，从头全量同步
+        self.db.close()
+        os.remove(self.db.db_path)
+        self.db = WordDatabase(self.db.db_path)
+        self.db.add_words(Word(word=f"word{i}", translation=f"新库{i}") for i in range(5))
+        self.handler = SyncHandler(self.db)
+        self.assertGreater(self.store.revision, self.db.current_revision())
+
+        self.pull(limit=2)
+        self.assertEqual(self.local_words(), self.server_words())
+        self.assertEqual(self.store.review_state(2), progress)
+
+
+if __name__ == "__main__":
+    unittest.main()
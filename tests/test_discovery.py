@@ -0,0 +1,181 @@
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "android_app"))
+
+from pc_app.database.database import WordDatabase
+from pc_app.sync.async_wifi_sync import AsyncWiFiSyncServer
+from shared.discovery import SERVICE, ServiceAnnouncer, connect_first, discover
+from shared.models import Word
+from storage.local_store import LocalWordStore
+from sync.sync_client import SyncClient
+
+LOOPBACK = "127.0.0.1"
+
+
+def free_port(kind=socket.SOCK_STREAM):
+    """本机回环上一个当前空闲的端口；TCP端口没有监听，连接会被立即拒绝。"""
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind((LOOPBACK, 0))
+        return sock.getsockname()[1]
+
+
+class HangingListener:
+    """接受队列已满的监听端口：新的连接请求被内核丢弃，connect 一直等到超时。"""
+
+    def __init__(self):
+        self.listener = socket.socket()
+        self.listener.bind((LOOPBACK, 0))
+        self.listener.listen(0)
+        self.address = self.listener.getsockname()
+        self.fillers = []
+        for _ in range(3):
+            sock = socket.socket()
+            sock.setblocking(False)
+            sock.connect_ex(self.address)
+            self.fillers.append(sock)
+        time.sleep(0.05)
+
+    def close(self):
+        for sock in self.fillers + [self.listener]:
+            sock.close()
+
+
+class DiscoveryTest(unittest.TestCase):
+    def start_announcer(self, sync_port):
+        announcer = ServiceAnnouncer(sync_port, free_port(socket.SOCK_DGRAM), host=LOOPBACK)
+        self.assertTrue(announcer.start())
+        self.addCleanup(announcer.stop)
+        return (LOOPBACK, announcer.discovery_port)
+
+    def test_probe_answered_with_sync_port(self):
+        first = self.start_announcer(18001)
+        second = self.start_announcer(18002)
+        found = discover(1.0, [first, second])
+        self.assertEqual(sorted(found), [(LOOPBACK, 18001), (LOOPBACK, 18002)])
+
+    def test_foreign_replies_ignored(self):
+        # 同一端口上其他程序的回复: 非JSON、别的服务名
+        impostor = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        impostor.bind((LOOPBACK, 0))
+        self.addCleanup(impostor.close)
+
+        def reply():
+            _, sender = impostor.recvfrom(1024)
+            impostor.sendto(b"\xff not json", sender)
+            impostor.sendto(json.dumps({"service": "other", "type": "announce", "port": 1}).encode(), sender)
+            impostor.sendto(json.dumps({"service": SERVICE, "type": "probe"}).encode(), sender)
+
+        threading.Thread(target=reply, daemon=True).start()
+        announcer = self.start_announcer(18003)
+        self.assertEqual(discover(1.0, [impostor.getsockname(), announcer]), [(LOOPBACK, 18003)])
+
+    def test_no_server_returns_empty_after_timeout(self):
+        start = time.monotonic()
+        self.assertEqual(discover(0.2, [(LOOPBACK, free_port(socket.SOCK_DGRAM))]), [])
+        self.assertLess(time.monotonic() - start, 1.0)
+
+
+class ConnectFirstTest(unittest.TestCase):
+    def setUp(self):
+        self.hanging = HangingListener()
+        self.addCleanup(self.hanging.close)
+        self.refused = (LOOPBACK, free_port())
+
+    def test_picks_responding_candidate(self):
+        with socket.socket() as listener:
+            listener.bind((LOOPBACK, 0))
+            listener.listen(4)
+            alive = listener.getsockname()
+
+            start = time.monotonic()
+            connected = connect_first([self.hanging.address, self.refused, alive], timeout=2.0)
+            self.assertIsNotNone(connected)
+            sock, address = connected
+            sock.close()
+            self.assertEqual(address, alive)
+            # 不等失效的候选超时
+            self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_returns_none_when_nothing_answers(self):
+        start = time.monotonic()
+        self.assertIsNone(connect_first([self.hanging.address, self.refused], timeout=0.3))
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+
+class KnownServersTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = LocalWordStore(os.path.join(self.tmp, "phone.db"))
+        self.now = 1000.0
+        patcher = mock.patch("storage.local_store.time", SimpleNamespace(time=lambda: self.now))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def remember(self, host, port):
+        self.now += 1
+        self.store.remember_server(host, port)
+
+    def test_most_recent_first(self):
+        for host in ("10.0.0.1", "10.0.0.2", "10.0.0.3", "10.0.0.4"):
+            self.remember(host, 8888)
+        self.assertEqual(self.store.known_servers(), [("10.0.0.4", 8888), ("10.0.0.3", 8888), ("10.0.0.2", 8888)])
+
+        self.remember("10.0.0.1", 8888)
+        self.assertEqual(self.store.known_servers(2), [("10.0.0.1", 8888), ("10.0.0.4", 8888)])
+
+
+class ClientFallbackTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        db_path = os.path.join(self.tmp, "server.db")
+        db = WordDatabase(db_path)
+        db.add_words(Word(word=f"word{i}", translation=f"翻译{i}") for i in range(50))
+        db.close()
+
+        self.port = free_port()
+        self.discovery = (LOOPBACK, free_port(socket.SOCK_DGRAM))
+        self.server = AsyncWiFiSyncServer(port=self.port, db_path=db_path, discovery_port=self.discovery[1])
+        threading.Thread(target=self.server.start_server, daemon=True).start()
+        self.assertTrue(self.server.wait_started(5))
+        self.store = LocalWordStore(os.path.join(self.tmp, "phone.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.server.stop_server()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def sync(self, candidates):
+        client = SyncClient(discovery_targets=[self.discovery])
+        revision = client.sync_changes_from_server(candidates, self.store.revision, self.store.apply_changes,
+                                                   outbox=self.store)
+        self.assertIsNotNone(revision)
+        return client.server
+
+    def test_stale_servers_fall_back_to_discovery(self):
+        stale = [(LOOPBACK, free_port())]
+        self.assertEqual(self.sync(stale), (LOOPBACK, self.port))
+        self.assertEqual(self.store.count_words(), 50)
+
+    def test_remembered_server_used_directly(self):
+        self.store.remember_server(LOOPBACK, self.port)
+        self.assertEqual(self.sync(self.store.known_servers()), (LOOPBACK, self.port))
+
+
+if __name__ == "__main__":
+    unittest.main()
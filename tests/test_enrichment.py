@@ -0,0 +1,86 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.api.dictionary_api import YOUDAO
+from pc_app.api.enrichment import EnrichmentJob
+from pc_app.database.database import WordDatabase
+from shared.models import Word
+
+
+class FakeDictionary:
+    """代替 DictionaryAPI：failing 里的单词每次查询都抛出网络错误。"""
+
+    def __init__(self, failing=(), on_lookup=None):
+        self.failing = set(failing)
+        self.on_lookup = on_lookup
+        self.lookups = []
+
+    def fetch(self, provider, word, before_request=None):
+        self.lookups.append(word)
+        if self.on_lookup is not None:
+            self.on_lookup(word)
+        if word in self.failing:
+            raise ConnectionError("timeout")
+        return f"{word}的释义" if provider == YOUDAO else f"definition of {word}"
+
+    def generate_memory_tip(self, word, translation):
+        return f"联想记忆: {word}"
+
+
+class EnrichmentCheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = WordDatabase(os.path.join(self.tmp, "words.db"))
+        self.db.add_words(Word(word=f"word{i}") for i in range(10))
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def job(self, api):
+        return EnrichmentJob(self.db, api, concurrency=2, rate_limits={}, max_retries=0, batch_size=3)
+
+    def test_failed_word_retried_on_resume(self):
+        job = self.job(FakeDictionary(failing={"word4"}))
+        progress = job.run()
+        self.assertEqual(progress.failed, 1)
+        self.assertEqual(self.db.count_words_missing_details(), 1)
+        # word4 所在批次之后断点不再前进，停在它之前
+        self.assertEqual(job.load_checkpoint(), self.db.words_missing_details()[0].id - 1)
+
+        api = FakeDictionary()
+        progress = self.job(api).run()
+        self.assertEqual(api.lookups, ["word4", "word4"])
+        self.assertEqual(progress.updated, 1)
+        self.assertEqual(self.db.count_words_missing_details(), 0)
+        self.assertFalse(os.path.exists(job.checkpoint_path))
+
+    def test_interrupted_run_keeps_failed_word_before_checkpoint(self):
+        def interrupt(word):
+            if word == "word8":
+                job.cancel()
+
+        job = self.job(FakeDictionary(failing={"word4"}, on_lookup=interrupt))
+        progress = job.run()
+        self.assertTrue(progress.cancelled)
+        self.assertEqual(progress.failed, 1)
+
+        api = FakeDictionary()
+        self.job(api).run()
+        self.assertEqual(sorted(set(api.lookups)), ["word4", "word9"])
+        self.assertEqual(self.db.count_words_missing_details(), 0)
+
+    def test_successful_run_clears_checkpoint(self):
+        job = self.job(FakeDictionary())
+        progress = job.run()
+        self.assertEqual((progress.done, progress.updated, progress.failed), (10, 10, 0))
+        self.assertFalse(os.path.exists(job.checkpoint_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from pc_app.import_words import read_words
+
+
+class ReadWordsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp, name)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        return path
+
+    def import_file(self, path, fmt):
+        db = WordDatabase(os.path.join(self.tmp, "words.db"))
+        try:
+            result = db.add_words(read_words(path, fmt))
+            return result, sorted(word.word for word in db.get_all_words())
+        finally:
+            db.close()
+
+    def test_bad_csv_rows_reported_per_row(self):
+        huge = "x" * (csv.field_size_limit() + 1)
+        path = self.write("words.csv", f"word,translation\napple,苹果\nhuge,{huge}\ncherry,樱桃\n"
+                                       f"{huge},x\nbanana,香蕉\n")
+        result, words = self.import_file(path, "csv")
+
+        self.assertEqual(words, ["apple", "banana", "cherry"])
+        self.assertEqual([index for index, _ in result.errors], [1, 3])
+        self.assertIn("第 3 行", result.errors[0][1])
+
+    def test_tsv_without_header(self):
+        path = self.write("words.tsv", "apple\t苹果\n\nbanana\t香蕉\n")
+        result, words = self.import_file(path, "tsv")
+        self.assertEqual(words, ["apple", "banana"])
+        self.assertEqual(result.errors, [])
+
+    def test_bad_jsonl_lines_reported_per_row(self):
+        path = self.write("words.jsonl", '{"word": "apple"}\nnot json\n[1, 2]\n{"word": 3}\n{"word": "banana"}\n')
+        result, words = self.import_file(path, "jsonl")
+        self.assertEqual(words, ["apple", "banana"])
+        self.assertEqual([index for index, _ in result.errors], [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.api.dictionary_api import DictionaryAPI, ENGLISH_DICT, YOUDAO
+from pc_app.api.lookup_cache import DAY, HOUR, LookupCache
+
+
+class StubDictionaryHandler(BaseHTTPRequestHandler):
+    # 本地模拟有道和 dictionaryapi.dev：以 zz 开头的单词查无此词，以 err 开头的返回503
+    protocol_version = "HTTP/1.1"
+    requests = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/suggest":
+            word = parse_qs(url.query)["q"][0]
+        else:
+            word = url.path.rsplit("/", 1)[-1]
+        with StubDictionaryHandler.lock:
+            StubDictionaryHandler.requests.append((url.path, word))
+
+        if word.startswith("err"):
+            self.reply(503, {})
+        elif url.path == "/suggest":
+            entries = [] if word.startswith("zz") else [{"entry": word, "explain": f"n. {word}的释义"}]
+            self.reply(200, {"data": {"entries": entries}})
+        elif word.startswith("zz"):
+            self.reply(404, {"title": "No Definitions Found"})
+        else:
+            self.reply(200, [{"meanings": [{"definitions": [{"definition": f"definition of {word}"}]}]}])
+
+    def reply(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Clock:
+    """替换 lookup_cache 模块里的 time，测试中手动拨动缓存看到的时间。"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class DictionaryCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubDictionaryHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubDictionaryHandler.requests = []
+        self.tmp = tempfile.mkdtemp()
+        self.clock = Clock()
+        patcher = mock.patch("pc_app.api.lookup_cache.time", SimpleNamespace(time=self.clock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.api = DictionaryAPI(max_workers=2, cache_path=os.path.join(self.tmp, "cache.db"), offline_path=None,
+                                 youdao_url=f"{self.base}/suggest", fallback_url=f"{self.base}/api/v2/entries/en/")
+
+    def tearDown(self):
+        self.api.close()
+        self.api.cache.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def requests_for(self, word):
+        return [path for path, requested in StubDictionaryHandler.requests if requested == word]
+
+    def test_hit_skips_network(self):
+        self.assertEqual(self.api.fetch(YOUDAO, "apple"), "n. apple的释义")
+        self.assertEqual(self.api.fetch(YOUDAO, "Apple"), "n. apple的释义")
+        self.assertEqual(len(self.requests_for("apple")), 1)
+        self.assertEqual(self.api.stats()[YOUDAO]["hits"], 1)
+
+    def test_ttl_expiry(self):
+        self.api.fetch(ENGLISH_DICT, "apple")
+        self.clock.advance(self.api.cache.ttl - 1)
+        self.api.fetch(ENGLISH_DICT, "apple")
+        self.assertEqual(len(self.requests_for("apple")), 1)
+
+        self.clock.advance(2)
+        self.assertEqual(self.api.fetch(ENGLISH_DICT, "apple"), "definition of apple")
+        self.assertEqual(len(self.requests_for("apple")), 2)
+
+    def test_negative_result_cached_for_negative_ttl(self):
+        self.assertIsNone(self.api.fetch(ENGLISH_DICT, "zzmissing"))
+        self.assertIsNone(self.api.fetch(ENGLISH_DICT, "zzmissing"))
+        self.assertEqual(len(self.requests_for("zzmissing")), 1)
+        self.assertEqual(self.api.cache.get(ENGLISH_DICT, "zzmissing"), (True, None))
+
+        # 查无此词的保留时间较短，过期后重新查询，查到的释义仍在缓存里
+        self.api.fetch(ENGLISH_DICT, "apple")
+        self.clock.advance(self.api.cache.negative_ttl + 1)
+        self.api.fetch(ENGLISH_DICT, "zzmissing")
+        self.api.fetch(ENGLISH_DICT, "apple")
+        self.assertEqual(len(self.requests_for("zzmissing")), 2)
+        self.assertEqual(len(self.requests_for("apple")), 1)
+
+    def test_network_errors_not_cached(self):
+        with self.assertRaises(Exception):
+            self.api.fetch(ENGLISH_DICT, "error")
+        with self.assertRaises(Exception):
+            self.api.fetch(ENGLISH_DICT, "error")
+        self.assertEqual(len(self.requests_for("error")), 2)
+        self.assertEqual(self.api.cache.get(ENGLISH_DICT, "error"), (False, None))
+
+
+class LookupCacheEvictionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache = LookupCache(os.path.join(self.tmp, "cache.db"), max_entries=3)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_evicts_least_recently_accessed(self):
+        for offset, word in enumerate(("a", "b", "c")):
+            self.cache.put(YOUDAO, word, word, now=offset * HOUR)
+        # a 最早写入，但之后被访问过；b 成为最久未访问的
+        self.assertEqual(self.cache.get(YOUDAO, "a", now=5 * HOUR), (True, "a"))
+        self.cache.put(YOUDAO, "d", "d", now=6 * HOUR)
+
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.get(YOUDAO, "b", now=7 * HOUR), (False, None))
+        for word in ("a", "c", "d"):
+            self.assertEqual(self.cache.get(YOUDAO, word, now=7 * HOUR), (True, word))
+
+    def test_hits_within_resolution_do_not_write(self):
+        self.cache.put(YOUDAO, "a", "a", now=0)
+        conn = self.cache.pool.connection()
+        changes = conn.total_changes
+        for second in range(1, 100):
+            self.assertEqual(self.cache.get(YOUDAO, "a", now=second), (True, "a"))
+        self.assertEqual(conn.total_changes, changes)
+
+        self.cache.get(YOUDAO, "a", now=HOUR)
+        accessed_at = conn.execute("SELECT accessed_at FROM lookups").fetchone()[0]
+        self.assertEqual(accessed_at, HOUR)
+
+    def test_expired_entries_purged(self):
+        self.cache.put(YOUDAO, "found", "x", now=0)
+        self.cache.put(YOUDAO, "missing", None, now=0)
+        self.assertEqual(self.cache.purge_expired(now=2 * DAY), 1)
+        self.assertEqual(self.cache.get(YOUDAO, "found", now=2 * DAY), (True, "x"))
+
+
+if __name__ == "__main__":
+    unittest.main()
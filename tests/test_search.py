@@ -0,0 +1,114 @@
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pc_app.database.database import WordDatabase
+from shared.models import Word
+from shared.schema import WORDS_TABLE
+
+
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "words.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def open(self):
+        db = WordDatabase(self.path)
+        self.addCleanup(db.close)
+        return db
+
+    @staticmethod
+    def found(db, keyword, limit=None):
+        return [word.word for word in db.search_words(keyword, limit)]
+
+    def assert_index_in_sync(self, db):
+        # rank=1 时同时核对外部内容表(words)与索引是否一致
+        db.pool.connection().execute("INSERT INTO words_fts(words_fts, rank) VALUES ('integrity-check', 1)")
+
+    def test_index_follows_every_write_path(self):
+        db = self.open()
+        self.assertTrue(db.has_fts)
+        apple = db.add_word(Word(word="apple", translation="红苹果"))
+        db.add_words([Word(word="banana", translation="黄香蕉"), Word(word="cherry", translation="")])
+        self.assertEqual(self.found(db, "苹果"), ["apple"])  # 两个字不够一个trigram，走LIKE
+        self.assertEqual(self.found(db, "红苹果"), ["apple"])
+
+        word = db.get_word(apple).to_word()
+        word.translation, word.user_note = "青苹果", "酸的水果"
+        db.update_word(word)
+        self.assertEqual(self.found(db, "红苹果"), [])
+        self.assertEqual(self.found(db, "酸的水"), ["apple"])
+
+        cherry = db.search_words("cherry")[0].id
+        db.fill_details([(cherry, "甜樱桃", "a small red fruit", "")])
+        self.assertEqual(self.found(db, "甜樱桃"), ["cherry"])
+
+        db.upsert_words([Word(word="banana", translation="长香蕉")])
+        self.assertEqual(self.found(db, "黄香蕉"), [])
+        self.assertEqual(self.found(db, "长香蕉"), ["banana"])
+
+        db.delete_word(apple)
+        self.assertEqual(self.found(db, "青苹果"), [])
+        self.assert_index_in_sync(db)
+
+    def test_ranking_and_fallbacks(self):
+        db = self.open()
+        db.add_words([
+            Word(word="journey", translation="旅程", user_note="long trip"),
+            Word(word="trip", translation="旅行"),
+            Word(word="tripod", translation="三脚架"),
+            Word(word="voyage", translation="航海 trip"),
+        ])
+        # 单词列权重最高，其次是释义，笔记最低
+        self.assertEqual(self.found(db, "trip")[0], "trip")
+        self.assertEqual(self.found(db, "trip")[-1], "journey")
+        self.assertEqual(len(self.found(db, "trip", limit=2)), 2)
+        self.assertEqual(self.found(db, "trip*"), ["trip", "tripod"])
+        self.assertEqual(self.found(db, "航海"), ["voyage"])
+        # 关键词里的引号被转义，不会成为FTS语法错误
+        self.assertEqual(self.found(db, '"tr'), [])
+
+    def test_backfill_when_upgrading_database_without_index(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute(WORDS_TABLE)
+        conn.executemany("INSERT INTO words(word, translation) VALUES (?, ?)",
+                         [(f"word{i}", f"翻译{i}") for i in range(20)])
+        conn.commit()
+        conn.close()
+
+        db = self.open()
+        self.assertTrue(db.has_fts)
+        self.assertEqual(self.found(db, "翻译17"), ["word17"])
+        self.assert_index_in_sync(db)
+        conn = db.pool.connection()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0], 20)
+        self.assertEqual(db.current_revision(), 20)
+
+    def test_index_created_on_later_start_when_first_attempt_failed(self):
+        # 模拟当初迁移时SQLite不支持FTS5：索引、触发器都不存在，但 user_version 已经前进
+        db = WordDatabase(self.path)
+        db.add_words(Word(word=f"word{i}", translation=f"翻译{i}") for i in range(20))
+        conn = db.pool.connection()
+        for name in ("words_fts_ai", "words_fts_ad", "words_fts_au"):
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.execute("DROP TABLE words_fts_vocab")
+        conn.execute("DROP TABLE words_fts")
+        db.close()
+
+        db = self.open()
+        self.assertTrue(db.has_fts)
+        self.assertTrue(db.has_fts_vocab)
+        self.assertEqual(self.found(db, "翻译12"), ["word12"])
+        self.assert_index_in_sync(db)
+
+
+if __name__ == "__main__":
+    unittest.main()
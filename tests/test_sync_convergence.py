@@ -0,0 +1,171 @@
+import os
+import random
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "android_app"))
+
+from pc_app.database.database import WordDatabase
+from pc_app.database.scheduler import ReviewScheduler
+from pc_app.sync.async_wifi_sync import AsyncWiFiSyncServer
+from shared.models import Word
+from shared.srs import ReviewState
+from storage.local_store import LocalWordStore
+from sync.sync_client import SyncClient
+
+LOOPBACK = "127.0.0.1"
+REVIEW_SELECT = "SELECT word_id, ease, interval, repetitions, lapses, due_at, reviewed_at FROM reviews"
+REVIEWED = REVIEW_SELECT + " WHERE reviewed_at IS NOT NULL"
+
+
+def free_port(kind=socket.SOCK_STREAM):
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind((LOOPBACK, 0))
+        return sock.getsockname()[1]
+
+
+class Clock:
+    """固定起点的逻辑时钟，晚于服务器上单词的创建时间，每次修改取一个严格递增的时间。"""
+
+    def __init__(self):
+        self.base = datetime(2100, 1, 1)
+        self.ticks = 0
+
+    def next(self) -> datetime:
+        self.ticks += 1
+        return self.base + timedelta(milliseconds=self.ticks)
+
+
+class SyncConvergenceTest(unittest.TestCase):
+    CLIENTS = 3
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = WordDatabase(os.path.join(self.tmp, "server.db"))
+        self.db.add_words(Word(word=f"word{i}", translation=f"翻译{i}") for i in range(30))
+        self.port = free_port()
+        self.server = AsyncWiFiSyncServer(port=self.port, db_path=self.db.db_path,
+                                          discovery_port=free_port(socket.SOCK_DGRAM))
+        threading.Thread(target=self.server.start_server, daemon=True).start()
+        self.assertTrue(self.server.wait_started(5))
+
+        self.clock = Clock()
+        self.stores = [LocalWordStore(os.path.join(self.tmp, f"phone{i}.db")) for i in range(self.CLIENTS)]
+        for store in self.stores:
+            self.sync(store)
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        self.server.stop_server()
+        self.db.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def sync(self, store):
+        # 每页7条，单词和复习记录跨页交错
+        client = SyncClient(discovery_targets=())
+        revision = client.sync_changes_from_server([(LOOPBACK, self.port)], store.revision, store.apply_changes,
+                                                   page_size=7, outbox=store)
+        self.assertIsNotNone(revision)
+
+    def sync_all(self, order=None):
+        for client_no in order or range(self.CLIENTS):
+            self.sync(self.stores[client_no])
+
+    def pc_note(self, word_id, note):
+        word = self.db.get_word(word_id).to_word()
+        word.user_note, word.updated_at = note, self.clock.next()
+        self.assertEqual(self.db.apply_client_changes([word])[0], 1)
+
+    def pc_review(self, word_id, grade):
+        row = self.db.pool.connection().execute(REVIEW_SELECT + " WHERE word_id = ?", (word_id,)).fetchone()
+        scheduler = ReviewScheduler(self.db)
+        state = scheduler.grade(ReviewState(*row), grade, self.clock.next().timestamp())
+        scheduler.flush()
+        return state
+
+    def phone_review(self, store, word_id, repetitions):
+        reviewed_at = self.clock.next().timestamp()
+        store.save_review(ReviewState(word_id=word_id, repetitions=repetitions, due_at=reviewed_at + 86400,
+                                      reviewed_at=reviewed_at))
+        return reviewed_at
+
+    def assert_converged(self):
+        conn = self.db.pool.connection()
+        words = conn.execute("SELECT id, word, translation, user_note FROM words ORDER BY id").fetchall()
+        reviews = conn.execute(REVIEWED + " ORDER BY word_id").fetchall()
+        for client_no, store in enumerate(self.stores):
+            with self.subTest(client=client_no):
+                self.assertEqual(store.conn.execute(
+                    "SELECT id, word, translation, user_note FROM words ORDER BY id").fetchall(), words)
+                self.assertEqual(store.conn.execute(REVIEWED + " ORDER BY word_id").fetchall(), reviews)
+                self.assertEqual(store.count_pending(), 0)
+        return dict((row[0], row[3]) for row in words), {row[0]: row for row in reviews}
+
+    def test_concurrent_edits_converge_to_last_writer(self):
+        a, b, c = self.stores
+        # 笔记: 两部手机先后改同一个单词，PC最后改；另一个单词只有较早的手机修改
+        a.update_note(1, "a", now=self.clock.next())
+        b.update_note(1, "b", now=self.clock.next())
+        b.update_note(2, "b-only", now=self.clock.next())
+        self.pc_note(1, "pc")
+        # 复习: 两部手机先后复习同一个单词，PC复习另一个
+        self.phone_review(a, 3, repetitions=1)
+        latest = self.phone_review(b, 3, repetitions=2)
+        pc_state = self.pc_review(4, 5)
+        # 单词: PC上删除一个手机还有未推送修改的单词，再新增一个
+        c.update_note(5, "deleted on pc", now=self.clock.next())
+        self.assertTrue(self.db.delete_word(5))
+        new_id = self.db.add_word(Word(word="newword", translation="新单词"))
+
+        # 先同步的手机推送较旧的修改，PC端的更新要在第二轮才能到达较早同步的手机
+        self.sync_all(order=(1, 0, 2))
+        self.sync_all()
+
+        notes, reviews = self.assert_converged()
+        self.assertEqual(notes[1], "pc")
+        self.assertEqual(notes[2], "b-only")
+        self.assertNotIn(5, notes)
+        self.assertIn(new_id, notes)
+        self.assertEqual(reviews[3][-1], latest)
+        self.assertEqual(reviews[3][3], 2)
+        self.assertEqual(reviews[4][-1], pc_state.reviewed_at)
+
+    def test_random_rounds_converge(self):
+        rng = random.Random(7)
+        hot = list(range(1, 11))
+        expected_notes, expected_reviews = {}, {}
+        for round_no in range(4):
+            for client_no, store in enumerate(self.stores):
+                for word_id in rng.sample(hot, 4):
+                    note = f"c{client_no}-r{round_no}-{word_id}"
+                    store.update_note(word_id, note, now=self.clock.next())
+                    expected_notes[word_id] = note
+                for word_id in rng.sample(hot, 3):
+                    expected_reviews[word_id] = self.phone_review(store, word_id, round_no + 1)
+            for word_id in rng.sample(hot, 3):
+                note = f"pc-r{round_no}-{word_id}"
+                self.pc_note(word_id, note)
+                expected_notes[word_id] = note
+            for word_id in rng.sample(hot, 2):
+                expected_reviews[word_id] = self.pc_review(word_id, rng.choice((1, 4, 5))).reviewed_at
+
+            order = list(range(self.CLIENTS))
+            rng.shuffle(order)
+            self.sync_all(order)
+        self.sync_all()
+
+        notes, reviews = self.assert_converged()
+        self.assertEqual({word_id: notes[word_id] for word_id in expected_notes}, expected_notes)
+        self.assertEqual({word_id: reviews[word_id][-1] for word_id in expected_reviews}, expected_reviews)
+
+
+if __name__ == "__main__":
+    unittest.main()